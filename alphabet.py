@@ -0,0 +1,201 @@
+import bisect
+
+from enfa import EPS
+
+""" Input alphabet.
+
+Symbols of a regex are sets of characters (CharSet), stored as sorted ranges of
+code points. The alphabet of a regex partitions all characters into equivalence
+classes: two characters are equivalent if every CharSet of the regex either
+contains both or neither of them. The automata only have transitions on these
+classes, so their size depends on the number of distinct classes in the regex,
+not on the number of possible characters.
+"""
+
+MAX_CODE_POINT = 0x10FFFF
+
+# The classified characters are cached up to this many, then the cache starts
+# over
+MAX_CACHED_CHARACTERS = 1 << 16
+
+# Characters that have to be escaped inside of a [...] class
+CLASS_SPECIAL_CHARACTERS = {"\\", "]", "-", "^"}
+
+
+class CharSet:
+    """An immutable set of characters stored as inclusive code point ranges."""
+
+    def __init__(self, ranges):
+        merged = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+
+        self.ranges = tuple(merged)
+
+    @classmethod
+    def single(cls, char):
+        return cls([(ord(char), ord(char))])
+
+    @classmethod
+    def any(cls):
+        return cls([(0, MAX_CODE_POINT)])
+
+    def complement(self):
+        ranges = []
+
+        start = 0
+        for range_start, range_end in self.ranges:
+            if start < range_start:
+                ranges.append((start, range_start - 1))
+            start = range_end + 1
+
+        if start <= MAX_CODE_POINT:
+            ranges.append((start, MAX_CODE_POINT))
+
+        return CharSet(ranges)
+
+    def is_empty(self):
+        return not self.ranges
+
+    def __contains__(self, char):
+        code_point = ord(char)
+
+        index = bisect.bisect_right(self.ranges, (code_point, MAX_CODE_POINT)) - 1
+        return index >= 0 and self.ranges[index][1] >= code_point
+
+    def __eq__(self, other):
+        if not isinstance(other, CharSet):
+            return NotImplemented
+        return self.ranges == other.ranges
+
+    def __hash__(self):
+        return hash(self.ranges)
+
+    def __repr__(self):
+        return f"CharSet({self.ranges!r})"
+
+    def __str__(self):
+        if len(self.ranges) == 1 and self.ranges[0][0] == self.ranges[0][1]:
+            return chr(self.ranges[0][0])
+
+        if self.ranges == ((0, MAX_CODE_POINT),):
+            return "."
+
+        return self.bracketed()
+
+    def bracketed(self):
+        """Returns the char set in the [...] class notation."""
+        items = []
+        for start, end in self.ranges:
+            items.append(_escape(chr(start)))
+            if end > start:
+                items.append("-" + _escape(chr(end)))
+
+        return "[" + "".join(items) + "]"
+
+
+def _escape(char):
+    return "\\" + char if char in CLASS_SPECIAL_CHARACTERS else char
+
+
+class Alphabet:
+    def __init__(self, char_sets):
+        char_sets = list(set(char_sets))
+
+        # Split all code points into intervals at every range boundary,
+        # inside an interval every character is in the same char sets.
+        boundaries = {0}
+        for char_set in char_sets:
+            for start, end in char_set.ranges:
+                boundaries.add(start)
+                boundaries.add(end + 1)
+        self._starts = sorted(b for b in boundaries if b <= MAX_CODE_POINT)
+
+        # The char sets every interval is in, each range marks the intervals
+        # it covers.
+        memberships = [[] for _ in self._starts]
+        for i, char_set in enumerate(char_sets):
+            for start, end in char_set.ranges:
+                first = bisect.bisect_left(self._starts, start)
+                last = bisect.bisect_left(self._starts, end + 1)
+                for index in range(first, last):
+                    memberships[index].append(i)
+
+        # Intervals that are in the same char sets form an equivalence class.
+        # membership -> code point ranges of the class
+        classes = {}
+        for index, start in enumerate(self._starts):
+            end = (
+                self._starts[index + 1] - 1
+                if index + 1 < len(self._starts)
+                else MAX_CODE_POINT
+            )
+
+            if memberships[index]:
+                classes.setdefault(tuple(memberships[index]), []).append((start, end))
+
+        # Symbol of every interval, None if no char set contains it
+        self._interval_symbols = [None] * len(self._starts)
+
+        # symbol -> characters of the class
+        self.classes = {}
+        for ranges in classes.values():
+            symbol = self._create_symbol(CharSet(ranges))
+            self.classes[symbol] = CharSet(ranges)
+
+            for start, _ in ranges:
+                self._interval_symbols[bisect.bisect_left(self._starts, start)] = symbol
+
+        # Already classified characters, at most MAX_CACHED_CHARACTERS.
+        # char -> symbol
+        self._symbols = {}
+
+    def _create_symbol(self, char_set):
+        # Single characters are their own symbol, so the automata of simple
+        # regexes stay readable, e.g. the symbols of '0(0+1)*1' are '0' and '1'.
+        start, end = char_set.ranges[0]
+
+        if len(char_set.ranges) == 1 and start == end and chr(start) != EPS:
+            return chr(start)
+
+        return char_set.bracketed()
+
+    @property
+    def symbols(self):
+        return list(self.classes)
+
+    def classify(self, char):
+        """Returns the symbol of the class of the character.
+
+        Args:
+            char: a single character
+
+        Returns:
+            The symbol of the class, None if no symbol of the regex contains it.
+        """
+        try:
+            return self._symbols[char]
+        except KeyError:
+            index = bisect.bisect_right(self._starts, ord(char)) - 1
+            symbol = self._interval_symbols[index]
+
+            if len(self._symbols) >= MAX_CACHED_CHARACTERS:
+                self._symbols.clear()
+            self._symbols[char] = symbol
+
+            return symbol
+
+    def symbols_of(self, char_set):
+        """Returns the symbols of the classes that make up the char set."""
+        # A class is either completely inside of a char set of the regex or
+        # completely outside of it, so checking a single character is enough.
+        return sorted(
+            symbol for symbol in self.classes if self.representative(symbol) in char_set
+        )
+
+    def representative(self, symbol):
+        """Returns a character of the class of the symbol."""
+        return chr(self.classes[symbol].ranges[0][0])
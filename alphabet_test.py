@@ -0,0 +1,82 @@
+import unittest
+
+from alphabet import Alphabet, CharSet, MAX_CACHED_CHARACTERS, MAX_CODE_POINT
+from enfa import EPS
+
+
+class CharSetTest(unittest.TestCase):
+    def test_ranges_are_merged(self):
+        char_set = CharSet(
+            [(ord("d"), ord("f")), (ord("a"), ord("c")), (ord("x"), ord("x"))]
+        )
+
+        self.assertEqual(char_set.ranges, ((ord("a"), ord("f")), (ord("x"), ord("x"))))
+
+    def test_contains(self):
+        char_set = CharSet([(ord("a"), ord("c")), (ord("x"), ord("z"))])
+
+        self.assertIn("a", char_set)
+        self.assertIn("b", char_set)
+        self.assertIn("z", char_set)
+
+        self.assertNotIn("d", char_set)
+        self.assertNotIn("0", char_set)
+        self.assertNotIn("é", char_set)
+
+    def test_complement(self):
+        char_set = CharSet.single("a").complement()
+
+        self.assertEqual(
+            char_set.ranges, ((0, ord("a") - 1), (ord("b"), MAX_CODE_POINT))
+        )
+        self.assertEqual(char_set.complement(), CharSet.single("a"))
+        self.assertTrue(CharSet.any().complement().is_empty())
+
+    def test_str(self):
+        self.assertEqual(str(CharSet.single("0")), "0")
+        self.assertEqual(str(CharSet.any()), ".")
+        self.assertEqual(
+            str(CharSet([(ord("a"), ord("z")), (ord("-"), ord("-"))])), "[\\-a-z]"
+        )
+
+
+class AlphabetTest(unittest.TestCase):
+    def test_single_characters_are_their_own_symbol(self):
+        alphabet = Alphabet([CharSet.single("0"), CharSet.single("1")])
+
+        self.assertEqual(sorted(alphabet.symbols), ["0", "1"])
+        self.assertEqual(alphabet.classify("0"), "0")
+        self.assertEqual(alphabet.classify("1"), "1")
+        self.assertIsNone(alphabet.classify("2"))
+
+    def test_equivalence_classes(self):
+        lowercase = CharSet([(ord("a"), ord("z"))])
+        digits = CharSet([(ord("0"), ord("9"))])
+        alphabet = Alphabet([lowercase, digits, CharSet.single("x"), CharSet.any()])
+
+        # [a-wy-z], x, [0-9] and everything else
+        self.assertEqual(len(alphabet.symbols), 4)
+        self.assertEqual(alphabet.classify("a"), alphabet.classify("q"))
+        self.assertEqual(alphabet.classify("0"), alphabet.classify("9"))
+        self.assertEqual(alphabet.classify("x"), "x")
+        self.assertEqual(alphabet.classify("-"), alphabet.classify("é"))
+        self.assertNotEqual(alphabet.classify("a"), alphabet.classify("x"))
+
+        self.assertEqual(len(alphabet.symbols_of(lowercase)), 2)
+        self.assertEqual(len(alphabet.symbols_of(CharSet.any())), 4)
+
+    def test_epsilon_character_is_not_the_epsilon_symbol(self):
+        alphabet = Alphabet([CharSet.single(EPS)])
+
+        self.assertNotEqual(alphabet.classify(EPS), EPS)
+        self.assertEqual(alphabet.representative(alphabet.classify(EPS)), EPS)
+
+    def test_classify_cache_is_bounded(self):
+        alphabet = Alphabet([CharSet.single("a"), CharSet.any()])
+
+        for code_point in range(2 * MAX_CACHED_CHARACTERS):
+            alphabet.classify(chr(code_point))
+
+        self.assertLessEqual(len(alphabet._symbols), MAX_CACHED_CHARACTERS)
+        self.assertEqual(alphabet.classify("a"), "a")
+        self.assertEqual(alphabet.classify("b"), alphabet.classify("é"))
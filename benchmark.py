@@ -0,0 +1,187 @@
+import itertools
+import random
+import time
+
+import codegen
+from dense_dfa import DenseDfa
+from regex import Regex, GLUSHKOV, THOMPSON
+from regex_set import RegexSet
+from sampling import Sampler
+
+""" Compile time and size comparisons of the different constructions."""
+
+PATTERNS = [
+    "0(0+1)*1",
+    "(0+1)*1(0+1)(0+1)(0+1)",
+    "01" * 50,
+    "(0*1)*(1+0)*" * 5,
+]
+
+
+def count_states(automaton):
+    states = automaton.graph.states()
+    states.add(automaton.starting_state)
+    states.update(automaton.final_states)
+
+    return len(states)
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+
+    return result, time.perf_counter() - start
+
+
+def compare_constructions(patterns=PATTERNS):
+    for pattern in patterns:
+        print(pattern if len(pattern) <= 40 else pattern[:37] + "...")
+
+        for construction in (THOMPSON, GLUSHKOV):
+            nfa, seconds = timed(Regex(pattern).create_nfa_from_regex, construction)
+            print(
+                f"  {construction:<10} {count_states(nfa):>6} states "
+                f"{len(nfa.graph):>6} transitions {seconds * 1000:>9.2f} ms"
+            )
+
+
+def compare_simplification(patterns=PATTERNS):
+    for pattern in patterns:
+        print(pattern if len(pattern) <= 40 else pattern[:37] + "...")
+
+        before, after = Regex(pattern).node_counts()
+        print(f"  expression {before:>6} nodes -> {after:>6} nodes")
+
+        for simplify in (False, True):
+            enfa, seconds = timed(Regex(pattern, simplify).create_enfa_from_regex)
+            print(
+                f"  {'simplified' if simplify else 'raw':<10} {count_states(enfa):>6} e-nfa states "
+                f"{seconds * 1000:>9.2f} ms"
+            )
+
+
+def eps_removal_scaling(sizes=(100, 200, 400, 800, 1600)):
+    """Times ENfa.convert_to_nfa on growing long concatenations and nested stars."""
+    families = {
+        "concatenation": lambda n: "(0+1)" * n,
+        "nested stars": lambda n: "(" * n + "0" + ")*" * n,
+    }
+
+    for name, create_pattern in families.items():
+        print(name)
+
+        for n in sizes:
+            # Without simplification, that would flatten the nested stars
+            enfa = Regex(create_pattern(n), simplify=False).create_enfa_from_regex()
+            _, seconds = timed(enfa.convert_to_nfa)
+            print(
+                f"  n={n:<6} {count_states(enfa):>6} e-nfa states {seconds * 1000:>9.2f} ms"
+            )
+
+
+def compare_matchers(pattern="(0+1)*1(0+1)(0+1)(0+1)(0+1)(0+1)", length=100000):
+    """Times matching a long random input with the different matchers."""
+    input_string = "".join(random.choice("01") for _ in range(length))
+
+    enfa = Regex(pattern).create_enfa_from_regex()
+    nfa = Regex(pattern).create_nfa_from_regex(GLUSHKOV)
+    dfa = nfa.convert_to_dfa()
+
+    matchers = {
+        "e-nfa simulation": enfa.is_string_accepted,
+        "nfa bitsets": nfa.is_string_accepted,
+        "dfa": dfa.is_string_accepted,
+        "dense dfa": DenseDfa(dfa).is_string_accepted,
+        "generated": codegen.compile_matcher(dfa),
+    }
+
+    print(f"{pattern} on {length} symbols")
+    for name, matcher in matchers.items():
+        _, seconds = timed(matcher, input_string)
+        print(f"  {name:<20} {seconds * 1000:>9.2f} ms")
+
+
+def compare_minimization(patterns=PATTERNS):
+    """Compares the number of dfa states before and after the minimization."""
+    for pattern in patterns:
+        print(pattern if len(pattern) <= 40 else pattern[:37] + "...")
+
+        for construction in (THOMPSON, GLUSHKOV):
+            dfa = Regex(pattern).create_nfa_from_regex(construction).convert_to_dfa()
+            minimal_dfa, seconds = timed(dfa.minimize)
+            print(
+                f"  {construction:<10} {count_states(dfa):>6} states -> "
+                f"{count_states(minimal_dfa):>6} states {seconds * 1000:>9.2f} ms"
+            )
+
+
+def compare_batch_matching(pattern="[a-z][a-z]*@[a-z][a-z]*\\.(com+org)", count=100000):
+    """Times matching a batch of short random strings one by one and at once."""
+    strings = [
+        "".join(random.choice("abc@.mo") for _ in range(random.randint(5, 20)))
+        for _ in range(count)
+    ]
+    dense_dfa = DenseDfa(Regex(pattern).create_nfa_from_regex().convert_to_dfa())
+
+    print(f"{pattern} on {count} strings")
+
+    _, seconds = timed(lambda: [dense_dfa.is_string_accepted(s) for s in strings])
+    print(f"  {'one by one':<20} {seconds * 1000:>9.2f} ms")
+
+    _, seconds = timed(dense_dfa.match_many, strings)
+    print(f"  {'match_many':<20} {seconds * 1000:>9.2f} ms")
+
+
+def compare_regex_set(pattern_count=30, length=10000):
+    """Times matching many regexes one by one and as a RegexSet."""
+    regexes = [f"(0+1)*{bin(i)[2:]}(0+1)*" for i in range(pattern_count)]
+    input_string = "".join(random.choice("01") for _ in range(length))
+
+    dfas = [Regex(regex).create_nfa_from_regex().convert_to_dfa() for regex in regexes]
+    regex_set = RegexSet(regexes)
+    regex_set.matches(input_string)
+
+    print(f"{pattern_count} regexes on {length} symbols")
+
+    _, seconds = timed(lambda: [dfa.is_string_accepted(input_string) for dfa in dfas])
+    print(f"  {'one by one':<20} {seconds * 1000:>9.2f} ms")
+
+    _, seconds = timed(regex_set.matches, input_string)
+    print(f"  {'regex set':<20} {seconds * 1000:>9.2f} ms")
+
+
+def compare_counting(pattern="(0+1)*1(0+1)(0+1)(0+1)", lengths=(8, 16, 1000)):
+    """Times counting the accepted strings by enumeration and by matrix powers."""
+    dfa = Regex(pattern).create_nfa_from_regex().convert_to_dfa()
+
+    print(pattern)
+    for length in lengths:
+        if length <= 16:
+            _, seconds = timed(
+                lambda: sum(
+                    dfa.is_string_accepted("".join(chars))
+                    for chars in itertools.product("01", repeat=length)
+                )
+            )
+            print(f"  n={length:<6} {'enumeration':<20} {seconds * 1000:>9.2f} ms")
+
+        _, seconds = timed(dfa.count_accepted, length)
+        print(f"  n={length:<6} {'matrix powers':<20} {seconds * 1000:>9.2f} ms")
+
+        sampler, seconds = timed(Sampler, dfa, length)
+        _, sample_seconds = timed(sampler.sample)
+        print(
+            f"  n={length:<6} {'sampler':<20} {seconds * 1000:>9.2f} ms "
+            f"+ {sample_seconds * 1000:.2f} ms per sample"
+        )
+
+
+if __name__ == "__main__":
+    compare_constructions()
+    compare_simplification(PATTERNS + ["(0+0)(1*)*(01+00+011)", "0*0*0*(1+1)*"])
+    eps_removal_scaling()
+    compare_matchers()
+    compare_batch_matching()
+    compare_regex_set()
+    compare_counting()
+    compare_minimization(PATTERNS + ["(0+1)*1(0+1)(0+1)(0+1)(0+1)(0+1)(0+1)(0+1)"])
@@ -0,0 +1,180 @@
+import keyword
+
+from dense_dfa import DenseDfa, MAX_BYTE_SYMBOL, UNKNOWN_SYMBOL
+from dfa import Dfa
+
+""" Python code generation of dfas.
+
+The dense table of a dfa (see dense_dfa.py) is written into the source of a
+standalone Python module as constants: the translation of the characters to
+symbol indices and the table of the row offsets as a tuple. The generated
+matcher only uses local variables, builtins and the bisect module, and the
+ints of a tuple do not have to be boxed when they are read, unlike of an array.
+
+The source can be compiled into a function in the current process, or written
+to a module, that can be imported without compiling the regex again.
+"""
+
+DEFAULT_NAME = "match"
+
+# The names of the generated module, that the matcher can not have
+_RESERVED_NAMES = {
+    "bisect",
+    "_STARTS",
+    "_SYMBOLS",
+    "_Translation",
+    "_TRANSLATION",
+    "_ROW_TABLE",
+    "_ACCEPTING_ROWS",
+}
+
+# Number of table entries on a line of the generated source
+_ENTRIES_PER_LINE = 16
+
+_TEMPLATE = '''"""Generated by codegen.py of v-rex, do not edit."""
+
+import bisect
+
+# The code points where the intervals of characters start, and the symbol index
+# of every interval as a character.
+_STARTS = {starts}
+_SYMBOLS = {symbols}
+
+
+class _Translation(dict):
+    # str.translate table of code point -> symbol index as a character, the
+    # characters are looked up the first time they are seen.
+    def __missing__(self, code_point):
+        symbol = _SYMBOLS[bisect.bisect_right(_STARTS, code_point) - 1]
+        self[code_point] = symbol
+
+        return symbol
+
+
+_TRANSLATION = _Translation()
+
+# Row major (states, {width} symbols) table of the offsets of the rows of the
+# next states.
+_ROW_TABLE = (
+{row_table}
+)
+
+_ACCEPTING_ROWS = frozenset({accepting_rows})
+
+
+def {name}(input_string):
+    row_table = _ROW_TABLE
+
+    row = {starting_row}
+    for symbol_index in {symbol_indices}:
+        row = row_table[row + symbol_index]
+
+    return row in _ACCEPTING_ROWS
+'''
+
+
+def _intervals(dense_dfa):
+    # The starts of the intervals of code points and their symbol indices,
+    # the gaps between the char sets are the unknown symbol.
+    ranges = sorted(
+        (start, end, index)
+        for index, char_set in enumerate(dense_dfa.char_sets(), 1)
+        for start, end in char_set.ranges
+    )
+
+    starts = [0]
+    symbols = [chr(UNKNOWN_SYMBOL)]
+    for start, end, index in ranges:
+        if start == starts[-1]:
+            symbols[-1] = chr(index)
+        else:
+            starts.append(start)
+            symbols.append(chr(index))
+
+        starts.append(end + 1)
+        symbols.append(chr(UNKNOWN_SYMBOL))
+
+    return tuple(starts), "".join(symbols)
+
+
+def generate_source(dfa, name=DEFAULT_NAME):
+    """Generates the source of a Python module that matches the dfa.
+
+    Args:
+        dfa: a Dfa or DenseDfa.
+        name: the name of the matcher function of the module, ValueError if
+            it is not an identifier, is a keyword or a name of the module.
+
+    Returns:
+        The source of the module, with a name(input_string) function that
+        returns True if the dfa accepts the input string.
+    """
+    # The name is pasted into the source, so it has to be a plain identifier
+    if (
+        not isinstance(name, str)
+        or not name.isidentifier()
+        or keyword.iskeyword(name)
+        or name in _RESERVED_NAMES
+    ):
+        raise ValueError(f"The name of the matcher is not an identifier: {name!r}")
+
+    dense_dfa = DenseDfa(dfa) if isinstance(dfa, Dfa) else dfa
+
+    starts, symbols = _intervals(dense_dfa)
+
+    row_table = list(dense_dfa.row_table)
+    lines = [
+        "    " + ", ".join(map(str, row_table[i : i + _ENTRIES_PER_LINE])) + ","
+        for i in range(0, len(row_table), _ENTRIES_PER_LINE)
+    ]
+
+    accepting_rows = {
+        state * dense_dfa.width
+        for state, accepting in enumerate(dense_dfa.accepting)
+        if accepting
+    }
+
+    # The symbol indices fit into bytes, unless there are too many symbols
+    if dense_dfa.width - 1 <= MAX_BYTE_SYMBOL:
+        symbol_indices = 'input_string.translate(_TRANSLATION).encode("latin-1")'
+    else:
+        symbol_indices = "map(ord, input_string.translate(_TRANSLATION))"
+
+    return _TEMPLATE.format(
+        starts=repr(starts),
+        symbols=repr(symbols),
+        width=dense_dfa.width,
+        row_table="\n".join(lines),
+        accepting_rows=repr(sorted(accepting_rows)),
+        name=name,
+        starting_row=dense_dfa.starting_state * dense_dfa.width,
+        symbol_indices=symbol_indices,
+    )
+
+
+def compile_matcher(dfa, name=DEFAULT_NAME):
+    """Generates the matcher of the dfa and compiles it in this process.
+
+    Args:
+        dfa: a Dfa or DenseDfa.
+        name: the name of the generated function.
+
+    Returns:
+        The function that returns True if the dfa accepts its input string.
+    """
+    namespace = {}
+    exec(compile(generate_source(dfa, name), f"<{name}>", "exec"), namespace)
+
+    return namespace[name]
+
+
+def write_module(dfa, path, name=DEFAULT_NAME):
+    """Writes the generated matcher of the dfa to a Python module.
+
+    Args:
+        dfa: a Dfa or DenseDfa.
+        path: the path of the module file.
+        name: the name of the matcher function of the module.
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(generate_source(dfa, name))
@@ -0,0 +1,84 @@
+import importlib.util
+import itertools
+import os
+import tempfile
+import unittest
+
+import codegen
+from dense_dfa import DenseDfa
+from dfa import Dfa
+from regex import Regex
+
+
+class CodegenTest(unittest.TestCase):
+    def assertSameLanguage(self, dfa, matcher, inputs):
+        for input_string in inputs:
+            self.assertEqual(
+                matcher(input_string),
+                dfa.is_string_accepted(input_string),
+                input_string,
+            )
+
+    def test_compile_matcher(self):
+        dfa = Regex("0(0+1)*1(0+1)").create_nfa_from_regex().convert_to_dfa()
+        matcher = codegen.compile_matcher(dfa)
+
+        inputs = [
+            "".join(chars)
+            for length in range(8)
+            for chars in itertools.product("01", repeat=length)
+        ]
+        self.assertSameLanguage(dfa, matcher, inputs + ["01x", "x"])
+
+    def test_compile_matcher_char_classes(self):
+        dense_dfa = DenseDfa.from_regex("[a-c]*(b+[^a])c.")
+        matcher = codegen.compile_matcher(dense_dfa, "match_abc")
+
+        self.assertEqual(matcher.__name__, "match_abc")
+        self.assertSameLanguage(
+            dense_dfa, matcher, ["abcd", "bcx", "aacεc", "", "ddcd", "bbc", "\0cc"]
+        )
+
+    def test_invalid_name(self):
+        dense_dfa = DenseDfa.from_regex("01")
+
+        for name in [
+            "bad name",
+            "",
+            "1match",
+            "class",
+            "bisect",
+            "f():\n    pass\ndef g",
+        ]:
+            with self.assertRaises(ValueError):
+                codegen.compile_matcher(dense_dfa, name)
+
+    def test_compile_matcher_without_alphabet(self):
+        dfa = Dfa({("A", "0"): "B", ("B", "1"): "A"}, "A", {"A"})
+        matcher = codegen.compile_matcher(dfa)
+
+        self.assertSameLanguage(dfa, matcher, ["", "01", "0101", "0", "1", "0x"])
+
+    def test_compile_matcher_wide_alphabet(self):
+        # More symbols than fit into a byte
+        regex = "(" + "+".join(chr(0x100 + i) for i in range(300)) + ")*"
+        dfa = Regex(regex, simplify=False).create_nfa_from_regex().convert_to_dfa()
+        matcher = codegen.compile_matcher(dfa)
+
+        self.assertTrue(matcher("".join(chr(0x100 + i) for i in range(300))))
+        self.assertFalse(matcher(chr(0x100) + "a"))
+
+    def test_write_module(self):
+        dense_dfa = DenseDfa.from_regex("(0+1)*1(0+1)(0+1)")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "generated_matcher.py")
+            codegen.write_module(dense_dfa, path)
+
+            spec = importlib.util.spec_from_file_location("generated_matcher", path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+
+        self.assertSameLanguage(
+            dense_dfa, module.match, ["100", "0100", "011", "", "1", "0120"]
+        )
@@ -0,0 +1,403 @@
+import sys
+from array import array
+
+import numpy as np
+
+from alphabet import CharSet, MAX_CACHED_CHARACTERS, MAX_CODE_POINT
+from regex import Regex, GLUSHKOV
+
+""" Dense Deterministic Finite Automaton.
+
+The transitions of a dfa are stored in a flat table with a row for every state
+and a column for every input symbol, so a step is a single array lookup instead
+of dict lookups. The states and the symbols are integers:
+
+ * state 0 is the dead state, every missing transition goes to it,
+ * symbol 0 stands for the characters that are not in the alphabet of the dfa.
+
+The input is translated to symbol indices in bulk with str.translate before
+the table is stepped through. Batches of strings are matched together with
+numpy, one input position of every string at a time.
+
+Every state that can not reach an accepting state is merged into the dead
+state. From a universal state, that only reaches accepting states, every input
+of known symbols is accepted. The matchers stop running the input in either of
+them.
+"""
+
+DEAD_STATE = 0
+UNKNOWN_SYMBOL = 0
+
+# Symbol indices up to this fit into a byte of the translated input
+MAX_BYTE_SYMBOL = 0xFF
+
+# The input is checked for a dead or a universal state after this many symbols
+BLOCK_SIZE = 256
+
+# Encodes the larger symbol indices as native 4 byte ints
+_WIDE_ENCODING = "utf-32-le" if sys.byteorder == "little" else "utf-32-be"
+
+
+class _Translation(dict):
+    """A str.translate table of code point -> symbol index as a character.
+
+    The characters are classified the first time they are seen, up to
+    MAX_CACHED_CHARACTERS of them, then the table starts over.
+    """
+
+    def __init__(self, alphabet, symbol_indices):
+        super().__init__()
+        self.alphabet = alphabet
+        self.symbol_indices = symbol_indices
+
+    def __missing__(self, code_point):
+        char = chr(code_point)
+        symbol = self.alphabet.classify(char) if self.alphabet is not None else char
+
+        index = chr(self.symbol_indices.get(symbol, UNKNOWN_SYMBOL))
+
+        if len(self) >= MAX_CACHED_CHARACTERS:
+            self.clear()
+        self[code_point] = index
+
+        return index
+
+
+class DenseDfa:
+    def __init__(self, dfa):
+        symbols = [None] + sorted({symbol for (_, symbol), _ in dfa.graph.items()})
+        symbol_indices = {symbol: index for index, symbol in enumerate(symbols)}
+
+        # dfa state -> dense state. Every state that can not reach an accepting
+        # state is merged into the dead state 0.
+        dead_states = dfa.dead_states()
+        state_ids = dict.fromkeys(dead_states, DEAD_STATE)
+        state_count = 1
+        for state in [dfa.starting_state] + sorted(dfa.states() - {dfa.starting_state}):
+            if state not in state_ids:
+                state_ids[state] = state_count
+                state_count += 1
+
+        # Row major (states, symbols) table of the offsets of the rows of the
+        # next states, so the matcher does not have to multiply on every step.
+        width = len(symbols)
+        row_table = array("l", [DEAD_STATE]) * state_count * width
+        for (state, symbol), next_state in dfa.graph.items():
+            if state not in dead_states:
+                row = state_ids[state] * width
+                row_table[row + symbol_indices[symbol]] = state_ids[next_state] * width
+
+        # dense state -> True if accepting
+        accepting = [False] * state_count
+        for state in dfa.final_states:
+            accepting[state_ids[state]] = True
+
+        self._set_tables(
+            dfa.alphabet,
+            symbols,
+            state_ids[dfa.starting_state],
+            row_table,
+            accepting,
+            {state_ids[state] for state in dfa.universal_states()},
+        )
+
+    def _set_tables(
+        self,
+        alphabet,
+        symbols,
+        starting_state,
+        row_table,
+        accepting,
+        universal_states=None,
+    ):
+        self.alphabet = alphabet
+
+        # symbol index -> input symbol, index 0 is the unknown symbol
+        self.symbols = symbols
+        self.symbol_indices = {
+            symbol: index for index, symbol in enumerate(symbols) if index
+        }
+        self.width = len(symbols)
+
+        self.starting_state = starting_state
+        self.dead_state = DEAD_STATE
+        self.state_count = len(accepting)
+
+        # Row major (states, symbols) table of the offsets of the rows of the
+        # next states, state * width. Any sequence of ints, e.g. an array or a
+        # memoryview of a memory mapped file, see serialize.py.
+        self.row_table = row_table
+
+        # dense state -> True if accepting
+        self.accepting = accepting
+
+        # The states that accept every input of known symbols, None until first
+        # used when the tables are loaded.
+        self._universal_states = universal_states
+
+        self._translation = _Translation(alphabet, self.symbol_indices)
+
+        # True if every character is in a symbol, the unknown symbol never
+        # appears in the input then
+        self.covers_all_characters = alphabet is not None and sum(
+            end - start + 1
+            for symbol in symbols[1:]
+            for start, end in alphabet.classes[symbol].ranges
+        ) == (MAX_CODE_POINT + 1)
+
+        self._stopping_rows = None
+
+        # The row table as a numpy array, None until first used
+        self._numpy_row_table = None
+
+    @classmethod
+    def from_tables(cls, alphabet, symbols, starting_state, row_table, accepting):
+        """Creates a dense dfa of already built tables, see serialize.py."""
+        dense_dfa = cls.__new__(cls)
+        dense_dfa._set_tables(alphabet, symbols, starting_state, row_table, accepting)
+
+        return dense_dfa
+
+    def __getstate__(self):
+        # The row table can be a view of a memory mapped file, that can not be
+        # pickled.
+        state = dict(self.__dict__)
+        state["row_table"] = array("l", self.row_table)
+
+        return state
+
+    @classmethod
+    def from_regex(cls, regex):
+        return cls(
+            Regex(regex).create_nfa_from_regex(GLUSHKOV).convert_to_dfa().minimize()
+        )
+
+    def __len__(self):
+        return self.state_count
+
+    @property
+    def table(self):
+        """The row major (states, symbols) table of the next states."""
+        return array("l", (row // self.width for row in self.row_table))
+
+    @property
+    def universal_states(self):
+        """The set of the states that accept every continuation of the input
+        that has no unknown symbols."""
+        if self._universal_states is None:
+            self._universal_states = self._find_universal_states()
+
+        return self._universal_states
+
+    def _find_universal_states(self):
+        # The states that reach a non accepting state on some known symbol are
+        # found backwards from the non accepting states.
+        previous_states = [[] for _ in range(self.state_count)]
+        for state in range(self.state_count):
+            row = state * self.width
+            for symbol_index in range(1, self.width):
+                next_state = self.row_table[row + symbol_index] // self.width
+                previous_states[next_state].append(state)
+
+        rejecting = {
+            state for state, accepting in enumerate(self.accepting) if not accepting
+        }
+        worklist = list(rejecting)
+        while worklist:
+            for state in previous_states[worklist.pop()]:
+                if state not in rejecting:
+                    rejecting.add(state)
+                    worklist.append(state)
+
+        return set(range(self.state_count)) - rejecting
+
+    @property
+    def stopping_rows(self):
+        """The rows of the dead and the universal states, the rest of the input
+        does not have to be run from them."""
+        if self._stopping_rows is None:
+            self._stopping_rows = frozenset(
+                [self.dead_state * self.width]
+                + [state * self.width for state in self.universal_states]
+            )
+
+        return self._stopping_rows
+
+    def stop(self, row, input_string):
+        """Returns the row after the rest of the input, from a stopping row.
+
+        The dead state stays dead. A universal state accepts the rest, unless
+        it has an unknown symbol. When every character is in a symbol, the
+        rest is not looked at.
+
+        Args:
+            row: the offset of the row of a dead or a universal state.
+            input_string: the rest of the input.
+
+        Returns:
+            The offset of the row of the state after the input.
+        """
+        if (
+            row != self.dead_state * self.width
+            and not self.covers_all_characters
+            and UNKNOWN_SYMBOL in self.encode(input_string)
+        ):
+            # Every state goes into the dead state on an unknown symbol
+            return self.dead_state * self.width
+
+        return row
+
+    def char_sets(self):
+        """Returns the characters of every symbol, except the unknown symbol 0."""
+        char_sets = []
+        for symbol in self.symbols[1:]:
+            if self.alphabet is not None:
+                char_sets.append(self.alphabet.classes[symbol])
+            elif len(symbol) == 1:
+                char_sets.append(CharSet.single(symbol))
+            else:
+                raise ValueError(f"The symbol {symbol!r} is not a single character")
+
+        return char_sets
+
+    def next_state(self, state, symbol_index):
+        return self.row_table[state * self.width + symbol_index] // self.width
+
+    def encode(self, input_string):
+        """Translates the input string to symbol indices.
+
+        Args:
+            input_string: the input to translate.
+
+        Returns:
+            The symbol index of every character, as bytes if every index fits
+            into a byte, as an array of ints otherwise.
+        """
+        translated = input_string.translate(self._translation)
+
+        if self.width - 1 <= MAX_BYTE_SYMBOL:
+            return translated.encode("latin-1")
+
+        return array("I", translated.encode(_WIDE_ENCODING, "surrogatepass"))
+
+    def is_string_accepted(self, input_string):
+        """Check if the string is accepted by the dfa.
+
+        Args:
+            input_string: the input to check.
+
+        Returns:
+            True if the automaton accepts the string, False otherwise.
+        """
+        row = self.run(self.starting_state * self.width, input_string)
+
+        return self.accepting[row // self.width]
+
+    def run(self, row, input_string):
+        """Steps through the table on the input string.
+
+        The input is run in blocks, and it stops after the block where it
+        reaches a dead or a universal state, see stop.
+
+        Args:
+            row: the offset of the row of the current state in the table,
+                state * width.
+            input_string: the input to step on.
+
+        Returns:
+            The offset of the row of the state after the input.
+        """
+        row_table = self.row_table
+        stopping_rows = self.stopping_rows
+
+        # The input is translated a block at a time, so the rest is not even
+        # translated after a stop
+        for start in range(0, len(input_string), BLOCK_SIZE):
+            if row in stopping_rows:
+                return self.stop(row, input_string[start:])
+
+            for symbol_index in self.encode(input_string[start : start + BLOCK_SIZE]):
+                row = row_table[row + symbol_index]
+
+        return row
+
+    def match_many(self, strings):
+        """Check which strings of a batch are accepted by the dfa.
+
+        The strings are translated together into one array of symbol indices.
+        The current states of all strings are advanced together, one input
+        position at a time, only for the strings that are at least that long.
+        The strings in a dead or a universal state are left out after every
+        block of positions.
+
+        Args:
+            strings: a sequence of the inputs to check.
+
+        Returns:
+            A numpy bool array, True where the string is accepted.
+        """
+        if self._numpy_row_table is None:
+            self._numpy_row_table = np.array(self.row_table, dtype=np.intp)
+        row_table = self._numpy_row_table
+
+        symbol_indices = np.frombuffer(self.encode("".join(strings)), dtype=np.uint8)
+        if self.width - 1 > MAX_BYTE_SYMBOL:
+            symbol_indices = symbol_indices.view(np.uint32)
+
+        lengths = np.fromiter(map(len, strings), dtype=np.intp, count=len(strings))
+        starts = np.cumsum(lengths) - lengths
+
+        # Longest strings first, so the strings still running are a prefix
+        order = np.argsort(-lengths, kind="stable")
+        starts = starts[order]
+        lengths = lengths[order]
+
+        # The offsets of the rows of the current states
+        rows = np.full(len(strings), self.starting_state * self.width, dtype=np.intp)
+
+        # The positions of the unknown symbols in the input
+        unknown_positions = (
+            np.flatnonzero(symbol_indices == UNKNOWN_SYMBOL)
+            if not self.covers_all_characters
+            else np.empty(0, dtype=np.intp)
+        )
+
+        # row // width -> True if the rest of the input does not have to be run
+        stopping = np.zeros(self.state_count, dtype=bool)
+        stopping[[row // self.width for row in self.stopping_rows]] = True
+
+        running = len(strings)
+        for position in range(int(lengths[0]) if len(lengths) else 0):
+            while running and lengths[running - 1] <= position:
+                running -= 1
+
+            if position % BLOCK_SIZE == 0:
+                stopped = stopping[rows[:running] // self.width]
+                if stopped.any():
+                    # From a universal state the rest is accepted, unless it
+                    # has an unknown symbol, see stop.
+                    has_unknown = np.searchsorted(
+                        unknown_positions, starts[:running] + lengths[:running]
+                    ) > np.searchsorted(unknown_positions, starts[:running] + position)
+                    rows[:running][stopped & has_unknown] = self.dead_state * self.width
+
+                    # Move the stopped strings after the running ones, the running
+                    # ones stay ordered by their lengths
+                    moved = np.concatenate(
+                        (np.flatnonzero(~stopped), np.flatnonzero(stopped))
+                    )
+                    for values in (order, starts, lengths, rows):
+                        values[:running] = values[:running][moved]
+                    running -= int(stopped.sum())
+
+            if not running:
+                break
+
+            rows[:running] = row_table[
+                rows[:running] + symbol_indices[starts[:running] + position]
+            ]
+
+        accepted = np.empty(len(strings), dtype=bool)
+        accepted[order] = np.array(self.accepting)[rows // self.width]
+
+        return accepted
@@ -0,0 +1,103 @@
+import unittest
+
+from dense_dfa import DEAD_STATE, DenseDfa
+from dfa import Dfa
+from regex import Regex
+
+
+class DenseDfaTest(unittest.TestCase):
+    def test_dense_dfa(self):
+        transition_function = {
+            ("A", "0"): "A",
+            ("A", "1"): "B",
+            ("B", "0"): "C",
+            ("B", "1"): "D",
+            ("C", "1"): "E",
+            ("D", "0"): "E",
+            ("E", "0"): "F",
+            ("F", "1"): "G",
+        }
+        dense_dfa = DenseDfa(Dfa(transition_function, "A", {"G"}))
+
+        self.assertTrue(dense_dfa.is_string_accepted("0000011001"))
+        self.assertTrue(dense_dfa.is_string_accepted("011001"))
+
+        self.assertFalse(dense_dfa.is_string_accepted(""))
+        self.assertFalse(dense_dfa.is_string_accepted("1"))
+        self.assertFalse(dense_dfa.is_string_accepted("1011001"))
+        self.assertFalse(dense_dfa.is_string_accepted("01100x1"))
+
+    def test_dense_dfa_table(self):
+        dense_dfa = DenseDfa(Dfa({("A", "0"): "B", ("B", "1"): "A"}, "A", {"A"}))
+
+        # Dead, A and B states, unknown, 0 and 1 symbols
+        self.assertEqual(len(dense_dfa), 3)
+        self.assertEqual(dense_dfa.symbols, [None, "0", "1"])
+        self.assertEqual(list(dense_dfa.table), [0, 0, 0, 0, 2, 0, 0, 0, 1])
+        self.assertEqual(dense_dfa.next_state(dense_dfa.starting_state, 2), DEAD_STATE)
+        self.assertEqual(dense_dfa.accepting, [False, True, False])
+
+    def test_dense_dfa_encode(self):
+        dense_dfa = DenseDfa.from_regex("[a-c]x")
+
+        self.assertEqual(list(dense_dfa.encode("bxy")), [1, 2, 0])
+        self.assertTrue(dense_dfa.is_string_accepted("ax"))
+        self.assertFalse(dense_dfa.is_string_accepted("dx"))
+
+    def test_dense_dfa_wide_alphabet(self):
+        regex = "(" + "+".join(chr(0x100 + i) for i in range(300)) + ")*"
+        # Without simplification, that is slow on wide unions
+        nfa = Regex(regex, simplify=False).create_nfa_from_regex()
+        dense_dfa = DenseDfa(nfa.convert_to_dfa())
+
+        self.assertEqual(list(dense_dfa.encode("Āa")), [1, 0])
+        self.assertTrue(dense_dfa.is_string_accepted("Āȫā"))
+        self.assertFalse(dense_dfa.is_string_accepted("ĀȬ"))
+
+    def test_dense_dfa_match_many(self):
+        dense_dfa = DenseDfa.from_regex("0(0+1)*1")
+        strings = ["011001", "", "1", "01", "0", "0000011001", "0x1"]
+
+        self.assertEqual(
+            dense_dfa.match_many(strings).tolist(),
+            [dense_dfa.is_string_accepted(s) for s in strings],
+        )
+
+    def test_dense_dfa_match_many_empty_batch(self):
+        dense_dfa = DenseDfa.from_regex("0*")
+
+        self.assertEqual(dense_dfa.match_many([]).tolist(), [])
+        self.assertEqual(dense_dfa.match_many(["", ""]).tolist(), [True, True])
+
+    def test_dense_dfa_dead_and_universal_states(self):
+        dfa = Regex("0(0+1)*+11*0").create_nfa_from_regex().convert_to_dfa()
+        dense_dfa = DenseDfa(dfa)
+
+        # Every state that can not reach an accepting state is the dead state
+        self.assertEqual(len(dense_dfa), len(dfa.states()) - len(dfa.dead_states()) + 1)
+        self.assertEqual(len(dense_dfa.universal_states), len(dfa.universal_states()))
+        self.assertEqual(dense_dfa._find_universal_states(), dense_dfa.universal_states)
+
+        strings = ["0", "0" + "01" * 1000, "0" + "01" * 1000 + "x", "1110", "1101"]
+        strings += ["1" * 1000 + "0", "10" + "1" * 1000, "x" + "0" * 1000]
+        self.assertEqual(
+            [dense_dfa.is_string_accepted(s) for s in strings],
+            [dfa.is_string_accepted(s) for s in strings],
+        )
+        self.assertEqual(
+            dense_dfa.match_many(strings).tolist(),
+            [dfa.is_string_accepted(s) for s in strings],
+        )
+
+    def test_dense_dfa_covers_all_characters(self):
+        dense_dfa = DenseDfa.from_regex("0.*")
+
+        self.assertTrue(dense_dfa.covers_all_characters)
+        self.assertFalse(DenseDfa.from_regex("0(0+1)*").covers_all_characters)
+
+        # Nothing can be rejected after the universal state
+        self.assertTrue(dense_dfa.is_string_accepted("0" + "xyzε" * 1000))
+        self.assertFalse(dense_dfa.is_string_accepted("1" + "xyzε" * 1000))
+        self.assertEqual(
+            dense_dfa.match_many(["0" + "ε" * 1000, "1" * 1000]).tolist(), [True, False]
+        )
@@ -0,0 +1,167 @@
+from expression import (
+    EMPTY,
+    EPSILON,
+    Concatenation,
+    Star,
+    Symbol,
+    Union,
+    concatenation,
+    concatenation_of,
+    union_of,
+)
+from regex import Regex
+
+""" Brzozowski derivative matching.
+
+The derivative of an expression r with respect to a symbol a matches every
+string w for which r matches aw. A string is accepted if the expression left
+after taking the derivative for each of its symbols matches the empty string.
+
+Every distinct (simplified) derivative is a state of a dfa, that is built
+lazily, only for the states and symbols the inputs actually reach.
+"""
+
+
+def _operands(expression):
+    # The subexpressions whose derivatives the derivative of the expression
+    # is made of
+    if isinstance(expression, Concatenation):
+        # The factors for as long as the previous ones match the empty string
+        for i, factor in enumerate(expression.factors):
+            if not factor.nullable:
+                return expression.factors[: i + 1]
+        return expression.factors
+
+    if isinstance(expression, Union):
+        return expression.alternatives
+
+    if isinstance(expression, Star):
+        return (expression.expression,)
+
+    return ()
+
+
+def _combine(expression, derivatives, input_symbol):
+    # The derivative of the expression, out of the derivatives of its operands
+    if isinstance(expression, Symbol):
+        return EPSILON if input_symbol in expression.char_set else EMPTY
+
+    if isinstance(expression, Concatenation):
+        # d(f1 f2 ... fn) = d(f1) f2 ... fn + d(f2) f3 ... fn + ...
+        factors = expression.factors
+        return union_of(
+            concatenation(d, concatenation_of(factors[i + 1 :]))
+            for i, d in enumerate(derivatives)
+        )
+
+    if isinstance(expression, Union):
+        return union_of(derivatives)
+
+    if isinstance(expression, Star):
+        return concatenation(derivatives[0], expression)
+
+    # ∅ and ε
+    return EMPTY
+
+
+def derivative(expression, input_symbol):
+    """Returns the derivative of the expression with respect to the character.
+
+    The tree is walked without recursion, the derivatives of the operands are
+    taken first, so deeply nested expressions do not hit the recursion limit.
+    Derivatives share their subexpressions, the derivative of each shared one
+    is only taken once.
+    """
+    # id(subexpression) -> its derivative, the subexpressions stay alive in
+    # the expression
+    derivatives = {}
+
+    stack = [(expression, False)]
+    while stack:
+        e, visited = stack.pop()
+
+        if visited:
+            derivatives[id(e)] = _combine(
+                e, [derivatives[id(o)] for o in _operands(e)], input_symbol
+            )
+        elif id(e) not in derivatives:
+            stack.append((e, True))
+            stack.extend(
+                (operand, False)
+                for operand in _operands(e)
+                if id(operand) not in derivatives
+            )
+
+    return derivatives[id(expression)]
+
+
+class DerivativeMatcher:
+    def __init__(self, expression, alphabet):
+        # expression -> state id
+        self._state_ids = {}
+        # state id -> expression
+        self.expressions = []
+        # state id -> True if accepting
+        self._accepting = []
+
+        # Memoized derivatives. Every character of a class of the alphabet has
+        # the same derivative, so they are stored per class symbol.
+        # (state, input symbol) -> next state
+        self.transition_function = {}
+
+        self.alphabet = alphabet
+
+        self.starting_state = self._get_state_id(expression)
+        self.dead_state = self._get_state_id(EMPTY)
+
+    @classmethod
+    def from_regex(cls, regex):
+        # The derivatives stay finite only if the expression is simplified
+        regex = Regex(regex, simplify=True)
+        expression = regex.create_expression_from_regex()
+
+        return cls(expression, regex.alphabet)
+
+    def _get_state_id(self, expression):
+        state_id = self._state_ids.get(expression)
+
+        if state_id is None:
+            state_id = len(self.expressions)
+            self._state_ids[expression] = state_id
+            self.expressions.append(expression)
+            self._accepting.append(expression.nullable)
+
+        return state_id
+
+    def _next_state(self, state, input_symbol):
+        next_state = self.transition_function.get((state, input_symbol))
+
+        if next_state is None:
+            expression = derivative(
+                self.expressions[state], self.alphabet.representative(input_symbol)
+            )
+            next_state = self._get_state_id(expression)
+            self.transition_function[(state, input_symbol)] = next_state
+
+        return next_state
+
+    def is_string_accepted(self, input_string):
+        """Check if the string is accepted by the expression.
+
+        Args:
+            input_string: the input to check.
+
+        Returns:
+            True if the expression matches the whole string, False otherwise.
+        """
+        current_state = self.starting_state
+        for input_symbol in map(self.alphabet.classify, input_string):
+            if input_symbol is None:
+                return False
+
+            current_state = self._next_state(current_state, input_symbol)
+
+            if current_state == self.dead_state:
+                return False
+
+        return self._accepting[current_state]
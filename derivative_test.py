@@ -0,0 +1,59 @@
+import unittest
+
+from derivative import DerivativeMatcher, derivative
+from expression import EMPTY, EPSILON, from_postfix
+
+
+class DerivativeTest(unittest.TestCase):
+    def test_derivative(self):
+        expression = from_postfix("001+*.1.")
+
+        self.assertEqual(derivative(expression, "1"), EMPTY)
+        self.assertEqual(derivative(expression, "0"), from_postfix("01+*1."))
+        self.assertEqual(derivative(from_postfix("0"), "0"), EPSILON)
+
+    def test_derivative_matcher(self):
+        matcher = DerivativeMatcher.from_regex("0(0+1)*1")
+
+        self.assertTrue(matcher.is_string_accepted("011001"))
+        self.assertTrue(matcher.is_string_accepted("0000011001"))
+
+        self.assertFalse(matcher.is_string_accepted(""))
+        self.assertFalse(matcher.is_string_accepted("1"))
+        self.assertFalse(matcher.is_string_accepted("1011011"))
+
+    def test_derivative_matcher_empty_regex(self):
+        matcher = DerivativeMatcher.from_regex("")
+
+        self.assertTrue(matcher.is_string_accepted(""))
+        self.assertFalse(matcher.is_string_accepted("0"))
+
+    def test_derivative_matcher_builds_states_lazily(self):
+        matcher = DerivativeMatcher.from_regex("(0+1)*1(0+1)(0+1)(0+1)(0+1)")
+
+        self.assertTrue(matcher.is_string_accepted("010000"))
+        self.assertFalse(matcher.is_string_accepted("000000"))
+
+        # The full dfa would have 2^5 states
+        self.assertLess(len(matcher.expressions), 12)
+
+    def test_derivative_matcher_memoizes_derivatives(self):
+        matcher = DerivativeMatcher.from_regex("(0+1)*1")
+
+        matcher.is_string_accepted("0110")
+        states = len(matcher.expressions)
+        transitions = len(matcher.transition_function)
+
+        matcher.is_string_accepted("0110" * 10)
+
+        self.assertEqual(len(matcher.expressions), states)
+        self.assertEqual(len(matcher.transition_function), transitions)
+
+    def test_derivative_matcher_deep_nesting(self):
+        # (((01)*1)*1 ... )*, nested 600 deep
+        matcher = DerivativeMatcher.from_regex("(" * 600 + "0" + "1)*" * 600)
+
+        self.assertTrue(matcher.is_string_accepted(""))
+        self.assertTrue(matcher.is_string_accepted("11"))
+        self.assertFalse(matcher.is_string_accepted("0"))
+        self.assertFalse(matcher.is_string_accepted("10"))
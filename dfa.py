@@ -1,27 +1,212 @@
+import numpy as np
+
 from plotter import plot_automaton
 from printer import print_automaton
+from transition_graph import TransitionGraph
 
 """ Deterministic Finite Automaton."""
 
+# The number of all characters, the code points up to 0x10FFFF
+_CHARACTER_COUNT = 0x110000
+
+# Stands for the missing transitions during the minimization
+_DEAD_STATE = object()
+
 
 class Dfa:
-    def __init__(self, transition_function, starting_state, final_states):
-        # Here implemented as a tuple to string dict.
-        # (state, input symbol) -> next state
-        self.transition_function = transition_function
+    def __init__(
+        self,
+        transition_function,
+        starting_state,
+        final_states,
+        state_labels=None,
+        alphabet=None,
+    ):
+        # state -> input symbol -> next state
+        self.graph = TransitionGraph.from_graph(transition_function, deterministic=True)
 
         self.starting_state = starting_state
 
         # A finite set of accepting / final states.
         self.final_states = final_states
 
+        # Optional human readable names of the states, only used for printing.
+        # state -> label
+        self.state_labels = state_labels or {}
+
+        # Maps input characters to the input symbols, see alphabet.py.
+        # Without an alphabet every character is its own symbol.
+        self.alphabet = alphabet
+
+        # The transitions used by is_string_accepted, without the ones into the
+        # dead and the universal states, built on first match and again after
+        # the graph, the starting or the final states change.
+        self._matching_edges = None
+        self._matching_key = None
+        self._universal_states = None
+        self._symbols = None
+        # True if every character is in a symbol, so nothing is rejected after
+        # a universal state
+        self._covers_all_characters = None
+
+        # The dict of transition_function and the version of the graph it was
+        # built from
+        self._transition_function = None
+        self._transition_function_version = None
+
+    @property
+    def transition_function(self):
+        """The transitions as a (state, input symbol) -> next state dict.
+
+        The dict is built once for every version of the graph and shared by
+        the callers, so it must not be modified, change the graph instead.
+        """
+        if self._transition_function_version != self.graph.version:
+            self._transition_function = self.graph.to_dict()
+            self._transition_function_version = self.graph.version
+
+        return self._transition_function
+
+    def states(self):
+        """Returns every state of the automaton."""
+        states = self.graph.states()
+        states.add(self.starting_state)
+        states.update(self.final_states)
+
+        return states
+
+    def symbols(self):
+        """Returns every input symbol that has a transition."""
+        return {symbol for (_, symbol), _ in self.graph.items()}
+
+    def symbol_sizes(self):
+        """Returns the number of characters of every input symbol.
+
+        Without an alphabet every symbol is a single character.
+        """
+        if self.alphabet is None:
+            return dict.fromkeys(self.symbols(), 1)
+
+        return {
+            symbol: sum(
+                end - start + 1 for start, end in self.alphabet.classes[symbol].ranges
+            )
+            for symbol in self.symbols()
+        }
+
+    def count_accepted(self, length):
+        """Counts the strings of the length that are accepted by the dfa.
+
+        The number of inputs leading from a state to another in n steps is the
+        n-th power of the transition matrix, that holds the number of
+        characters going from a state to another in one step. The power is
+        computed by squaring, with exact Python ints.
+
+        Args:
+            length: the number of characters of the strings, ValueError if it
+                is negative.
+
+        Returns:
+            The number of accepted strings, as an int.
+        """
+        if length < 0:
+            raise ValueError(f"The length can not be negative: {length}")
+
+        # The dead states do not add to the count
+        states = list(self.states() - self.dead_states())
+        if self.starting_state not in states:
+            return 0
+
+        index = {state: i for i, state in enumerate(states)}
+        sizes = self.symbol_sizes()
+
+        matrix = np.zeros((len(states), len(states)), dtype=object)
+        for (state, symbol), next_state in self.graph.items():
+            if state in index and next_state in index:
+                matrix[index[state], index[next_state]] += sizes[symbol]
+
+        # The counts of the inputs from the starting state to every state
+        counts = np.zeros(len(states), dtype=object)
+        counts[index[self.starting_state]] = 1
+        while length:
+            if length & 1:
+                counts = counts @ matrix
+            matrix = matrix @ matrix
+            length >>= 1
+
+        return int(sum(counts[index[state]] for state in self.final_states))
+
+    def _reaching(self, states):
+        # The states that can reach any of the states, by reverse reachability
+        reaching = set(states)
+        worklist = list(reaching)
+        while worklist:
+            state = worklist.pop()
+            for previous_states in self.graph.predecessors(state).values():
+                for previous_state in previous_states:
+                    if previous_state not in reaching:
+                        reaching.add(previous_state)
+                        worklist.append(previous_state)
+
+        return reaching
+
+    def dead_states(self):
+        """Returns the states from which no accepting state can be reached."""
+        return self.states() - self._reaching(self.final_states)
+
+    def universal_states(self):
+        """Returns the states that accept every continuation of the input.
+
+        From a universal state every symbol of the dfa leads to a universal
+        state, and all of them are accepting. A character of none of the
+        symbols is still rejected.
+        """
+        states = self.states()
+        symbol_count = len(self.symbols())
+
+        # The states that reject some continuation by themselves
+        rejecting = {
+            state
+            for state in states
+            if state not in self.final_states
+            or len(self.graph.transitions(state)) < symbol_count
+        }
+
+        return states - self._reaching(rejecting)
+
+    def _prepare_matching(self):
+        self._universal_states = self.universal_states()
+        self._symbols = self.symbols()
+        self._covers_all_characters = (
+            self.alphabet is not None
+            and sum(self.symbol_sizes().values()) == _CHARACTER_COUNT
+        )
+
+        stopping_states = self.dead_states() | self._universal_states
+
+        self._matching_edges = {}
+        for (state, symbol), next_state in self.graph.items():
+            if next_state not in stopping_states:
+                self._matching_edges.setdefault(state, {})[symbol] = next_state
+
+    def label(self, state):
+        return self.state_labels.get(state, state)
+
+    def _labeled_automaton(self):
+        transition_function = {
+            (self.label(state), input_symbol): self.label(next_state)
+            for (state, input_symbol), next_state in self.graph.items()
+        }
+        starting_state = self.label(self.starting_state)
+        final_states = {self.label(state) for state in self.final_states}
+
+        return transition_function, starting_state, final_states
+
     def plot(self):
-        plot_automaton(self.transition_function, self.starting_state, self.final_states)
+        plot_automaton(*self._labeled_automaton())
 
     def print(self):
-        print_automaton(
-            self.transition_function, self.starting_state, self.final_states
-        )
+        print_automaton(*self._labeled_automaton())
 
     def is_string_accepted(self, input_string):
         """Check if the string is accepted by the DFA.
@@ -32,17 +217,157 @@ class Dfa:
         Returns:
             True if the automaton accepts the string, False otherwise.
         """
-        current_state = self.starting_state
-        for input_symbol in input_string:
+        key = (self.graph.version, self.starting_state, frozenset(self.final_states))
+        if self._matching_key != key:
+            self._prepare_matching()
+            self._matching_key = key
 
-            if (current_state, input_symbol) not in self.transition_function:
-                # The automaton does not terminate
-                return False
+        chars = iter(input_string)
+        if self.alphabet is not None:
+            input_symbols = map(self.alphabet.classify, chars)
+        else:
+            input_symbols = chars
 
-            current_state = self.transition_function[(current_state, input_symbol)]
+        edges = self._matching_edges
+        no_transitions = {}
 
-        if current_state in self.final_states:
-            return True
+        current_state = self.starting_state
+        for input_symbol in input_symbols:
+            next_state = edges.get(current_state, no_transitions).get(input_symbol)
+
+            if next_state is None:
+                break
+            current_state = next_state
         else:
-            # The automaton terminates in a non-final state
-            return False
+            return current_state in self.final_states
+
+        # The transition is missing, or goes into a dead or a universal state,
+        # the rest of the input does not have to be run.
+        next_state = self.graph.get(current_state, input_symbol)
+        if next_state in self._universal_states:
+            if self._covers_all_characters:
+                return True
+
+            # Accepted, unless a character of the rest is of none of the symbols.
+            # The chars are only classified once each.
+            rest = set(chars)
+            if self.alphabet is not None:
+                rest = map(self.alphabet.classify, rest)
+
+            return self._symbols.issuperset(rest)
+
+        # The automaton does not terminate, or can not accept any more
+        return False
+
+    def minimize(self):
+        """Creates the minimal dfa of the same language with Hopcroft's algorithm.
+
+        The states are split into blocks of equivalent states, starting from the
+        accepting and the non accepting states. A block is split whenever only
+        some of its states go into a splitter block on a symbol. Only the smaller
+        half of a split has to be used as a splitter again, so every state is in
+        O(log n) splitters.
+
+        The missing transitions go to a dead state. The block of the dead state,
+        and of every state that can not reach an accepting state, is left out of
+        the minimal dfa.
+
+        Returns:
+            The minimal dfa, with integer states and the starting state 0.
+        """
+        states = self.states()
+        states.add(_DEAD_STATE)
+        symbols = self.symbols()
+
+        # input symbol -> state -> previous states, of the completed automaton
+        reverse = {symbol: {} for symbol in symbols}
+        for state in states:
+            transitions = self.graph.transitions(state)
+            for symbol in symbols:
+                next_state = transitions.get(symbol, _DEAD_STATE)
+                reverse[symbol].setdefault(next_state, []).append(state)
+
+        accepting = states & set(self.final_states)
+        blocks = [block for block in (accepting, states - accepting) if block]
+        block_of = {state: i for i, block in enumerate(blocks) for state in block}
+
+        # Blocks waiting to be used as splitters
+        waiting = {min(range(len(blocks)), key=lambda i: len(blocks[i]))}
+
+        while waiting:
+            splitter = list(blocks[waiting.pop()])
+
+            for symbol in symbols:
+                previous_states = reverse[symbol]
+
+                # block -> its states that go into the splitter on the symbol
+                touched = {}
+                for state in splitter:
+                    for previous_state in previous_states.get(state, ()):
+                        touched.setdefault(block_of[previous_state], set()).add(
+                            previous_state
+                        )
+
+                for block, inside in touched.items():
+                    if len(inside) == len(blocks[block]):
+                        continue
+
+                    new_block = len(blocks)
+                    blocks[block] -= inside
+                    blocks.append(inside)
+                    for state in inside:
+                        block_of[state] = new_block
+
+                    if block in waiting:
+                        waiting.add(new_block)
+                    elif len(inside) <= len(blocks[block]):
+                        waiting.add(new_block)
+                    else:
+                        waiting.add(block)
+
+        dead_block = block_of[_DEAD_STATE]
+
+        # Number the blocks in the order they are reached from the start
+        new_states = {block_of[self.starting_state]: 0}
+        worklist = [block_of[self.starting_state]]
+        transition_function = TransitionGraph(deterministic=True)
+        while worklist:
+            block = worklist.pop()
+            if block == dead_block:
+                continue
+
+            # Every state of a block has the same transitions, up to the blocks
+            state = next(iter(blocks[block]))
+            for symbol, next_state in self.graph.transitions(state).items():
+                next_block = block_of[next_state]
+                if next_block == dead_block:
+                    continue
+
+                if next_block not in new_states:
+                    new_states[next_block] = len(new_states)
+                    worklist.append(next_block)
+
+                transition_function.add(
+                    new_states[block], symbol, new_states[next_block]
+                )
+
+        final_states = {
+            new_state
+            for block, new_state in new_states.items()
+            if block != dead_block and not blocks[block].isdisjoint(self.final_states)
+        }
+        state_labels = {
+            new_state: ",".join(
+                sorted(str(self.label(state)) for state in blocks[block])
+            )
+            for block, new_state in new_states.items()
+            if block != dead_block
+        }
+
+        return Dfa(
+            transition_function,
+            0,
+            final_states,
+            state_labels,
+            self.alphabet,
+        )
@@ -1,6 +1,7 @@
 import unittest
 
 from dfa import Dfa
+from regex import Regex
 
 
 class DfaTest(unittest.TestCase):
@@ -55,3 +56,109 @@ class DfaTest(unittest.TestCase):
         self.assertFalse(dfa.is_string_accepted("1"))
         self.assertFalse(dfa.is_string_accepted("01"))
         self.assertFalse(dfa.is_string_accepted("101"))
+
+    def test_dfa_minimize(self):
+        # B and C are equivalent, D can not reach a final state
+        transition_function = {
+            ("A", "0"): "B",
+            ("A", "1"): "C",
+            ("B", "0"): "E",
+            ("B", "1"): "D",
+            ("C", "0"): "E",
+            ("C", "1"): "D",
+            ("D", "0"): "D",
+            ("E", "0"): "E",
+        }
+        dfa = Dfa(transition_function, "A", {"E"})
+
+        minimal_dfa = dfa.minimize()
+
+        self.assertEqual(minimal_dfa.starting_state, 0)
+        self.assertEqual(minimal_dfa.states(), {0, 1, 2})
+        self.assertEqual(
+            minimal_dfa.transition_function,
+            {(0, "0"): 1, (0, "1"): 1, (1, "0"): 2, (2, "0"): 2},
+        )
+        self.assertEqual(minimal_dfa.final_states, {2})
+        self.assertEqual(minimal_dfa.label(1), "B,C")
+
+    def test_dfa_minimize_empty_language(self):
+        transition_function = {
+            ("A", "0"): "B",
+            ("B", "0"): "A",
+        }
+        dfa = Dfa(transition_function, "A", set())
+
+        minimal_dfa = dfa.minimize()
+
+        self.assertEqual(minimal_dfa.states(), {0})
+        self.assertEqual(minimal_dfa.transition_function, {})
+        self.assertFalse(minimal_dfa.is_string_accepted(""))
+        self.assertFalse(minimal_dfa.is_string_accepted("00"))
+
+    def test_dfa_dead_and_universal_states(self):
+        # After a 0 every input is accepted, after a 1 none
+        transition_function = {
+            ("A", "0"): "B",
+            ("A", "1"): "C",
+            ("B", "0"): "D",
+            ("B", "1"): "B",
+            ("C", "0"): "C",
+            ("D", "0"): "B",
+            ("D", "1"): "D",
+        }
+        dfa = Dfa(transition_function, "A", {"B", "D"})
+
+        self.assertEqual(dfa.dead_states(), {"C"})
+        self.assertEqual(dfa.universal_states(), {"B", "D"})
+
+        self.assertTrue(dfa.is_string_accepted("0"))
+        self.assertTrue(dfa.is_string_accepted("0110100"))
+        self.assertFalse(dfa.is_string_accepted(""))
+        self.assertFalse(dfa.is_string_accepted("1000"))
+
+        # The rest of the input is still checked for unknown symbols
+        self.assertFalse(dfa.is_string_accepted("0110x00"))
+        self.assertFalse(dfa.is_string_accepted("1x"))
+
+    def test_dfa_count_accepted(self):
+        # The binary strings with an even number of 1s
+        transition_function = {
+            ("A", "0"): "A",
+            ("A", "1"): "B",
+            ("B", "0"): "B",
+            ("B", "1"): "A",
+        }
+        dfa = Dfa(transition_function, "A", {"A"})
+
+        self.assertEqual([dfa.count_accepted(n) for n in range(5)], [1, 1, 2, 4, 8])
+        self.assertEqual(dfa.count_accepted(200), 2**199)
+
+        self.assertEqual(Dfa({("A", "0"): "B"}, "A", set()).count_accepted(1), 0)
+
+    def test_dfa_universal_state_of_every_character(self):
+        dfa = Regex("0.*").create_nfa_from_regex().convert_to_dfa()
+
+        self.assertTrue(dfa.is_string_accepted("0" + "xyzε" * 1000))
+        self.assertFalse(dfa.is_string_accepted("1" + "xyzε" * 1000))
+        self.assertTrue(dfa._covers_all_characters)
+
+    def test_dfa_transition_function_is_cached(self):
+        dfa = Dfa({("A", "0"): "B"}, "A", {"B"})
+
+        self.assertIs(dfa.transition_function, dfa.transition_function)
+
+        dfa.graph.add("B", "1", "A")
+        self.assertEqual(dfa.transition_function, {("A", "0"): "B", ("B", "1"): "A"})
+
+    def test_dfa_is_string_accepted_after_changes(self):
+        dfa = Dfa({("A", "0"): "B"}, "A", {"B"})
+        self.assertFalse(dfa.is_string_accepted("01"))
+
+        dfa.graph.add("B", "1", "C")
+        dfa.final_states.add("C")
+        self.assertTrue(dfa.is_string_accepted("01"))
+
+        dfa.starting_state = "B"
+        self.assertTrue(dfa.is_string_accepted("1"))
+        self.assertFalse(dfa.is_string_accepted("01"))
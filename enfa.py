@@ -1,6 +1,7 @@
 from nfa import Nfa
 from plotter import plot_automaton
 from printer import print_automaton
+from transition_graph import TransitionGraph
 
 """ Epsilon Non-deterministic Finite Automaton.
 
@@ -11,15 +12,26 @@ EPS = "ε"
 
 
 class ENfa:
-    def __init__(self, transition_function, starting_state, final_states):
-        # (state, input symbol) -> next states
-        self.transition_function = transition_function
+    def __init__(
+        self, transition_function, starting_state, final_states, alphabet=None
+    ):
+        # state -> input symbol -> next states
+        self.graph = TransitionGraph.from_graph(transition_function)
 
         self.starting_state = starting_state
 
         # A finite set of accepting / final states.
         self.final_states = final_states
 
+        # Maps input characters to the input symbols, see alphabet.py.
+        # Without an alphabet every character is its own symbol.
+        self.alphabet = alphabet
+
+    @property
+    def transition_function(self):
+        """The transitions as a (state, input symbol) -> next states dict."""
+        return self.graph.to_dict()
+
     def plot(self):
         plot_automaton(self.transition_function, self.starting_state, self.final_states)
 
@@ -31,91 +43,185 @@ class ENfa:
             is_epsilon=True,
         )
 
-    def _remove_inaccessable_nodes(self, transition_function, starting_state):
-        result_transition_function = {}
+    def _add_with_eps_closure(self, state, active_states):
+        # Adds the state and every state reachable from it with epsilon
+        # transitions. States already active are not visited again, so a whole
+        # step visits every state and transition at most once.
+        edges = self.graph.edges
 
-        transition_end_nodes = [
-            node for nodes in transition_function.values() for node in nodes
-        ]
+        stack = [state]
+        while stack:
+            state = stack.pop()
+            if state in active_states:
+                continue
 
-        for transition in transition_function:
-            if transition[0] == starting_state or transition[0] in transition_end_nodes:
-                result_transition_function[transition] = transition_function[transition]
+            active_states.add(state)
+            stack.extend(edges.get(state, {}).get(EPS, ()))
 
-        return result_transition_function
+    def is_string_accepted(self, input_string):
+        """Check if the string is accepted by simulating the e-nfa.
 
-    def _remove_eps_transitions(self, transition_function):
-        eps_transitions = {k: v for k, v in transition_function.items() if k[1] == EPS}
-        nfa_transition_function = {
-            k: v for k, v in transition_function.items() if k[1] != EPS
-        }
+        The set of active states is advanced one input symbol at a time, without
+        converting to an nfa or a dfa first. The time is O(len(input) * size of
+        the e-nfa), so it is best for regexes that are matched only a few times.
+
+        Args:
+            input_string: the input to check.
+
+        Returns:
+            True if the automaton accepts the string, False otherwise.
+        """
+        if self.alphabet is not None:
+            input_string = map(self.alphabet.classify, input_string)
+
+        edges = self.graph.edges
+        no_transitions = {}
+
+        active_states = set()
+        self._add_with_eps_closure(self.starting_state, active_states)
+
+        for input_symbol in input_string:
+            next_active_states = set()
+            for state in active_states:
+                for next_state in edges.get(state, no_transitions).get(
+                    input_symbol, ()
+                ):
+                    self._add_with_eps_closure(next_state, next_active_states)
+
+            if not next_active_states:
+                # No state can continue, the automaton does not terminate
+                return False
+
+            active_states = next_active_states
+
+        return not active_states.isdisjoint(self.final_states)
 
-        for eps_transition in eps_transitions:
-            transitions_from_eps_end_state = {
-                k: v
-                for k, v in transition_function.items()
-                if k[0] in transition_function[eps_transition]
-            }
-
-            # TODO: This is not nice. Extract instead of manipulating enfa.
-            end_states = eps_transitions[eps_transition]
-            if end_states.intersection(self.final_states):
-                self.final_states.add(eps_transition[0])
-
-            for eps_end_transition in transitions_from_eps_end_state:
-                eps_transition_state = eps_transition[0]
-                eps_end_transition_symbol = eps_end_transition[1]
-                if (
-                    eps_transition_state,
-                    eps_end_transition_symbol,
-                ) in nfa_transition_function.keys():
-
-                    nfa_transition_function[
-                        (eps_transition_state, eps_end_transition_symbol)
-                    ] = nfa_transition_function[
-                        (eps_transition_state, eps_end_transition_symbol)
-                    ].union(
-                        transitions_from_eps_end_state[eps_end_transition]
-                    )
-                else:
-                    nfa_transition_function[
-                        (eps_transition_state, eps_end_transition_symbol)
-                    ] = transitions_from_eps_end_state[eps_end_transition]
-
-        return nfa_transition_function
-
-    def _remove_all_eps_transitions(self, transition_function):
-        while True:
-            transition_function = self._remove_eps_transitions(transition_function)
-
-            # If there are no more epsilon transitions, break
-            if not next((x for x in transition_function.keys() if x[1] == EPS), None):
-                break
-
-        return transition_function
+    def _get_eps_closures(self):
+        """Computes the epsilon closure of every state.
+
+        The states of a strongly connected component of epsilon transitions have
+        the same closure, so the components are found with an iterative version
+        of Tarjan's algorithm. A component is finished only after every component
+        reachable from it, so its closure is its states plus the already known
+        closures of its successors.
+
+        Returns:
+            A dict of state -> frozenset of the states reachable with epsilon
+            transitions, including the state itself.
+        """
+        eps_successors = {
+            state: transitions[EPS]
+            for state, transitions in self.graph.edges.items()
+            if EPS in transitions
+        }
+        states = self.graph.states() | {self.starting_state}
+
+        closures = {}
+
+        index = {}
+        low_link = {}
+        scc_stack = []
+        on_scc_stack = set()
+
+        for root in states:
+            if root in index:
+                continue
+
+            # Every entry is (state, iterator over its epsilon successors)
+            work_stack = [(root, iter(eps_successors.get(root, ())))]
+            index[root] = low_link[root] = len(index)
+            scc_stack.append(root)
+            on_scc_stack.add(root)
+
+            while work_stack:
+                state, successors = work_stack[-1]
+
+                successor = next(successors, None)
+                if successor is not None:
+                    if successor not in index:
+                        index[successor] = low_link[successor] = len(index)
+                        scc_stack.append(successor)
+                        on_scc_stack.add(successor)
+                        work_stack.append(
+                            (successor, iter(eps_successors.get(successor, ())))
+                        )
+                    elif successor in on_scc_stack:
+                        low_link[state] = min(low_link[state], index[successor])
+                    continue
+
+                work_stack.pop()
+                if work_stack:
+                    parent = work_stack[-1][0]
+                    low_link[parent] = min(low_link[parent], low_link[state])
+
+                if low_link[state] != index[state]:
+                    continue
+
+                # The state is the root of a component, pop the component
+                component = []
+                while True:
+                    member = scc_stack.pop()
+                    on_scc_stack.remove(member)
+                    component.append(member)
+                    if member == state:
+                        break
+
+                closure = set(component)
+                for member in component:
+                    for successor in eps_successors.get(member, ()):
+                        if successor not in closure:
+                            closure |= closures[successor]
+                closure = frozenset(closure)
+
+                for member in component:
+                    closures[member] = closure
+
+        return closures
 
     def convert_to_nfa(self):
         """Converts the e-nfa to an nfa.
 
+        The nfa moves from a state on a symbol to every state the e-nfa moves to
+        on the symbol from any state of the epsilon closure. A state is final if
+        its epsilon closure contains a final state. Only the states reachable from
+        the starting state are kept.
+
         Returns:
             The nfa converted from the e-nfa.
         """
-        nfa_starting_state = self.starting_state
+        closures = self._get_eps_closures()
 
-        nfa_transition_function = {k: v for k, v in self.transition_function.items()}
+        nfa_graph = TransitionGraph()
+        nfa_final_states = set()
 
-        nfa_transition_function = self._remove_all_eps_transitions(
-            nfa_transition_function
-        )
+        visited = {self.starting_state}
+        worklist = [self.starting_state]
+        while worklist:
+            state = worklist.pop()
 
-        nfa_transition_function = self._remove_inaccessable_nodes(
-            nfa_transition_function, nfa_starting_state
-        )
+            closure = closures[state]
+            if not closure.isdisjoint(self.final_states):
+                nfa_final_states.add(state)
+
+            for closure_state in closure:
+                for input_symbol, next_states in self.graph.transitions(
+                    closure_state
+                ).items():
+                    if input_symbol == EPS:
+                        continue
+
+                    nfa_graph.add_all(state, input_symbol, next_states)
+
+                    for next_state in next_states:
+                        if next_state not in visited:
+                            visited.add(next_state)
+                            worklist.append(next_state)
 
         nfa = Nfa(
-            nfa_transition_function,
-            nfa_starting_state,
-            self.final_states,
+            nfa_graph,
+            self.starting_state,
+            nfa_final_states,
+            self.alphabet,
         )
 
         return nfa
@@ -140,3 +140,97 @@ class ENfaTest(unittest.TestCase):
         }
 
         self.assertDictEqual(nfa.transition_function, expected_nfa_tranisition_function)
+
+    def test_enfa_eps_cycle(self):
+        transition_function = {
+            ("A", EPS): {"B"},
+            ("B", EPS): {"C"},
+            ("C", EPS): {"A", "D"},
+            ("B", "0"): {"A"},
+            ("D", "1"): {"D"},
+        }
+        starting_state = "A"
+        final_states = {"D"}
+
+        e_nfa = ENfa(transition_function, starting_state, final_states)
+
+        nfa = e_nfa.convert_to_nfa()
+
+        expected_nfa_tranisition_function = {
+            ("A", "0"): {"A"},
+            ("A", "1"): {"D"},
+            ("D", "1"): {"D"},
+        }
+
+        self.assertDictEqual(nfa.transition_function, expected_nfa_tranisition_function)
+        self.assertEqual(nfa.final_states, {"A", "D"})
+
+    def test_enfa_final_states(self):
+        transition_function = {
+            ("A", "1"): {"B"},
+            ("B", EPS): {"C"},
+            ("C", EPS): {"D"},
+            ("D", "1"): {"E"},
+        }
+        starting_state = "A"
+        final_states = {"D"}
+
+        e_nfa = ENfa(transition_function, starting_state, final_states)
+
+        nfa = e_nfa.convert_to_nfa()
+
+        self.assertEqual(nfa.final_states, {"B"})
+        # The e-nfa is not modified
+        self.assertEqual(e_nfa.final_states, {"D"})
+
+    def test_enfa_eps_closures(self):
+        transition_function = {
+            ("A", EPS): {"B", "C"},
+            ("B", EPS): {"A"},
+            ("C", EPS): {"D"},
+            ("D", "0"): {"A"},
+        }
+
+        e_nfa = ENfa(transition_function, "A", {"D"})
+
+        closures = e_nfa._get_eps_closures()
+
+        self.assertEqual(closures["A"], {"A", "B", "C", "D"})
+        self.assertEqual(closures["B"], {"A", "B", "C", "D"})
+        self.assertEqual(closures["C"], {"C", "D"})
+        self.assertEqual(closures["D"], {"D"})
+
+    def test_is_string_accepted(self):
+        transition_function = {
+            ("A", "0"): {"H"},
+            ("B", EPS): {"C", "I"},
+            ("C", EPS): {"F", "G"},
+            ("D", EPS): {"B"},
+            ("E", EPS): {"B"},
+            ("F", "0"): {"D"},
+            ("G", "1"): {"E"},
+            ("H", EPS): {"C", "I"},
+            ("I", "1"): {"J"},
+        }
+
+        e_nfa = ENfa(transition_function, "A", {"J"})
+
+        self.assertTrue(e_nfa.is_string_accepted("011001"))
+        self.assertTrue(e_nfa.is_string_accepted("01"))
+
+        self.assertFalse(e_nfa.is_string_accepted(""))
+        self.assertFalse(e_nfa.is_string_accepted("1"))
+        self.assertFalse(e_nfa.is_string_accepted("010"))
+
+    def test_is_string_accepted_eps_cycle(self):
+        transition_function = {
+            ("A", EPS): {"B"},
+            ("B", EPS): {"A", "C"},
+            ("C", "0"): {"A"},
+        }
+
+        e_nfa = ENfa(transition_function, "A", {"C"})
+
+        self.assertTrue(e_nfa.is_string_accepted(""))
+        self.assertTrue(e_nfa.is_string_accepted("000"))
+        self.assertFalse(e_nfa.is_string_accepted("01"))
@@ -0,0 +1,180 @@
+from collections import deque
+
+from alphabet import Alphabet, CharSet
+
+""" Language equivalence and inclusion of dfas.
+
+Two dfas are compared with the Hopcroft-Karp algorithm: starting from the pair
+of their starting states, the pairs of states that have to be equivalent are
+merged in a union-find, and the next pairs are only followed if they are not
+merged yet. It stops at the first pair where one state accepts and the other
+does not, the inputs leading to that pair are a counterexample. It runs in
+near linear time in the number of states, and only visits the pairs it needs.
+
+L(a) is a subset of L(b) if the union of a and b is equivalent to b. The union
+is the product of a and b, that is built on the fly.
+
+The dfas usually have different alphabets, so they are compared on the classes
+of characters that are in the same symbol of both.
+"""
+
+# Stands for the missing transitions
+_DEAD_STATE = object()
+
+
+class _Automaton:
+    """A dfa, with its transitions on the common classes of the characters."""
+
+    def __init__(self, dfa, representatives):
+        self.dfa = dfa
+        self.starting_state = dfa.starting_state
+
+        # class index -> symbol of the class in the dfa
+        self.symbols = [_classify(dfa, char) for char in representatives]
+
+    def next_state(self, state, class_index):
+        if state is _DEAD_STATE:
+            return _DEAD_STATE
+
+        return self.dfa.graph.edges.get(state, {}).get(
+            self.symbols[class_index], _DEAD_STATE
+        )
+
+    def accepts(self, state):
+        return state is not _DEAD_STATE and state in self.dfa.final_states
+
+
+class _Union:
+    """The product of two dfas that accepts if any of them accepts."""
+
+    def __init__(self, automaton1, automaton2):
+        self.automaton1 = automaton1
+        self.automaton2 = automaton2
+        self.starting_state = (automaton1.starting_state, automaton2.starting_state)
+
+    def next_state(self, state, class_index):
+        return (
+            self.automaton1.next_state(state[0], class_index),
+            self.automaton2.next_state(state[1], class_index),
+        )
+
+    def accepts(self, state):
+        return self.automaton1.accepts(state[0]) or self.automaton2.accepts(state[1])
+
+
+def _classify(dfa, char):
+    if dfa.alphabet is not None:
+        return dfa.alphabet.classify(char)
+
+    # Without an alphabet every character is its own symbol
+    return char
+
+
+def _char_sets(dfa):
+    if dfa.alphabet is not None:
+        return list(dfa.alphabet.classes.values())
+
+    return [CharSet.single(symbol) for (_, symbol), _ in dfa.graph.items()]
+
+
+def _representatives(*dfas):
+    # A character of every class of the common refinement of the alphabets
+    alphabet = Alphabet(char_set for dfa in dfas for char_set in _char_sets(dfa))
+
+    return [alphabet.representative(symbol) for symbol in alphabet.symbols]
+
+
+def _find(parents, state):
+    root = state
+    while parents.get(root, root) != root:
+        root = parents[root]
+
+    # Path compression
+    while state != root:
+        parents[state], state = root, parents[state]
+
+    return root
+
+
+def _hopcroft_karp(automaton1, automaton2, representatives):
+    # The states of the two automata are told apart by their side, 1 or 2
+    parents = {}
+    starting_pair = (automaton1.starting_state, automaton2.starting_state)
+    parents[(1, starting_pair[0])] = (2, starting_pair[1])
+
+    # pair -> the previous pair and the index of the class leading to it
+    previous = {starting_pair: None}
+
+    queue = deque([starting_pair])
+    while queue:
+        pair = queue.popleft()
+        state1, state2 = pair
+
+        if automaton1.accepts(state1) != automaton2.accepts(state2):
+            return _path(previous, pair, representatives)
+
+        for class_index in range(len(representatives)):
+            next_pair = (
+                automaton1.next_state(state1, class_index),
+                automaton2.next_state(state2, class_index),
+            )
+
+            root1 = _find(parents, (1, next_pair[0]))
+            root2 = _find(parents, (2, next_pair[1]))
+            if root1 != root2:
+                parents[root1] = root2
+                previous[next_pair] = (pair, class_index)
+                queue.append(next_pair)
+
+    return None
+
+
+def _path(previous, pair, representatives):
+    chars = []
+    while previous[pair] is not None:
+        pair, class_index = previous[pair]
+        chars.append(representatives[class_index])
+
+    return "".join(reversed(chars))
+
+
+def counterexample(dfa1, dfa2):
+    """Finds an input that is accepted by exactly one of the dfas.
+
+    Args:
+        dfa1, dfa2: the dfas to compare.
+
+    Returns:
+        The input, None if the dfas are equivalent.
+    """
+    representatives = _representatives(dfa1, dfa2)
+
+    return _hopcroft_karp(
+        _Automaton(dfa1, representatives),
+        _Automaton(dfa2, representatives),
+        representatives,
+    )
+
+
+def subset_counterexample(dfa1, dfa2):
+    """Finds an input that is accepted by dfa1, but not by dfa2.
+
+    Returns:
+        The input, None if the language of dfa1 is a subset of dfa2's.
+    """
+    representatives = _representatives(dfa1, dfa2)
+    automaton1 = _Automaton(dfa1, representatives)
+    automaton2 = _Automaton(dfa2, representatives)
+
+    # The union only differs from dfa2 on the inputs of dfa1 that dfa2 rejects
+    return _hopcroft_karp(_Union(automaton1, automaton2), automaton2, representatives)
+
+
+def equivalent(dfa1, dfa2):
+    """True if the dfas accept the same language."""
+    return counterexample(dfa1, dfa2) is None
+
+
+def is_subset(dfa1, dfa2):
+    """True if every input accepted by dfa1 is accepted by dfa2."""
+    return subset_counterexample(dfa1, dfa2) is None
@@ -0,0 +1,78 @@
+import itertools
+import unittest
+
+import main
+from dfa import Dfa
+from equivalence import counterexample, equivalent, is_subset, subset_counterexample
+from regex import Regex
+
+
+def create_dfa(regex):
+    return Regex(regex).create_nfa_from_regex().convert_to_dfa()
+
+
+def all_strings(chars, max_length):
+    for length in range(max_length + 1):
+        for symbols in itertools.product(chars, repeat=length):
+            yield "".join(symbols)
+
+
+class EquivalenceTest(unittest.TestCase):
+    def test_equivalent(self):
+        self.assertTrue(equivalent(create_dfa("(0+1)*"), create_dfa("(0*1*)*")))
+        self.assertTrue(equivalent(create_dfa("0(10)*"), create_dfa("(01)*0")))
+        self.assertTrue(equivalent(create_dfa("[a-c]*"), create_dfa("(a+b+c)*")))
+
+        self.assertFalse(equivalent(create_dfa("0*"), create_dfa("00*")))
+        self.assertFalse(equivalent(create_dfa("[a-c]*"), create_dfa("(a+b)*")))
+
+    def test_counterexample(self):
+        for regex1, regex2 in [
+            ("0*", "00*"),
+            ("[a-c]*", "(a+b)*"),
+            ("(01)*", "(0+1)*"),
+        ]:
+            dfa1 = create_dfa(regex1)
+            dfa2 = create_dfa(regex2)
+            example = counterexample(dfa1, dfa2)
+
+            self.assertNotEqual(
+                dfa1.is_string_accepted(example), dfa2.is_string_accepted(example)
+            )
+
+        self.assertIsNone(counterexample(create_dfa("0*0*"), create_dfa("0*")))
+
+    def test_is_subset(self):
+        self.assertTrue(is_subset(create_dfa("0(0+1)*1"), create_dfa("(0+1)*")))
+        self.assertTrue(is_subset(create_dfa("[ab]"), create_dfa(".")))
+        self.assertFalse(is_subset(create_dfa("(0+1)*"), create_dfa("0(0+1)*1")))
+
+        example = subset_counterexample(create_dfa("(0+1)*"), create_dfa("0(0+1)*1"))
+        self.assertTrue(create_dfa("(0+1)*").is_string_accepted(example))
+        self.assertFalse(create_dfa("0(0+1)*1").is_string_accepted(example))
+
+    def test_dfa_without_alphabet(self):
+        dfa1 = Dfa({("A", "0"): "A"}, "A", {"A"})
+        dfa2 = Dfa({("B", "0"): "C", ("C", "0"): "B"}, "B", {"B", "C"})
+
+        self.assertTrue(equivalent(dfa1, dfa2))
+        self.assertTrue(equivalent(dfa1, create_dfa("0*")))
+        self.assertTrue(is_subset(dfa1, create_dfa("(0+1)*")))
+        self.assertEqual(counterexample(dfa1, create_dfa("0")), "")
+
+    def test_same_as_checking_every_string(self):
+        regexes = ["0(0+1)*1", "(0*1)*(1+0)*", "0*1*0", "(01+1)*0", "", "(0+1)*1"]
+
+        for regex1, regex2 in itertools.product(regexes, repeat=2):
+            dfa1 = create_dfa(regex1)
+            dfa2 = create_dfa(regex2)
+
+            accepted1 = {s for s in all_strings("01", 6) if dfa1.is_string_accepted(s)}
+            accepted2 = {s for s in all_strings("01", 6) if dfa2.is_string_accepted(s)}
+
+            self.assertEqual(equivalent(dfa1, dfa2), accepted1 == accepted2)
+            self.assertEqual(is_subset(dfa1, dfa2), accepted1 <= accepted2)
+
+    def test_main_equivalent(self):
+        self.assertTrue(main.equivalent("0(0+1)*", "0(1+0)*"))
+        self.assertFalse(main.equivalent("0(0+1)*", "(0+1)*"))
@@ -0,0 +1,553 @@
+from dataclasses import dataclass, field
+
+from alphabet import CharSet
+from enfa import EPS
+
+""" Regular expression trees.
+
+from_postfix builds the tree exactly as the regex was written. The smart
+constructors (symbol, concatenation, union, star) simplify while building, so
+equal languages written in the common equivalent forms end up as equal
+expressions:
+    * ∅r = r∅ = ∅, εr = rε = r, concatenations are flattened
+    * r*r* = r*
+    * ∅ + r = r, unions are flattened, deduplicated and sorted
+    * (r*)* = r*, (r* + s)* = (r + s)*, ε* = ∅* = ε
+
+simplify rebuilds a tree with the smart constructors and also factors out the
+common prefixes of the alternatives of unions, ab + ac = a(b + c). The trees are
+walked without recursion, and every node keeps its sort key and hash, so deeply
+nested regexes do not hit the recursion limit.
+"""
+
+KLEENEE = "*"
+CONCATENATION = "."
+UNION = "+"
+
+# The length of the prefix of the string of an expression in its sort key
+KEY_LENGTH = 128
+
+
+@dataclass(frozen=True, eq=False)
+class Expression:
+    # Tells the kinds of expressions apart in the hash, an int so the hash is
+    # the same in every process
+    _TAG = 0
+
+    # True if the expression matches the empty string
+    nullable: bool = field(init=False, repr=False)
+
+    # The alternatives of unions are sorted by (the first KEY_LENGTH characters
+    # of the string of the expression, hash). Both are built from the ones of
+    # the operands once, so neither walks the whole tree again.
+    sort_key: tuple = field(init=False, repr=False)
+    _hash: int = field(init=False, repr=False)
+
+    def _set_cached(self, nullable):
+        object.__setattr__(self, "nullable", nullable)
+        object.__setattr__(self, "_hash", hash((self._TAG, self._operands())))
+
+        parts = []
+        length = 0
+        for piece in self._pieces():
+            part = piece if isinstance(piece, str) else piece.sort_key[0]
+            parts.append(part)
+            length += len(part)
+            if length >= KEY_LENGTH:
+                break
+        object.__setattr__(self, "sort_key", ("".join(parts)[:KEY_LENGTH], self._hash))
+
+    def _operands(self):
+        return ()
+
+    def _pieces(self):
+        # The strings and the operands of the string of the expression
+        return ()
+
+    def __str__(self):
+        # Built without recursion, the pieces of the operands replace them
+        parts = []
+        stack = [self]
+        while stack:
+            piece = stack.pop()
+            if isinstance(piece, str):
+                parts.append(piece)
+            else:
+                stack.extend(reversed(list(piece._pieces())))
+
+        return "".join(parts)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, Expression):
+            return NotImplemented
+
+        # Compared without recursion, the hashes tell most differences apart
+        # at once
+        stack = [(self, other)]
+        while stack:
+            left, right = stack.pop()
+            if left is right:
+                continue
+
+            if not isinstance(left, Expression) or not isinstance(right, Expression):
+                if left != right:
+                    return False
+                continue
+
+            if type(left) is not type(right) or left._hash != right._hash:
+                return False
+
+            left_operands = left._operands()
+            right_operands = right._operands()
+            if len(left_operands) != len(right_operands):
+                return False
+            stack.extend(zip(left_operands, right_operands))
+
+        return True
+
+
+@dataclass(frozen=True, eq=False)
+class Empty(Expression):
+    """Matches nothing."""
+
+    _TAG = 1
+
+    def __post_init__(self):
+        self._set_cached(False)
+
+    def _pieces(self):
+        return ("∅",)
+
+
+@dataclass(frozen=True, eq=False)
+class Epsilon(Expression):
+    """Matches only the empty string."""
+
+    _TAG = 2
+
+    def __post_init__(self):
+        self._set_cached(True)
+
+    def _pieces(self):
+        return ("ε",)
+
+
+@dataclass(frozen=True, eq=False)
+class Symbol(Expression):
+    char_set: CharSet
+
+    _TAG = 3
+
+    def __post_init__(self):
+        self._set_cached(False)
+
+    def _operands(self):
+        return (self.char_set,)
+
+    def _pieces(self):
+        return (str(self.char_set),)
+
+
+@dataclass(frozen=True, eq=False)
+class Concatenation(Expression):
+    # At least two factors, flat so long regexes do not create deep trees
+    factors: tuple
+
+    _TAG = 4
+
+    def __post_init__(self):
+        self._set_cached(all(f.nullable for f in self.factors))
+
+    def _operands(self):
+        return self.factors
+
+    def _pieces(self):
+        for factor in self.factors:
+            yield from _parenthesize(factor, self)
+
+
+@dataclass(frozen=True, eq=False)
+class Union(Expression):
+    alternatives: tuple
+
+    _TAG = 5
+
+    def __post_init__(self):
+        self._set_cached(any(a.nullable for a in self.alternatives))
+
+    def _operands(self):
+        return self.alternatives
+
+    def _pieces(self):
+        for i, alternative in enumerate(self.alternatives):
+            if i:
+                yield UNION
+            yield from _parenthesize(alternative, self)
+
+
+@dataclass(frozen=True, eq=False)
+class Star(Expression):
+    expression: Expression
+
+    _TAG = 6
+
+    def __post_init__(self):
+        self._set_cached(True)
+
+    def _operands(self):
+        return (self.expression,)
+
+    def _pieces(self):
+        yield from _parenthesize(self.expression, self)
+        yield KLEENEE
+
+
+def _sort_key(expression):
+    return expression.sort_key
+
+
+def _precedence(expression):
+    if isinstance(expression, Union):
+        return 0
+    elif isinstance(expression, Concatenation):
+        return 1
+    else:
+        return 2
+
+
+def _parenthesize(expression, parent):
+    # The pieces of the operand of the parent, in parentheses if needed
+    if _precedence(expression) < _precedence(parent) or (
+        isinstance(parent, Star) and isinstance(expression, Concatenation)
+    ):
+        return ("(", expression, ")")
+
+    return (expression,)
+
+
+EMPTY = Empty()
+EPSILON = Epsilon()
+
+
+def symbol(char_set):
+    if isinstance(char_set, str):
+        char_set = CharSet.single(char_set)
+
+    return Symbol(char_set)
+
+
+def _factors(expression):
+    if isinstance(expression, Concatenation):
+        return expression.factors
+
+    if expression == EPSILON:
+        return ()
+
+    return (expression,)
+
+
+def concatenation_of(factors):
+    """Concatenates the already simplified factors."""
+    result = []
+    for factor in factors:
+        if factor == EMPTY:
+            return EMPTY
+
+        for f in _factors(factor):
+            # r*r* = r*
+            if not (isinstance(f, Star) and result and result[-1] == f):
+                result.append(f)
+
+    if not result:
+        return EPSILON
+
+    if len(result) == 1:
+        return result[0]
+
+    return Concatenation(tuple(result))
+
+
+def concatenation(left, right):
+    return concatenation_of((left, right))
+
+
+def union_of(alternatives):
+    """Creates the union of the already simplified alternatives."""
+    flat = set()
+    for expression in alternatives:
+        if isinstance(expression, Union):
+            flat.update(expression.alternatives)
+        elif expression != EMPTY:
+            flat.add(expression)
+
+    # ε is redundant next to anything else that matches the empty string
+    if EPSILON in flat and any(a.nullable for a in flat if a != EPSILON):
+        flat.remove(EPSILON)
+
+    if not flat:
+        return EMPTY
+
+    if len(flat) == 1:
+        return flat.pop()
+
+    return Union(tuple(sorted(flat, key=_sort_key)))
+
+
+def union(left, right):
+    return union_of((left, right))
+
+
+def star(expression):
+    if expression == EMPTY or expression == EPSILON:
+        return EPSILON
+
+    if isinstance(expression, Star):
+        return expression
+
+    # (r* + s)* = (r + s)*, (ε + s)* = s*
+    if isinstance(expression, Union):
+        alternatives = [
+            a.expression if isinstance(a, Star) else a
+            for a in expression.alternatives
+            if a != EPSILON
+        ]
+        if len(alternatives) == 1:
+            return star(alternatives[0])
+
+        return Star(Union(tuple(sorted(set(alternatives), key=_sort_key))))
+
+    return Star(expression)
+
+
+# Marks the end of an alternative in the prefix tree of _factor_union
+_END = object()
+
+
+def _factor_union(alternatives):
+    # The alternatives are put into a prefix tree of their factors, so every
+    # alternative is only split once. A node is the union of its children, each
+    # concatenated with the factor leading to it.
+    root = {}
+    stack = [(root, _factors(alternative)) for alternative in alternatives]
+    while stack:
+        node, factors = stack.pop()
+
+        if len(factors) == 1 and isinstance(factors[0], Union) and node is not root:
+            # a(b + c) is grouped like ab + ac
+            stack.extend((node, _factors(a)) for a in factors[0].alternatives)
+        elif factors:
+            stack.append((node.setdefault(factors[0], {}), factors[1:]))
+        else:
+            node[_END] = None
+
+    # The expressions of the nodes, children first
+    expressions = {}
+    stack = [(root, False)]
+    while stack:
+        node, visited = stack.pop()
+
+        if not visited:
+            stack.append((node, True))
+            stack.extend(
+                (_chain(child)[1], False)
+                for key, child in node.items()
+                if key is not _END
+            )
+            continue
+
+        parts = []
+        for key, child in node.items():
+            if key is _END:
+                parts.append(EPSILON)
+            else:
+                # A chain of nodes with a single child is one concatenation
+                factors, end = _chain(child)
+                parts.append(concatenation_of([key] + factors + [expressions[id(end)]]))
+
+        expressions[id(node)] = union_of(parts)
+
+    return expressions[id(root)]
+
+
+def _chain(node):
+    # Follows the nodes that only continue with a single factor
+    factors = []
+    while len(node) == 1 and _END not in node:
+        ((factor, node),) = node.items()
+        factors.append(factor)
+
+    return factors, node
+
+
+def _children(expression):
+    # The parser creates left nested binary concatenations and unions, they
+    # are collected without recursion.
+    if isinstance(expression, Star):
+        return [expression.expression]
+
+    if not isinstance(expression, (Concatenation, Union)):
+        return []
+
+    children = []
+    stack = [expression]
+    while stack:
+        e = stack.pop()
+        if type(e) is type(expression):
+            stack.extend(
+                reversed(e.factors if isinstance(e, Concatenation) else e.alternatives)
+            )
+        else:
+            children.append(e)
+
+    return children
+
+
+def _rebuild(expression, combine):
+    # Rebuilds the tree from the leaves up, combine(expression, children)
+    # creates a node of the new tree from the new trees of its children.
+    results = []
+    stack = [(expression, False)]
+    while stack:
+        e, visited = stack.pop()
+        children = _children(e)
+
+        if visited or not children:
+            count = len(children)
+            results[len(results) - count :] = [
+                combine(e, results[len(results) - count :])
+            ]
+        else:
+            stack.append((e, True))
+            stack.extend((child, False) for child in reversed(children))
+
+    return results[0]
+
+
+def _simplify_node(expression, children):
+    if isinstance(expression, Concatenation):
+        return concatenation_of(children)
+
+    if isinstance(expression, Union):
+        result = union_of(children)
+        if isinstance(result, Union):
+            result = _factor_union(result.alternatives)
+        return result
+
+    if isinstance(expression, Star):
+        return star(children[0])
+
+    return expression
+
+
+def simplify(expression):
+    """Rewrites the expression into a smaller normal form of the same language."""
+    return _rebuild(expression, _simplify_node)
+
+
+def _reverse_node(expression, children):
+    if isinstance(expression, Concatenation):
+        return concatenation_of(reversed(children))
+
+    if isinstance(expression, Union):
+        return union_of(children)
+
+    if isinstance(expression, Star):
+        return star(children[0])
+
+    return expression
+
+
+def reverse(expression):
+    """Returns the expression of the reversed strings of the language."""
+    return _rebuild(expression, _reverse_node)
+
+
+def count_nodes(expression):
+    """Returns the number of nodes of the expression tree."""
+    count = 0
+
+    stack = [expression]
+    while stack:
+        e = stack.pop()
+        count += 1
+
+        if isinstance(e, Concatenation):
+            stack.extend(e.factors)
+        elif isinstance(e, Union):
+            stack.extend(e.alternatives)
+        elif isinstance(e, Star):
+            stack.append(e.expression)
+
+    return count
+
+
+def from_postfix(postfix_regex):
+    """Creates the expression tree of a postfix regex, without simplifying it.
+
+    Args:
+        postfix_regex: the regular expression in postfix notation, a list of
+            operators and char sets or a string of operators and characters
+
+    Returns:
+        The expression tree of the regex.
+    """
+    stack = []
+    for e in postfix_regex:
+        if e == CONCATENATION:
+            right = stack.pop()
+            left = stack.pop()
+            stack.append(Concatenation((left, right)))
+        elif e == UNION:
+            right = stack.pop()
+            left = stack.pop()
+            stack.append(Union((left, right)))
+        elif e == KLEENEE:
+            stack.append(Star(stack.pop()))
+        elif e == EPS:
+            stack.append(EPSILON)
+        else:
+            stack.append(symbol(e))
+
+    return stack.pop() if stack else EPSILON
+
+
+def to_postfix(expression):
+    """Converts the expression to a postfix regex.
+
+    Args:
+        expression: an expression that is not ∅
+
+    Returns:
+        The list of operators, char sets and EPS of the expression in postfix order.
+    """
+    if expression == EMPTY:
+        raise ValueError("The empty language can not be written as a regex")
+
+    postfix_regex = []
+
+    # Expressions to convert and operators to write, the next one on the top
+    stack = [expression]
+    while stack:
+        e = stack.pop()
+
+        if isinstance(e, str):
+            postfix_regex.append(e)
+        elif isinstance(e, Symbol):
+            postfix_regex.append(e.char_set)
+        elif isinstance(e, (Concatenation, Union)):
+            operator = CONCATENATION if isinstance(e, Concatenation) else UNION
+            operands = e.factors if isinstance(e, Concatenation) else e.alternatives
+
+            # The first operand, then every other one followed by the operator
+            for operand in reversed(operands[1:]):
+                stack += [operator, operand]
+            stack.append(operands[0])
+        elif isinstance(e, Star):
+            stack += [KLEENEE, e.expression]
+        else:
+            postfix_regex.append(EPS)
+
+    return postfix_regex
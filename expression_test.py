@@ -0,0 +1,127 @@
+import unittest
+
+from enfa import EPS
+from expression import (
+    EMPTY,
+    EPSILON,
+    KEY_LENGTH,
+    concatenation,
+    count_nodes,
+    from_postfix,
+    reverse,
+    simplify,
+    to_postfix,
+    star,
+    symbol,
+    union,
+)
+
+
+class ExpressionTest(unittest.TestCase):
+    def test_concatenation(self):
+        zero = symbol("0")
+
+        self.assertEqual(concatenation(zero, EMPTY), EMPTY)
+        self.assertEqual(concatenation(EPSILON, zero), zero)
+        self.assertEqual(concatenation(zero, EPSILON), zero)
+        self.assertEqual(
+            concatenation(concatenation(zero, zero), zero),
+            concatenation(zero, concatenation(zero, zero)),
+        )
+
+    def test_union(self):
+        zero = symbol("0")
+        one = symbol("1")
+
+        self.assertEqual(union(zero, EMPTY), zero)
+        self.assertEqual(union(zero, zero), zero)
+        self.assertEqual(union(one, zero), union(zero, one))
+        self.assertEqual(union(union(zero, one), zero), union(zero, one))
+        self.assertEqual(union(EPSILON, star(zero)), star(zero))
+
+    def test_star(self):
+        zero = symbol("0")
+
+        self.assertEqual(star(star(zero)), star(zero))
+        self.assertEqual(star(EPSILON), EPSILON)
+        self.assertEqual(star(EMPTY), EPSILON)
+
+    def test_nullable(self):
+        self.assertTrue(from_postfix("0*1*.").nullable)
+        self.assertTrue(from_postfix("01+*").nullable)
+        self.assertTrue(from_postfix("").nullable)
+
+        self.assertFalse(from_postfix("0*1.").nullable)
+        self.assertFalse(EMPTY.nullable)
+
+    def test_from_postfix(self):
+        self.assertEqual(str(from_postfix("001+*.1.")), "0(0+1)*1")
+        self.assertEqual(str(from_postfix("10+0*.*")), "((1+0)0*)*")
+        self.assertEqual(str(from_postfix("00*1+*.")), "0(0*+1)*")
+
+    def test_simplify(self):
+        def simplified(postfix_regex):
+            return str(simplify(from_postfix(postfix_regex)))
+
+        self.assertEqual(simplified("0*1+0*+"), "0*+1")
+        self.assertEqual(simplified("0**"), "0*")
+        self.assertEqual(simplified("0*0*."), "0*")
+        self.assertEqual(simplified("00+"), "0")
+        self.assertEqual(simplified("00*1+*."), "0(0+1)*")
+        self.assertEqual(simplified("01.02.+"), "0(1+2)")
+        self.assertEqual(simplified("01.0+"), "0(1+ε)")
+        self.assertEqual(simplified("01.2.01.3.+4+"), "01(2+3)+4")
+
+    def test_reverse(self):
+        def reversed_regex(postfix_regex):
+            return str(reverse(simplify(from_postfix(postfix_regex))))
+
+        self.assertEqual(reversed_regex("001+*.1."), "1(0+1)*0")
+        self.assertEqual(reversed_regex("01.2.*3+"), "(210)*+3")
+        self.assertEqual(reverse(EPSILON), EPSILON)
+
+    def test_count_nodes(self):
+        self.assertEqual(count_nodes(from_postfix("001+*.1.")), 8)
+        self.assertEqual(count_nodes(simplify(from_postfix("001+*.1."))), 7)
+        self.assertEqual(count_nodes(EPSILON), 1)
+
+    def test_to_postfix(self):
+        expression = simplify(from_postfix("001+*.1."))
+
+        self.assertEqual(simplify(from_postfix(to_postfix(expression))), expression)
+        self.assertEqual(to_postfix(EPSILON), [EPS])
+
+        with self.assertRaises(ValueError):
+            to_postfix(EMPTY)
+
+    def test_long_concatenation(self):
+        expression = simplify(from_postfix("0" + "1." * 5000))
+
+        self.assertEqual(count_nodes(expression), 5002)
+        self.assertEqual(len(to_postfix(expression)), 10001)
+
+    def test_wide_union(self):
+        chars = [chr(0x100 + i) for i in range(3000)]
+        expression = simplify(
+            from_postfix(chars[0] + "".join(c + "+" for c in chars[1:]))
+        )
+
+        self.assertEqual(count_nodes(expression), 3001)
+        self.assertEqual(len(to_postfix(expression)), 5999)
+
+    def test_deep_nesting(self):
+        self.assertEqual(str(simplify(from_postfix("0" + "*" * 5000))), "0*")
+        self.assertEqual(str(reverse(from_postfix("0" + "1+" * 5000))), "0+1")
+
+        # (((0+1)0+1)0 ... +1)0, nested 1000 deep
+        expression = simplify(from_postfix("0" + "1+0." * 1000))
+        self.assertEqual(count_nodes(expression), 4001)
+        self.assertEqual(hash(expression), hash(from_postfix(to_postfix(expression))))
+        self.assertEqual(len(expression.sort_key[0]), KEY_LENGTH)
+        self.assertEqual(str(expression), "(" * 1000 + "0" + "+1)0" * 1000)
+
+    def test_factor_long_prefixes(self):
+        prefix = "0." * 2000
+        expression = simplify(from_postfix("0" + prefix + "1." + "0" + prefix + "2.+"))
+
+        self.assertEqual(str(expression), "0" * 2001 + "(1+2)")
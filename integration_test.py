@@ -1,9 +1,15 @@
+import itertools
 import unittest
 
+import main
+
+from dense_dfa import DenseDfa
+from derivative import DerivativeMatcher
 from dfa import Dfa
 from nfa import Nfa
 from enfa import ENfa, EPS
-from regex import Regex
+from lazy_dfa import LazyDfa
+from regex import Regex, GLUSHKOV, THOMPSON
 
 
 def compile_and_test_dfa(dfa, input_string):
@@ -32,6 +38,12 @@ def compile_and_test_regex(regex, input_string):
     return dfa.is_string_accepted(input_string)
 
 
+def all_binary_strings(max_length):
+    for length in range(max_length + 1):
+        for symbols in itertools.product("01", repeat=length):
+            yield "".join(symbols)
+
+
 class MainTest(unittest.TestCase):
     def test_main_dfa_1(self):
         transition_function = {
@@ -109,3 +121,178 @@ class MainTest(unittest.TestCase):
         self.assertFalse(compile_and_test_regex(regex, ""))
         self.assertFalse(compile_and_test_regex(regex, "1"))
         self.assertFalse(compile_and_test_regex(regex, "1011011"))
+
+    def test_main_regex_accepts_empty_string(self):
+        regex = "0*"
+        self.assertTrue(compile_and_test_regex(regex, ""))
+        self.assertTrue(compile_and_test_regex(regex, "000"))
+
+        self.assertFalse(compile_and_test_regex(regex, "1"))
+
+    def test_main_regex_long(self):
+        regex = "(0+1)*" + "01" * 400
+        self.assertTrue(compile_and_test_regex(regex, "1" + "01" * 400))
+
+        self.assertFalse(compile_and_test_regex(regex, "01" * 399))
+
+    def test_main_constructions_accept_the_same_language(self):
+        for regex in ["0(0+1)*1", "(0*1)*(1+0)*", "0*1*0", "(01+1)*0", ""]:
+            thompson_dfa = Regex(regex).create_nfa_from_regex(THOMPSON).convert_to_dfa()
+            glushkov_dfa = Regex(regex).create_nfa_from_regex(GLUSHKOV).convert_to_dfa()
+
+            for input_string in all_binary_strings(6):
+                self.assertEqual(
+                    thompson_dfa.is_string_accepted(input_string),
+                    glushkov_dfa.is_string_accepted(input_string),
+                    (regex, input_string),
+                )
+
+    def test_main_simplification_keeps_the_language(self):
+        for regex in ["0(1+1)0*0*", "(01+02)*", "((0))((1))", "(0+01+011)(1+10)"]:
+            simplified_dfa = Regex(regex).create_nfa_from_regex().convert_to_dfa()
+            raw_dfa = (
+                Regex(regex, simplify=False).create_nfa_from_regex().convert_to_dfa()
+            )
+
+            for input_string in all_binary_strings(6):
+                self.assertEqual(
+                    simplified_dfa.is_string_accepted(input_string),
+                    raw_dfa.is_string_accepted(input_string),
+                    (regex, input_string),
+                )
+
+    def test_main_enfa_simulation_accepts_the_same_language(self):
+        for regex in ["0(0+1)*1", "(0*1)*(1+0)*", "0*1*0", "(01+1)*0", ""]:
+            dfa = Regex(regex).create_nfa_from_regex().convert_to_dfa()
+            enfa = Regex(regex).create_enfa_from_regex()
+
+            for input_string in all_binary_strings(6):
+                self.assertEqual(
+                    dfa.is_string_accepted(input_string),
+                    enfa.is_string_accepted(input_string),
+                    (regex, input_string),
+                )
+
+    def test_main_lazy_dfa_accepts_the_same_language(self):
+        for regex in ["0(0+1)*1", "(0*1)*(1+0)*", "(0+1)*1(0+1)(0+1)", "(01+1)*0", ""]:
+            dfa = Regex(regex).create_nfa_from_regex().convert_to_dfa()
+            lazy_dfa = LazyDfa.from_regex(regex, max_states=4)
+
+            for input_string in all_binary_strings(6):
+                self.assertEqual(
+                    dfa.is_string_accepted(input_string),
+                    lazy_dfa.is_string_accepted(input_string),
+                    (regex, input_string),
+                )
+
+    def test_main_nfa_bitset_simulation_accepts_the_same_language(self):
+        for regex in ["0(0+1)*1", "(0*1)*(1+0)*", "0*1*0", "(01+1)*0", ""]:
+            for construction in (THOMPSON, GLUSHKOV):
+                nfa = Regex(regex).create_nfa_from_regex(construction)
+                dfa = nfa.convert_to_dfa()
+
+                for input_string in all_binary_strings(6):
+                    self.assertEqual(
+                        dfa.is_string_accepted(input_string),
+                        nfa.is_string_accepted(input_string),
+                        (regex, construction, input_string),
+                    )
+
+    def test_main_minimized_dfa_accepts_the_same_language(self):
+        for regex in ["0(0+1)*1", "(0*1)*(1+0)*", "0*1*0", "(01+1)*0", "", "[0-1]1+0"]:
+            for construction in (THOMPSON, GLUSHKOV):
+                dfa = Regex(regex).create_nfa_from_regex(construction).convert_to_dfa()
+                minimal_dfa = dfa.minimize()
+
+                self.assertLessEqual(len(minimal_dfa.states()), len(dfa.states()))
+                for input_string in all_binary_strings(6):
+                    self.assertEqual(
+                        dfa.is_string_accepted(input_string),
+                        minimal_dfa.is_string_accepted(input_string),
+                        (regex, construction, input_string),
+                    )
+
+    def test_main_minimized_dfas_of_equivalent_regexes_have_the_same_size(self):
+        sizes = {
+            len(
+                Regex(regex)
+                .create_nfa_from_regex()
+                .convert_to_dfa()
+                .minimize()
+                .states()
+            )
+            for regex in ["(0+1)*", "(0*1*)*", "(1+0)*(0+1)*", "0*(10*)*"]
+        }
+
+        self.assertEqual(sizes, {1})
+
+    def test_main_derivatives_accept_the_same_language(self):
+        for regex in ["0(0+1)*1", "(0*1)*(1+0)*", "0*1*0", "(01+1)*0", ""]:
+            dfa = Regex(regex).create_nfa_from_regex().convert_to_dfa()
+            matcher = DerivativeMatcher.from_regex(regex)
+
+            for input_string in all_binary_strings(6):
+                self.assertEqual(
+                    dfa.is_string_accepted(input_string),
+                    matcher.is_string_accepted(input_string),
+                    (regex, input_string),
+                )
+
+    def test_main_regex_char_classes(self):
+        regex = "[a-z_][a-z0-9_]*(\\.[a-z_][a-z0-9_]*)*"
+        self.assertTrue(compile_and_test_regex(regex, "os.path.join"))
+        self.assertTrue(compile_and_test_regex(regex, "_private9"))
+
+        self.assertFalse(compile_and_test_regex(regex, ""))
+        self.assertFalse(compile_and_test_regex(regex, "9lives"))
+        self.assertFalse(compile_and_test_regex(regex, "os..path"))
+        self.assertFalse(compile_and_test_regex(regex, "Os"))
+
+    def test_main_regex_any_and_negated_class(self):
+        regex = "ü.*[^0-9]"
+        self.assertTrue(compile_and_test_regex(regex, "über"))
+        self.assertTrue(compile_and_test_regex(regex, "ü€"))
+
+        self.assertFalse(compile_and_test_regex(regex, "ü"))
+        self.assertFalse(compile_and_test_regex(regex, "über9"))
+
+    def test_main_engines_agree_on_char_classes(self):
+        regex = "[a-c]*(b+[^a])c."
+        inputs = ["".join(p) for p in itertools.product("abcd", repeat=4)]
+
+        thompson_dfa = Regex(regex).create_nfa_from_regex(THOMPSON).convert_to_dfa()
+        glushkov_dfa = Regex(regex).create_nfa_from_regex(GLUSHKOV).convert_to_dfa()
+        matcher = DerivativeMatcher.from_regex(regex)
+        dense_dfa = DenseDfa(thompson_dfa)
+
+        for input_string in inputs:
+            expected = thompson_dfa.is_string_accepted(input_string)
+
+            self.assertEqual(glushkov_dfa.is_string_accepted(input_string), expected)
+            self.assertEqual(matcher.is_string_accepted(input_string), expected)
+            self.assertEqual(dense_dfa.is_string_accepted(input_string), expected)
+
+        self.assertEqual(
+            dense_dfa.match_many(inputs).tolist(),
+            [thompson_dfa.is_string_accepted(s) for s in inputs],
+        )
+
+    def test_main_regex_nested_stars(self):
+        regex = "((0*1*)*(1+0)*)*1"
+        self.assertTrue(compile_and_test_regex(regex, "1"))
+        self.assertTrue(compile_and_test_regex(regex, "0101"))
+
+        self.assertFalse(compile_and_test_regex(regex, ""))
+        self.assertFalse(compile_and_test_regex(regex, "10"))
+
+        raw_enfa = Regex("(((0*)*)*1*)*0", simplify=False).create_enfa_from_regex()
+        self.assertTrue(compile_and_test_enfa(raw_enfa, "00110"))
+        self.assertFalse(compile_and_test_enfa(raw_enfa, "001101"))
+
+    def test_main_regex_deep_nesting(self):
+        # (((0+1)0+1)0 ... +1)0, nested 1000 deep
+        pattern = main.compile("(" * 1000 + "0" + "+1)0" * 1000)
+
+        self.assertTrue(pattern.match("0" * 1001))
+        self.assertTrue(pattern.match("1" + "0" * 1000))
+        self.assertFalse(pattern.match("0" * 1000))
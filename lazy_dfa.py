@@ -0,0 +1,119 @@
+from regex import Regex, GLUSHKOV
+
+""" Lazy Deterministic Finite Automaton.
+
+The dfa states are created from the nfa only when an input first drives the
+automaton into them, and the transitions between them are cached. Matching is
+as fast as a dfa on the already seen states, without building the whole dfa up
+front, which can have exponentially many states.
+
+The cache is bounded: when it holds max_states states it is flushed and
+built again from the current state, like in RE2.
+"""
+
+DEFAULT_MAX_STATES = 10000
+
+
+class LazyDfa:
+    def __init__(self, nfa, max_states=DEFAULT_MAX_STATES):
+        # After a flush the cache holds the starting, the dead, the current and
+        # the next state.
+        if max_states < 4:
+            raise ValueError("The cache has to hold at least 4 states")
+
+        self.nfa = nfa
+        self.max_states = max_states
+
+        # Number of times the cache was full and had to be cleared
+        self.cache_flushes = 0
+
+        self._flush()
+
+    @classmethod
+    def from_regex(cls, regex, max_states=DEFAULT_MAX_STATES):
+        return cls(Regex(regex).create_nfa_from_regex(GLUSHKOV), max_states)
+
+    def _flush(self):
+        # Set of nfa states -> dfa state id
+        self._state_ids = {}
+        # dfa state id -> set of nfa states
+        self._states = []
+        # dfa state id -> True if accepting, see _accepts
+        self._accepting = []
+
+        # Cached transitions.
+        # dfa state id -> input symbol -> next dfa state id
+        self._transitions = []
+
+        self.starting_state = self._get_state_id(frozenset([self.nfa.starting_state]))
+        self.dead_state = self._get_state_id(frozenset())
+
+    def __len__(self):
+        return len(self._states)
+
+    def _get_state_id(self, states):
+        state_id = self._state_ids.get(states)
+
+        if state_id is None:
+            state_id = len(self._states)
+            self._state_ids[states] = state_id
+            self._states.append(states)
+            self._accepting.append(self._accepts(states))
+            self._transitions.append({})
+
+        return state_id
+
+    def _accepts(self, states):
+        return not states.isdisjoint(self.nfa.final_states)
+
+    def _next_state(self, state, input_symbol):
+        edges = self.nfa.graph.edges
+
+        next_states = set()
+        for nfa_state in self._states[state]:
+            next_states.update(edges.get(nfa_state, {}).get(input_symbol, ()))
+        next_states = frozenset(next_states)
+
+        if next_states not in self._state_ids and len(self._states) >= self.max_states:
+            self.cache_flushes += 1
+            states = self._states[state]
+            self._flush()
+            state = self._get_state_id(states)
+
+        next_state = self._get_state_id(next_states)
+        self._transitions[state][input_symbol] = next_state
+
+        return next_state
+
+    def is_string_accepted(self, input_string):
+        """Check if the string is accepted, building the dfa states on the way.
+
+        Args:
+            input_string: the input to check.
+
+        Returns:
+            True if the automaton accepts the string, False otherwise.
+        """
+        state = self._run(input_string)
+
+        return state is not None and self._accepting[state]
+
+    def _run(self, input_string):
+        # Returns the dfa state after the input, None if it died on the way
+        if self.nfa.alphabet is not None:
+            input_string = map(self.nfa.alphabet.classify, input_string)
+
+        current_state = self.starting_state
+        for input_symbol in input_string:
+            next_state = self._transitions[current_state].get(input_symbol)
+
+            if next_state is None:
+                next_state = self._next_state(current_state, input_symbol)
+
+            if next_state == self.dead_state:
+                # No nfa state can continue
+                return None
+
+            current_state = next_state
+
+        return current_state
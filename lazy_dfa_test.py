@@ -0,0 +1,48 @@
+import unittest
+
+from lazy_dfa import LazyDfa
+from nfa import Nfa
+
+
+class LazyDfaTest(unittest.TestCase):
+    def test_lazy_dfa(self):
+        transition_function = {
+            ("A", "0"): {"A", "B"},
+            ("A", "1"): {"A"},
+            ("B", "1"): {"C"},
+        }
+
+        lazy_dfa = LazyDfa(Nfa(transition_function, "A", {"C"}))
+
+        self.assertTrue(lazy_dfa.is_string_accepted("011001"))
+        self.assertTrue(lazy_dfa.is_string_accepted("0000011001"))
+
+        self.assertFalse(lazy_dfa.is_string_accepted(""))
+        self.assertFalse(lazy_dfa.is_string_accepted("1"))
+        self.assertFalse(lazy_dfa.is_string_accepted("1011011"))
+
+    def test_lazy_dfa_builds_states_on_demand(self):
+        lazy_dfa = LazyDfa.from_regex("(0+1)*1(0+1)(0+1)(0+1)(0+1)(0+1)(0+1)")
+
+        # Starting and dead state
+        self.assertEqual(len(lazy_dfa), 2)
+
+        self.assertTrue(lazy_dfa.is_string_accepted("0001000000"))
+
+        # The full dfa would have 2^7 states
+        self.assertLessEqual(len(lazy_dfa), 12)
+
+    def test_lazy_dfa_flushes_the_cache(self):
+        lazy_dfa = LazyDfa.from_regex("(0+1)*1(0+1)(0+1)(0+1)(0+1)", max_states=6)
+
+        for input_string in ["10000", "0110101", "11111", "1000000", "010011"]:
+            expected = input_string[-5] == "1"
+
+            self.assertEqual(lazy_dfa.is_string_accepted(input_string), expected)
+            self.assertLessEqual(len(lazy_dfa), 6)
+
+        self.assertGreater(lazy_dfa.cache_flushes, 0)
+
+    def test_lazy_dfa_max_states(self):
+        with self.assertRaises(ValueError):
+            LazyDfa.from_regex("0", max_states=3)
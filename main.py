@@ -1,13 +1,92 @@
-from regex import Regex
+import random
+
+import equivalence
+import sampling
+from pattern import DFA, PatternCache
+from regex import Regex, THOMPSON
+
+_cache = PatternCache()
+
+
+def compile(regex, construction=THOMPSON, engine=DFA, minimize=True):
+    """Compiles a regex into a reusable pattern.
+
+    Compiled patterns are kept in a bounded least recently used cache.
+
+    Args:
+        regex: the regular expression as a string
+        construction: THOMPSON or GLUSHKOV, how the nfa of the regex is built
+        engine: DFA to build the whole dfa, DENSE_DFA to also store it in a flat
+            table, LAZY_DFA to build it while matching
+        minimize: merge the equivalent states of the dfa of the DFA and
+            DENSE_DFA engines
+
+    Returns:
+        The compiled pattern.
+    """
+    return _cache.get(regex, construction, engine, minimize)
 
 
 def match(regex, input_string):
-    regex = Regex(regex)
-    enfa = regex.create_enfa_from_regex()
-    nfa = enfa.convert_to_nfa()
-    dfa = nfa.convert_to_dfa()
+    return compile(regex).match(input_string)
+
+
+def search(regex, input_string):
+    """Returns the (start, end) of the leftmost-longest match, None if there is none."""
+    return compile(regex).search(input_string)
+
+
+def finditer(regex, input_string):
+    return compile(regex).finditer(input_string)
+
+
+def fullmatch(regex, input_string):
+    return compile(regex).fullmatch(input_string)
+
+
+def match_file(regex, path, processes=1):
+    """Check if the whole content of a file matches the regex, see scan.py."""
+    return compile(regex).match_file(path, processes)
+
+
+def search_file(regex, path):
+    """Finds the leftmost-longest match in the content of a file, see search.py."""
+    return compile(regex).search_file(path)
+
+
+def finditer_file(regex, path):
+    return compile(regex).finditer_file(path)
+
+
+def equivalent(regex1, regex2):
+    """True if the regexes accept the same language, see equivalence.py."""
+    return equivalence.equivalent(compile(regex1).dfa, compile(regex2).dfa)
+
+
+def count_accepted(regex, length):
+    """Returns the number of strings of the length that match the regex."""
+    return compile(regex).dfa.count_accepted(length)
+
+
+def sample(regex, length, rng=random):
+    """Draws a string of the length that matches the regex uniformly at random,
+    see sampling.py. Returns None if no string of the length matches."""
+    return sampling.Sampler(compile(regex).dfa, length).sample(rng)
+
+
+def purge():
+    """Clears the pattern cache and its statistics."""
+    _cache.purge()
+
+
+def cache_info():
+    """Returns the hits, misses, evictions, maximum size and size of the cache."""
+    return _cache.info()
+
 
-    return dfa.is_string_accepted(input_string)
+def set_cache_size(maxsize):
+    """Sets the maximum number of cached patterns, 0 disables caching."""
+    _cache.resize(maxsize)
 
 
 if __name__ == "__main__":
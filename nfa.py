@@ -2,23 +2,44 @@ from dfa import Dfa
 
 from plotter import plot_automaton
 from printer import print_automaton
+from transition_graph import TransitionGraph
 
 """ Non-deterministic Finite Automaton.
 
 A simple implementation of an nfa.
 """
 
+# The bitset simulation looks up the next states of this many states at once
+CHUNK_BITS = 8
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
 
 class Nfa:
-    def __init__(self, transition_function, starting_state, final_states):
-        # (state, input symbol) -> next states
-        self.transition_function = transition_function
+    def __init__(
+        self, transition_function, starting_state, final_states, alphabet=None
+    ):
+        # state -> input symbol -> next states
+        self.graph = TransitionGraph.from_graph(transition_function)
 
         self.starting_state = starting_state
 
         # A finite set of accepting states.
         self.final_states = final_states
 
+        # Maps input characters to the input symbols, see alphabet.py.
+        # Without an alphabet every character is its own symbol.
+        self.alphabet = alphabet
+
+        # Precomputed tables of the bitset simulation, built on first use and
+        # again after the graph or the starting state changes
+        self._bitset_tables = None
+        self._bitset_tables_key = None
+
+    @property
+    def transition_function(self):
+        """The transitions as a (state, input symbol) -> next states dict."""
+        return self.graph.to_dict()
+
     def plot(self):
         plot_automaton(self.transition_function, self.starting_state, self.final_states)
 
@@ -27,107 +48,148 @@ class Nfa:
             self.transition_function, self.starting_state, self.final_states
         )
 
-    def _get_dfa_accepting_states(self, dfa_transition_function):
-        dfa_accepting_states = set()
-
-        reachable_states = [
-            next_states for _, next_states in dfa_transition_function.items()
-        ]
-
-        # Creating the dfa's accepting states
-        for state in reachable_states:
-            if state.intersection(self.final_states):
-                dfa_accepting_states.add(",".join(sorted(state)))
-
-        return dfa_accepting_states
-
-    def _delete_unreachable_transitions(self, dfa_transition_function, starting_state):
-        # Collect all nodes that are an end of a non-self transition
-        reachable_nodes = [
-            end_state
-            for transition, end_state in dfa_transition_function.items()
-            if transition[0] != end_state
-        ]
-
-        result = {}
-
-        for transition in dfa_transition_function:
-            if transition[0] == {starting_state} or transition[0] in reachable_nodes:
-                result[transition] = dfa_transition_function[transition]
-
-        return result
-
-    def _construct_dfa_transition_function(self, dfa_transition_function):
-        input_symbols = ["0", "1"]
-
-        # Get all states with an incoming edge
-        reachable_states = [
-            end_states for _, end_states in self.transition_function.items()
-        ]
-
-        for end_states in reachable_states:
-            for input_symbol in input_symbols:
-
-                combined_next_states = set()
+    def _create_bitset_tables(self):
+        # Every state is a bit of an int, the states are numbered in any order
+        states = self.graph.states() | {self.starting_state}
+        bits = {state: 1 << index for index, state in enumerate(states)}
+
+        chunks = (len(states) + CHUNK_BITS - 1) // CHUNK_BITS
+
+        # input symbol -> chunk -> value of the chunk's bits -> next states mask
+        tables = {}
+        for state, transitions in self.graph.edges.items():
+            index = bits[state].bit_length() - 1
+            for input_symbol, next_states in transitions.items():
+                if input_symbol not in tables:
+                    tables[input_symbol] = [
+                        [0] * (1 << CHUNK_BITS) for _ in range(chunks)
+                    ]
+
+                # Fill the next states of the single state first
+                mask = 0
+                for next_state in next_states:
+                    mask |= bits[next_state]
+                tables[input_symbol][index // CHUNK_BITS][
+                    1 << index % CHUNK_BITS
+                ] = mask
+
+        # The next states of a combination of states is the union of the next
+        # states of its lowest state and of the rest.
+        for chunk_tables in tables.values():
+            for table in chunk_tables:
+                for value in range(1, 1 << CHUNK_BITS):
+                    lowest = value & -value
+                    if value != lowest:
+                        table[value] = table[lowest] | table[value ^ lowest]
+
+        return bits, tables
+
+    def is_string_accepted(self, input_string):
+        """Check if the string is accepted by simulating the nfa with bitsets.
+
+        The set of active states is an int, with a bit for every state. The next
+        states of every symbol are precomputed for each combination of
+        CHUNK_BITS states, so a step is a lookup and an OR per active chunk of
+        states instead of building Python sets.
+
+        Args:
+            input_string: the input to check.
 
-                # Iterate over all states of the nfa
-                # Collect all nfa reachable states from that state
-                # This nfa state can include multiple dfa states
-                for state in end_states:
-                    if (state, input_symbol) in self.transition_function:
-                        nfa_next_states = self.transition_function[
-                            (state, input_symbol)
-                        ]
-                        combined_next_states.update(nfa_next_states)
-
-                if combined_next_states:
-                    dfa_transition_function[
-                        (frozenset(end_states), input_symbol)
-                    ] = combined_next_states
-
-                    if (
-                        combined_next_states != end_states
-                        and combined_next_states not in reachable_states
-                    ):
-                        reachable_states.append(combined_next_states)
-
-    def _format_dfa_transition_function(self, dfa_transition_function):
-        formatted_dfa_transition_function = {}
-
-        for key, next_states in dfa_transition_function.items():
-            dfa_state, input_symbol = key
-            formatted_dfa_transition_function[
-                ",".join(sorted(dfa_state)), input_symbol
-            ] = ",".join(sorted(next_states))
-
-        return formatted_dfa_transition_function
+        Returns:
+            True if the automaton accepts the string, False otherwise.
+        """
+        key = (self.graph.version, self.starting_state)
+        if self._bitset_tables_key != key:
+            self._bitset_tables = self._create_bitset_tables()
+            self._bitset_tables_key = key
+        bits, tables = self._bitset_tables
+
+        # The final states are read on every call, they can change too
+        final_mask = 0
+        for state in self.final_states:
+            final_mask |= bits.get(state, 0)
+
+        if self.alphabet is not None:
+            input_string = map(self.alphabet.classify, input_string)
+
+        mask = bits[self.starting_state]
+        for input_symbol in input_string:
+            chunk_tables = tables.get(input_symbol)
+            if chunk_tables is None:
+                return False
+
+            next_mask = 0
+            for table in chunk_tables:
+                next_mask |= table[mask & CHUNK_MASK]
+                mask >>= CHUNK_BITS
+                if not mask:
+                    break
+
+            if not next_mask:
+                # No state can continue, the automaton does not terminate
+                return False
+
+            mask = next_mask
+
+        return bool(mask & final_mask)
+
+    def _get_dfa_state_labels(self, state_ids):
+        return {
+            state_id: ",".join(str(s) for s in sorted(state))
+            for state, state_id in state_ids.items()
+        }
 
     def convert_to_dfa(self):
-        """Converts the nfa to a dfa.
+        """Converts the nfa to a dfa with the subset construction.
+
+        Every set of nfa states reachable from the starting state becomes a dfa
+        state with a dense integer id. The sets are interned in a dict, so every
+        new set is found in constant time, and processed with a worklist.
 
         Returns:
             The dfa converted from the nfa.
         """
-        # Initialize the dfa transition function
-        dfa_transition_function = {
-            (frozenset([key[0]]), key[1]): next_states
-            for key, next_states in self.transition_function.items()
-        }
+        edges = self.graph.edges
+        dfa_graph = TransitionGraph(deterministic=True)
 
-        self._construct_dfa_transition_function(dfa_transition_function)
+        # Set of nfa states -> dfa state id, the starting state gets the id 0
+        starting_states = frozenset([self.starting_state])
+        state_ids = {starting_states: 0}
 
-        dfa_transition_function = self._delete_unreachable_transitions(
-            dfa_transition_function, self.starting_state
-        )
+        worklist = [starting_states]
+        while worklist:
+            states = worklist.pop()
+            state_id = state_ids[states]
 
-        formatted_dfa_transition_function = self._format_dfa_transition_function(
-            dfa_transition_function
-        )
+            # input symbol -> all nfa states reachable on it from the set
+            next_states_by_symbol = {}
+            for state in states:
+                for input_symbol, next_states in edges.get(state, {}).items():
+                    next_states_by_symbol.setdefault(input_symbol, set()).update(
+                        next_states
+                    )
+
+            for input_symbol, next_states in next_states_by_symbol.items():
+                next_states = frozenset(next_states)
+
+                next_state_id = state_ids.get(next_states)
+                if next_state_id is None:
+                    next_state_id = len(state_ids)
+                    state_ids[next_states] = next_state_id
+                    worklist.append(next_states)
+
+                dfa_graph.add(state_id, input_symbol, next_state_id)
 
         dfa = Dfa(
-            transition_function=formatted_dfa_transition_function,
-            starting_state=self.starting_state,
-            final_states=self._get_dfa_accepting_states(dfa_transition_function),
+            transition_function=dfa_graph,
+            starting_state=0,
+            final_states={
+                state_id
+                for states, state_id in state_ids.items()
+                if not states.isdisjoint(self.final_states)
+            },
+            state_labels=self._get_dfa_state_labels(state_ids),
+            alphabet=self.alphabet,
         )
 
         return dfa
@@ -3,6 +3,13 @@ import unittest
 from nfa import Nfa
 
 
+def labeled_transition_function(dfa):
+    return {
+        (dfa.label(state), input_symbol): dfa.label(next_state)
+        for (state, input_symbol), next_state in dfa.transition_function.items()
+    }
+
+
 class NfaTest(unittest.TestCase):
     def test_convert_to_dfa_1(self):
         transition_function = {
@@ -25,7 +32,9 @@ class NfaTest(unittest.TestCase):
             ("A,C", "0"): "A,B",
         }
 
-        self.assertDictEqual(dfa.transition_function, expected_dfa_tranisition_function)
+        self.assertDictEqual(
+            labeled_transition_function(dfa), expected_dfa_tranisition_function
+        )
 
     def test_convert_to_dfa_2(self):
         transition_function = {
@@ -51,26 +60,32 @@ class NfaTest(unittest.TestCase):
             ("B,C", "1"): "B,C",
         }
 
-        self.assertDictEqual(dfa.transition_function, expected_dfa_tranisition_function)
+        self.assertDictEqual(
+            labeled_transition_function(dfa), expected_dfa_tranisition_function
+        )
 
-    # TODO: Make this work. Bug when nfa-dfa and starting state changes.
-    # def test_convert_to_dfa_3(self):
-    #    transition_function = {
-    #        ("A", "0"): {"A", "B"},
-    #        ("A", "1"): {"A", "B"},
-    #    }
-    #    starting_state = "A"
-    #    final_states = {"B"}
+    def test_convert_to_dfa_3(self):
+        transition_function = {
+            ("A", "0"): {"A", "B"},
+            ("A", "1"): {"A", "B"},
+        }
+        starting_state = "A"
+        final_states = {"B"}
 
-    #    nfa = Nfa(transition_function, starting_state, final_states)
-    #    dfa = nfa.convert_to_dfa()
+        nfa = Nfa(transition_function, starting_state, final_states)
+        dfa = nfa.convert_to_dfa()
 
-    #    expected_dfa_tranisition_function = {
-    #        ('A,B', '0'): 'A,B',
-    #        ('A,B', '1'): 'A,B',
-    #    }
+        expected_dfa_tranisition_function = {
+            ("A", "0"): "A,B",
+            ("A", "1"): "A,B",
+            ("A,B", "0"): "A,B",
+            ("A,B", "1"): "A,B",
+        }
 
-    #    self.assertDictEqual(dfa.transition_function, expected_dfa_tranisition_function)
+        self.assertDictEqual(
+            labeled_transition_function(dfa), expected_dfa_tranisition_function
+        )
+        self.assertEqual({dfa.label(s) for s in dfa.final_states}, {"A,B"})
 
     def test_convert_to_dfa_4(self):
         transition_function = {
@@ -93,7 +108,9 @@ class NfaTest(unittest.TestCase):
             ("A,B,C", "1"): "A,B,C",
         }
 
-        self.assertDictEqual(dfa.transition_function, expected_dfa_tranisition_function)
+        self.assertDictEqual(
+            labeled_transition_function(dfa), expected_dfa_tranisition_function
+        )
 
     def test_convert_to_dfa_5(self):
         transition_function = {
@@ -109,5 +126,81 @@ class NfaTest(unittest.TestCase):
             ("A", "0"): "B",
         }
 
-        self.assertDictEqual(dfa.transition_function, expected_dfa_tranisition_function)
-        self.assertEqual(dfa.final_states, {"B"})
+        self.assertDictEqual(
+            labeled_transition_function(dfa), expected_dfa_tranisition_function
+        )
+        self.assertEqual({dfa.label(s) for s in dfa.final_states}, {"B"})
+
+    def test_convert_to_dfa_only_reachable_states(self):
+        transition_function = {
+            ("A", "0"): {"B"},
+            ("C", "0"): {"C", "D"},
+            ("D", "1"): {"B"},
+        }
+        starting_state = "A"
+        final_states = {"B"}
+
+        nfa = Nfa(transition_function, starting_state, final_states)
+        dfa = nfa.convert_to_dfa()
+
+        self.assertEqual(dfa.starting_state, 0)
+        self.assertDictEqual(labeled_transition_function(dfa), {("A", "0"): "B"})
+
+    def test_convert_to_dfa_large(self):
+        # (0+1)*1(0+1)^n needs 2^(n+1) dfa states
+        n = 10
+        transition_function = {(0, "0"): {0}, (0, "1"): {0, 1}}
+        for i in range(1, n + 1):
+            transition_function[(i, "0")] = {i + 1}
+            transition_function[(i, "1")] = {i + 1}
+
+        nfa = Nfa(transition_function, 0, {n + 1})
+        dfa = nfa.convert_to_dfa()
+
+        self.assertEqual(len(dfa.state_labels), 2 ** (n + 1))
+        self.assertTrue(dfa.is_string_accepted("1" + "0" * n))
+        self.assertFalse(dfa.is_string_accepted("1" + "0" * (n + 1)))
+
+    def test_is_string_accepted(self):
+        transition_function = {
+            ("A", "0"): {"A", "B"},
+            ("A", "1"): {"A"},
+            ("B", "1"): {"C"},
+        }
+
+        nfa = Nfa(transition_function, "A", {"C"})
+
+        self.assertTrue(nfa.is_string_accepted("011001"))
+        self.assertTrue(nfa.is_string_accepted("0000011001"))
+
+        self.assertFalse(nfa.is_string_accepted(""))
+        self.assertFalse(nfa.is_string_accepted("1"))
+        self.assertFalse(nfa.is_string_accepted("2"))
+        self.assertFalse(nfa.is_string_accepted("1011011"))
+
+    def test_is_string_accepted_many_states(self):
+        # More states than fit into a single chunk of the bitset
+        n = 40
+        transition_function = {(0, "0"): {0}, (0, "1"): {0, 1}}
+        for i in range(1, n + 1):
+            transition_function[(i, "0")] = {i + 1}
+            transition_function[(i, "1")] = {i + 1}
+
+        nfa = Nfa(transition_function, 0, {n + 1})
+
+        self.assertTrue(nfa.is_string_accepted("01" + "0" * n))
+        self.assertTrue(nfa.is_string_accepted("1" * (n + 1)))
+        self.assertFalse(nfa.is_string_accepted("1" + "0" * (n + 1)))
+        self.assertFalse(nfa.is_string_accepted("1" * n))
+
+    def test_is_string_accepted_after_changes(self):
+        nfa = Nfa({("A", "0"): {"B"}}, "A", {"B"})
+        self.assertFalse(nfa.is_string_accepted("01"))
+
+        nfa.graph.add("B", "1", "C")
+        nfa.final_states.add("C")
+        self.assertTrue(nfa.is_string_accepted("01"))
+
+        nfa.starting_state = "B"
+        self.assertTrue(nfa.is_string_accepted("1"))
+        self.assertFalse(nfa.is_string_accepted("01"))
@@ -0,0 +1,241 @@
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from dense_dfa import DenseDfa
+from lazy_dfa import LazyDfa
+from regex import Regex, THOMPSON
+from scan import FileScanner
+from search import Searcher
+from stream import StreamMatcher
+
+""" Compiled regular expressions.
+
+A pattern holds the dfa of a regex, so it can be matched many times without
+running the conversions again. The dfa is minimized by default, see
+Dfa.minimize. With the LAZY_DFA engine the dfa states are only
+built while matching, see lazy_dfa.py. With the DENSE_DFA engine the dfa is
+matched through a flat transition table, see dense_dfa.py.
+"""
+
+DEFAULT_CACHE_SIZE = 512
+
+DFA = "dfa"
+LAZY_DFA = "lazy_dfa"
+DENSE_DFA = "dense_dfa"
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "size"])
+
+
+class Pattern:
+    def __init__(self, regex, construction=THOMPSON, engine=DFA, minimize=True):
+        self.regex = regex
+        self.construction = construction
+        self.engine = engine
+        self.minimize = minimize
+
+        nfa = Regex(regex).create_nfa_from_regex(construction)
+
+        if engine in (DFA, DENSE_DFA):
+            self.dfa = nfa.convert_to_dfa()
+            if minimize:
+                self.dfa = self.dfa.minimize()
+            self._automaton = self.dfa if engine == DFA else DenseDfa(self.dfa)
+        elif engine == LAZY_DFA:
+            self.dfa = None
+            self._automaton = LazyDfa(nfa)
+        else:
+            raise ValueError(f"Unknown engine: {engine}")
+
+        # The dense table of the dfa for streaming and files, the automaton
+        # itself with the DENSE_DFA engine, otherwise created on first use
+        self._dense = self._automaton if engine == DENSE_DFA else None
+        # Created on the first match_file call
+        self._scanner = None
+        # Created on the first search, finditer or fullmatch call
+        self._searcher = None
+
+    def __repr__(self):
+        return f"Pattern({self.regex!r}, {self.construction!r}, {self.engine!r})"
+
+    def match(self, input_string):
+        """Check if the whole input string matches the pattern.
+
+        Args:
+            input_string: the input to check.
+
+        Returns:
+            True if the pattern accepts the string, False otherwise.
+        """
+        return self._automaton.is_string_accepted(input_string)
+
+    def search(self, input_string, pos=0, endpos=None):
+        """Finds the leftmost-longest match of the pattern, see search.py.
+
+        Args:
+            input_string: the input to search in.
+            pos: the offset where the search starts.
+            endpos: the offset where the search ends, the end of the input if None.
+
+        Returns:
+            The (start, end) Match, None if the pattern does not match anywhere.
+        """
+        return self._get_searcher().search(input_string, pos, endpos)
+
+    def finditer(self, input_string, pos=0, endpos=None):
+        """Returns an iterator of the non overlapping matches, see search."""
+        return self._get_searcher().finditer(input_string, pos, endpos)
+
+    def fullmatch(self, input_string, pos=0, endpos=None):
+        """Returns the Match of the whole input, None if it does not match."""
+        return self._get_searcher().fullmatch(input_string, pos, endpos)
+
+    def search_file(self, path):
+        """Finds the leftmost-longest match in the content of a file, the bytes
+        are read as latin-1 characters, see Searcher.search_file."""
+        return self._get_searcher().search_file(path)
+
+    def finditer_file(self, path):
+        """Returns an iterator of the non overlapping matches in a file."""
+        return self._get_searcher().finditer_file(path)
+
+    def _get_searcher(self):
+        if self._searcher is None:
+            self._searcher = Searcher(self.regex, self.construction, self.minimize)
+
+        return self._searcher
+
+    def stream(self, encoding="utf-8"):
+        """Creates a matcher that is fed the input in chunks, see stream.py.
+
+        Args:
+            encoding: the encoding of the chunks given as bytes.
+
+        Returns:
+            A new StreamMatcher in the starting state.
+        """
+        return StreamMatcher(self._dense_dfa("Streaming"), encoding)
+
+    def match_file(self, path, processes=1):
+        """Check if the whole content of a file matches the pattern.
+
+        The file is memory mapped and its bytes are read as latin-1
+        characters, see scan.py.
+
+        Args:
+            path: the path of the file.
+            processes: the number of processes matching the chunks of the file
+                in parallel.
+
+        Returns:
+            True if the pattern accepts the content, False otherwise.
+        """
+        if self._scanner is None:
+            self._scanner = FileScanner(self._dense_dfa("Matching files"))
+
+        return self._scanner.match_file(path, processes)
+
+    def _dense_dfa(self, feature):
+        if self.engine == LAZY_DFA:
+            raise ValueError(f"{feature} needs the DFA or DENSE_DFA engine")
+
+        if self._dense is None:
+            self._dense = DenseDfa(self.dfa)
+
+        return self._dense
+
+    def match_many(self, strings):
+        """Check which strings of a batch match the pattern.
+
+        The batch is matched at once with the dense table of the dfa, see
+        DenseDfa.match_many. With the LAZY_DFA engine, that has no full dfa,
+        string by string.
+
+        Args:
+            strings: a sequence of the inputs to check.
+
+        Returns:
+            A numpy bool array, True where the string matches the pattern.
+        """
+        if self.engine == LAZY_DFA:
+            return np.fromiter(map(self.match, strings), dtype=bool, count=len(strings))
+
+        return self._dense_dfa("Batch matching").match_many(strings)
+
+
+class PatternCache:
+    """A bounded cache of compiled patterns with least recently used eviction."""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        if maxsize < 0:
+            raise ValueError("The cache size can not be negative")
+
+        self.maxsize = maxsize
+
+        # (regex, construction, engine, minimize) -> compiled pattern,
+        # ordered from least to most recently used
+        self._patterns = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def __contains__(self, regex):
+        return any(key[0] == regex for key in self._patterns)
+
+    def get(self, regex, construction=THOMPSON, engine=DFA, minimize=True):
+        """Returns the compiled pattern of the regex, compiling it on a miss.
+
+        Args:
+            regex: the regular expression as a string
+            construction: how the nfa of the regex is built, see Regex
+            engine: DFA, DENSE_DFA or LAZY_DFA
+            minimize: minimize the dfa of the DFA and DENSE_DFA engines
+
+        Returns:
+            The compiled pattern.
+        """
+        key = (regex, construction, engine, minimize)
+        pattern = self._patterns.get(key)
+
+        if pattern is not None:
+            self.hits += 1
+            self._patterns.move_to_end(key)
+            return pattern
+
+        self.misses += 1
+        pattern = Pattern(regex, construction, engine, minimize)
+
+        if self.maxsize > 0:
+            self._patterns[key] = pattern
+            self._evict(self.maxsize)
+
+        return pattern
+
+    def _evict(self, maxsize):
+        while len(self._patterns) > maxsize:
+            self._patterns.popitem(last=False)
+            self.evictions += 1
+
+    def resize(self, maxsize):
+        if maxsize < 0:
+            raise ValueError("The cache size can not be negative")
+
+        self.maxsize = maxsize
+        self._evict(maxsize)
+
+    def purge(self):
+        """Removes every pattern from the cache and resets the statistics."""
+        self._patterns.clear()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def info(self):
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, self.maxsize, len(self._patterns)
+        )
@@ -0,0 +1,117 @@
+import unittest
+
+import main
+from dense_dfa import DenseDfa
+from pattern import DENSE_DFA, DFA, LAZY_DFA, Pattern, PatternCache
+
+
+class PatternTest(unittest.TestCase):
+    def test_pattern_match(self):
+        pattern = Pattern("0(0+1)*1")
+
+        self.assertTrue(pattern.match("011001"))
+        self.assertTrue(pattern.match("01"))
+
+        self.assertFalse(pattern.match(""))
+        self.assertFalse(pattern.match("1011011"))
+
+    def test_pattern_minimizes_the_dfa(self):
+        minimal_dfa = Pattern("(0+1)*(0+1)").dfa
+        dfa = Pattern("(0+1)*(0+1)", minimize=False).dfa
+
+        self.assertEqual(len(minimal_dfa.states()), 2)
+        self.assertGreater(len(dfa.states()), 2)
+
+    def test_pattern_lazy_dfa_engine(self):
+        pattern = Pattern("0(0+1)*1", engine=LAZY_DFA)
+
+        self.assertIsNone(pattern.dfa)
+        self.assertTrue(pattern.match("011001"))
+        self.assertFalse(pattern.match("1011011"))
+
+    def test_pattern_dense_dfa_engine(self):
+        pattern = Pattern("0(0+1)*1", engine=DENSE_DFA)
+
+        self.assertIsNotNone(pattern.dfa)
+        self.assertTrue(pattern.match("011001"))
+        self.assertFalse(pattern.match("1011011"))
+
+    def test_pattern_match_many(self):
+        strings = ["011001", "01", "", "1011011"]
+
+        for engine in (DFA, DENSE_DFA, LAZY_DFA):
+            pattern = Pattern("0(0+1)*1", engine=engine)
+
+            self.assertEqual(
+                pattern.match_many(strings).tolist(), [True, True, False, False]
+            )
+
+        # The DFA engine matches the batch with the dense table too
+        pattern = Pattern("0(0+1)*1", engine=DFA)
+        pattern.match_many(strings)
+        self.assertIsInstance(pattern._dense, DenseDfa)
+
+    def test_pattern_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            Pattern("0", engine="unknown")
+
+    def test_cache_hits_and_misses(self):
+        cache = PatternCache(maxsize=2)
+
+        pattern = cache.get("01")
+        self.assertIs(cache.get("01"), pattern)
+
+        info = cache.info()
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.evictions, 0)
+        self.assertEqual(info.size, 1)
+
+    def test_cache_evicts_least_recently_used(self):
+        cache = PatternCache(maxsize=2)
+
+        cache.get("0")
+        cache.get("1")
+        cache.get("0")
+        cache.get("01")
+
+        self.assertIn("0", cache)
+        self.assertIn("01", cache)
+        self.assertNotIn("1", cache)
+        self.assertEqual(cache.info().evictions, 1)
+
+    def test_cache_resize_and_purge(self):
+        cache = PatternCache(maxsize=3)
+
+        cache.get("0")
+        cache.get("1")
+        cache.get("01")
+        cache.resize(1)
+
+        self.assertEqual(len(cache), 1)
+        self.assertIn("01", cache)
+        self.assertEqual(cache.info().evictions, 2)
+
+        cache.purge()
+
+        self.assertEqual(cache.info(), (0, 0, 0, 1, 0))
+
+    def test_cache_disabled(self):
+        cache = PatternCache(maxsize=0)
+
+        cache.get("0")
+        cache.get("0")
+
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.info().misses, 2)
+
+    def test_main_match_uses_cache(self):
+        main.purge()
+
+        self.assertTrue(main.match("0(0+1)*1", "011001"))
+        self.assertFalse(main.match("0(0+1)*1", "1"))
+        self.assertIs(main.compile("0(0+1)*1"), main.compile("0(0+1)*1"))
+
+        info = main.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 3)
@@ -10,25 +10,25 @@ def plot_automaton(transition_function, starting_state, final_states):
     g.graph_attr["rankdir"] = "LR"
 
     for final_state in final_states:
-        g.node(final_state)
+        g.node(str(final_state))
 
     g.attr("node", shape="circle", style="invisible")
     g.node(START_NODE)
 
     g.attr("node", shape="circle", style="solid")
-    if isinstance(starting_state, str):
-        g.edge(START_NODE, starting_state)
-    elif isinstance(starting_state, set):
+    if isinstance(starting_state, (set, frozenset)):
         for state in starting_state:
-            g.edge(START_NODE, state)
+            g.edge(START_NODE, str(state))
+    else:
+        g.edge(START_NODE, str(starting_state))
 
     for key, next_state in transition_function.items():
         current_state, input_symbol = key
 
-        if isinstance(next_state, str):
-            g.edge(current_state, next_state, label=input_symbol)
-        elif isinstance(next_state, set):
+        if isinstance(next_state, (set, frozenset)):
             for elt in next_state:
-                g.edge(current_state, elt, label=input_symbol)
+                g.edge(str(current_state), str(elt), label=input_symbol)
+        else:
+            g.edge(str(current_state), str(next_state), label=input_symbol)
 
     g.view()
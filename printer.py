@@ -4,7 +4,9 @@ from tabulate import tabulate
 def print_automaton(
     transition_function, starting_state, final_states, is_epsilon=False
 ):
-    input_symbols = ["0", "1"]
+    input_symbols = sorted(
+        {input_symbol for _, input_symbol in transition_function} - {"ε"}
+    )
 
     if is_epsilon:
         input_symbols.append("ε")
@@ -19,7 +21,7 @@ def print_automaton(
 
         for input_symbol in input_symbols:
             if (state, input_symbol) in transition_function:
-                if len(state) == 1 and starting_state in state:
+                if state == starting_state:
                     table_row[0] = "->"
 
                 if state in final_states:
@@ -1,22 +1,35 @@
+import itertools
+
 from enfa import ENfa, EPS
+from expression import count_nodes, from_postfix, simplify, to_postfix
+from alphabet import Alphabet, CharSet
+from nfa import Nfa
+from transition_graph import TransitionGraph
 
 KLEENEE = ("*", 2)
 CONCATENATION = (".", 1)
 UNION = ("+", 0)
 
-ALPHABET = {"0", "1"}
 OPERATORS = {KLEENEE[0], CONCATENATION[0], UNION[0]}
 
+ESCAPE = "\\"
+ANY = "."
+
+THOMPSON = "thompson"
+GLUSHKOV = "glushkov"
+
 
 class Regex:
-    def __init__(self, regex):
+    def __init__(self, regex, simplify=True):
         self.regex = regex
-        self.node_name_generator = self._create_node_name_generator()
-
-    def _create_node_name_generator(self):
-        for i in range(ord("a"), ord("z") + 1):
-            for j in range(ord("a"), ord("z") + 1):
-                yield chr(i) + chr(j)
+        # Simplify the expression tree of the regex before the constructions
+        self.simplify = simplify
+        # Dense integer state ids, there is no upper bound on the number of states.
+        self.state_ids = itertools.count()
+        # Created from the symbols of the regex during the construction
+        self.alphabet = None
+        # Transitions of the e-nfa during the Thompson's construction
+        self.graph = None
 
     def _get_operator(self, operator):
         if operator == "*":
@@ -29,165 +42,241 @@ class Regex:
     def _is_operator_higher_precedence(self, operator1, operator2):
         return self._get_operator(operator1)[1] >= self._get_operator(operator2)[1]
 
-    def _add_explicit_concatenation_symbols(self, regex):
-        new_regex = ""
-
-        prev = ""
-        for c in regex:
-            if (c in ALPHABET or c == "(") and (
-                prev in ALPHABET or prev == ")" or prev == "*"
+    def _parse_char_class(self, regex, index):
+        # index points after the opening '['
+        negated = index < len(regex) and regex[index] == "^"
+        if negated:
+            index += 1
+
+        # (char, True if it was escaped)
+        chars = []
+        while index < len(regex) and regex[index] != "]":
+            escaped = regex[index] == ESCAPE and index + 1 < len(regex)
+            if escaped:
+                index += 1
+            chars.append((regex[index], escaped))
+            index += 1
+
+        if index == len(regex):
+            raise ValueError(f"Unterminated character class in regex: {regex}")
+
+        ranges = []
+        i = 0
+        while i < len(chars):
+            char, _ = chars[i]
+            # An unescaped '-' between two characters is a range
+            if i + 2 < len(chars) and chars[i + 1] == ("-", False):
+                end_char = chars[i + 2][0]
+                if ord(end_char) < ord(char):
+                    raise ValueError(
+                        f"Invalid range {char}-{end_char} in regex: {regex}"
+                    )
+                ranges.append((ord(char), ord(end_char)))
+                i += 3
+            else:
+                ranges.append((ord(char), ord(char)))
+                i += 1
+
+        char_set = CharSet(ranges)
+        if negated:
+            char_set = char_set.complement()
+
+        if char_set.is_empty():
+            raise ValueError(f"Empty character class in regex: {regex}")
+
+        # Return the index after the closing ']'
+        return char_set, index + 1
+
+    def _tokenize(self, regex):
+        """Splits the regex into operators, parentheses and char sets."""
+        tokens = []
+
+        index = 0
+        while index < len(regex):
+            c = regex[index]
+            index += 1
+
+            if c in (KLEENEE[0], UNION[0], "(", ")"):
+                tokens.append(c)
+            elif c == ANY:
+                tokens.append(CharSet.any())
+            elif c == "[":
+                char_set, index = self._parse_char_class(regex, index)
+                tokens.append(char_set)
+            elif c == ESCAPE and index < len(regex):
+                tokens.append(CharSet.single(regex[index]))
+                index += 1
+            else:
+                tokens.append(CharSet.single(c))
+
+        return tokens
+
+    def _add_explicit_concatenation_symbols(self, tokens):
+        new_tokens = []
+
+        prev = None
+        for token in tokens:
+            if (isinstance(token, CharSet) or token == "(") and (
+                isinstance(prev, CharSet) or prev == ")" or prev == "*"
             ):
-                new_regex += "."
+                new_tokens.append(CONCATENATION[0])
 
-            new_regex += c
-            prev = c
+            new_tokens.append(token)
+            prev = token
 
-        return new_regex
+        return new_tokens
 
     def shunting_yard(self):
-        regex = self._add_explicit_concatenation_symbols(self.regex)
+        """Converts the regex to postfix notation.
 
-        output = ""
+        Returns:
+            The list of operators and char sets of the regex in postfix order.
+        """
+        tokens = self._add_explicit_concatenation_symbols(self._tokenize(self.regex))
+
+        output = []
         operator_stack = []
 
-        for symbol in regex:
-            if symbol in ALPHABET:
-                output += symbol
+        for symbol in tokens:
+            if isinstance(symbol, CharSet):
+                output.append(symbol)
             elif symbol in OPERATORS:
-                if operator_stack:
-                    top_operator = operator_stack[-1]
-
-                    if top_operator != "(":
-                        while self._is_operator_higher_precedence(top_operator, symbol):
-                            output += operator_stack.pop()
-                            if operator_stack:
-                                top_operator = operator_stack[-1]
-                            else:
-                                break
+                while (
+                    operator_stack
+                    and operator_stack[-1] != "("
+                    and self._is_operator_higher_precedence(operator_stack[-1], symbol)
+                ):
+                    output.append(operator_stack.pop())
 
                 operator_stack.append(symbol)
             elif symbol == "(":
                 operator_stack.append("(")
             elif symbol == ")":
                 while operator_stack and operator_stack[-1] != "(":
-                    output += operator_stack.pop()
+                    output.append(operator_stack.pop())
                 operator_stack.pop()
 
         while operator_stack:
-            output += operator_stack.pop()
+            output.append(operator_stack.pop())
 
         return output
 
-    def _handle_empty_expression(self):
-        starting_state = self.node_name_generator.__next__()
-        final_state = self.node_name_generator.__next__()
-
-        enfa = ENfa(
-            {
-                (starting_state, EPS): {final_state},
-            },
-            starting_state,
-            {final_state},
-        )
+    def _prepare_postfix(self, postfix_regex):
+        # Postfix regexes can also be given as strings, where every character
+        # that is not an operator is a symbol.
+        postfix_regex = [
+            (
+                e
+                if isinstance(e, CharSet) or e in OPERATORS or e == EPS
+                else CharSet.single(e)
+            )
+            for e in postfix_regex
+        ]
 
-        return enfa
+        self.alphabet = Alphabet(e for e in postfix_regex if isinstance(e, CharSet))
 
-    def _handle_symbol(self, symbol):
-        starting_state = self.node_name_generator.__next__()
-        final_state = self.node_name_generator.__next__()
+        return postfix_regex
 
-        enfa = ENfa(
-            {
-                (starting_state, symbol): {final_state},
-            },
-            starting_state,
-            {final_state},
-        )
+    def _create_raw_expression(self):
+        return from_postfix(self._prepare_postfix(self.shunting_yard()))
 
-        return enfa
+    def postfix(self):
+        """Converts the regex to postfix notation, simplified if enabled.
 
-    def _handle_union(self, enfa1, enfa2):
-        starting_state = self.node_name_generator.__next__()
-        final_state = self.node_name_generator.__next__()
-
-        enfa = ENfa(
-            {
-                (starting_state, EPS): {enfa1.starting_state, enfa2.starting_state},
-                (list(enfa1.final_states)[0], EPS): {final_state},
-                (list(enfa2.final_states)[0], EPS): {final_state},
-            },
-            starting_state,
-            {final_state},
-        )
+        Returns:
+            The list of operators, char sets and EPS of the regex in postfix order.
+        """
+        if not self.simplify:
+            return self.shunting_yard()
 
-        for k, v in enfa1.transition_function.items():
-            enfa.transition_function[k] = v
+        return to_postfix(simplify(self._create_raw_expression()))
 
-        for k, v in enfa2.transition_function.items():
-            enfa.transition_function[k] = v
+    def node_counts(self):
+        """Returns the number of nodes of the expression tree before and after
+        the simplification."""
+        expression = self._create_raw_expression()
 
-        return enfa
+        return count_nodes(expression), count_nodes(simplify(expression))
 
-    def _handle_concatenation(self, enfa1, enfa2):
-        new_mid_state = self.node_name_generator.__next__()
+    # The handlers all add their transitions to the same graph, every e-nfa they
+    # return is the part of the graph reachable from its starting state.
+
+    def _handle_empty_expression(self):
+        starting_state = next(self.state_ids)
+        final_state = next(self.state_ids)
+
+        self.graph.add(starting_state, EPS, final_state)
 
-        enfa = ENfa(
-            {},
-            enfa1.starting_state,
-            enfa2.final_states,
+        return ENfa(self.graph, starting_state, {final_state})
+
+    def _handle_symbol(self, char_set):
+        starting_state = next(self.state_ids)
+        final_state = next(self.state_ids)
+
+        # One transition for each class of the alphabet in the char set
+        for symbol in self.alphabet.symbols_of(char_set):
+            self.graph.add(starting_state, symbol, final_state)
+
+        return ENfa(self.graph, starting_state, {final_state})
+
+    def _handle_union(self, enfa1, enfa2):
+        starting_state = next(self.state_ids)
+        final_state = next(self.state_ids)
+
+        self.graph.add_all(
+            starting_state, EPS, {enfa1.starting_state, enfa2.starting_state}
         )
+        self.graph.add(list(enfa1.final_states)[0], EPS, final_state)
+        self.graph.add(list(enfa2.final_states)[0], EPS, final_state)
 
-        for k, v in enfa1.transition_function.items():
-            enfa.transition_function[k] = v
+        return ENfa(self.graph, starting_state, {final_state})
 
-        for k, v in enfa2.transition_function.items():
-            enfa.transition_function[k] = v
+    def _handle_concatenation(self, enfa1, enfa2):
+        new_mid_state = next(self.state_ids)
 
-        for k, v in enfa.transition_function.items():
-            if list(enfa1.final_states)[0] in v:
-                enfa.transition_function[k] = enfa.transition_function[k] | {
-                    new_mid_state
-                }
-                enfa.transition_function[k] = (
-                    enfa.transition_function[k] - enfa1.final_states
-                )
+        # The final state of enfa1 and the starting state of enfa2 are merged
+        # into the new mid state.
+        enfa1_final_state = list(enfa1.final_states)[0]
+        for symbol, previous_states in list(
+            self.graph.predecessors(enfa1_final_state).items()
+        ):
+            for previous_state in list(previous_states):
+                self.graph.remove(previous_state, symbol, enfa1_final_state)
+                self.graph.add(previous_state, symbol, new_mid_state)
 
-        for k, v in enfa.transition_function.items():
-            if k[0] == enfa2.starting_state:
-                enfa.transition_function[(new_mid_state, k[1])] = v
-                del enfa.transition_function[k]
-                break
+        self.graph.move(enfa2.starting_state, new_mid_state)
 
-        return enfa
+        return ENfa(self.graph, enfa1.starting_state, enfa2.final_states)
 
     def _handle_kleene_star(self, enfa1):
-        starting_state = self.node_name_generator.__next__()
-        final_state = self.node_name_generator.__next__()
-
-        enfa = ENfa(
-            {
-                (starting_state, EPS): {final_state, enfa1.starting_state},
-                (list(enfa1.final_states)[0], EPS): {final_state, enfa1.starting_state},
-            },
-            starting_state,
-            {final_state},
-        )
+        starting_state = next(self.state_ids)
+        final_state = next(self.state_ids)
 
-        for k, v in enfa1.transition_function.items():
-            enfa.transition_function[k] = v
+        self.graph.add_all(starting_state, EPS, {final_state, enfa1.starting_state})
+        self.graph.add_all(
+            list(enfa1.final_states)[0], EPS, {final_state, enfa1.starting_state}
+        )
 
-        return enfa
+        return ENfa(self.graph, starting_state, {final_state})
 
     def thomsons_construction(self, postfix_regex):
-        if postfix_regex == "":
-            return self._handle_empty_expression()
+        postfix_regex = self._prepare_postfix(postfix_regex)
+        self.graph = TransitionGraph()
+
+        if not postfix_regex:
+            result_enfa = self._handle_empty_expression()
+            result_enfa.alphabet = self.alphabet
+            return result_enfa
 
         nfa_stack = []
         for e in postfix_regex:
-            if e in ALPHABET:
+            if isinstance(e, CharSet):
                 symbol_nfa = self._handle_symbol(e)
                 nfa_stack.append(symbol_nfa)
 
+            if e == EPS:
+                nfa_stack.append(self._handle_empty_expression())
+
             if e == CONCATENATION[0]:
                 enfa2 = nfa_stack.pop()
                 enfa1 = nfa_stack.pop()
@@ -209,17 +298,137 @@ class Regex:
                 nfa_stack.append(kleene_star_nfa)
 
         result_enfa = nfa_stack.pop()
+        result_enfa.alphabet = self.alphabet
         return result_enfa
 
     def create_enfa_from_regex(self):
         """Creates an e-nfa from a regular expression.
 
-        Args:
-            regex: the regular expression as a string
-
         Returns:
             The e-nfa converted from a regex.
         """
-        postfix_regex = self.shunting_yard()
+        postfix_regex = self.postfix()
 
         return self.thomsons_construction(postfix_regex)
+
+    def create_expression_from_regex(self):
+        """Creates an expression tree from a regular expression.
+
+        Returns:
+            The expression of the regex, see expression.py.
+        """
+        expression = self._create_raw_expression()
+
+        return simplify(expression) if self.simplify else expression
+
+    def glushkov_construction(self, postfix_regex):
+        """Creates an nfa without epsilon transitions from a postfix regex.
+
+        Every symbol occurrence (position) of the regex becomes exactly one state,
+        plus the starting state 0. A position q follows p if q can come right
+        after p in a matched string.
+
+        Args:
+            postfix_regex: the regular expression in postfix notation
+
+        Returns:
+            The position automaton of the regex.
+        """
+        postfix_regex = self._prepare_postfix(postfix_regex)
+
+        starting_state = 0
+
+        # Alphabet symbols of every position
+        symbols = {}
+        # position -> positions that can follow it
+        follow = {}
+
+        # Every entry is (nullable, first positions, last positions)
+        stack = []
+        for e in postfix_regex:
+            if isinstance(e, CharSet):
+                position = len(symbols) + 1
+                symbols[position] = self.alphabet.symbols_of(e)
+                follow[position] = set()
+                stack.append((False, {position}, {position}))
+
+            if e == EPS:
+                stack.append((True, set(), set()))
+
+            if e == CONCATENATION[0]:
+                nullable2, first2, last2 = stack.pop()
+                nullable1, first1, last1 = stack.pop()
+
+                for position in last1:
+                    follow[position] |= first2
+
+                stack.append(
+                    (
+                        nullable1 and nullable2,
+                        first1 | first2 if nullable1 else first1,
+                        last1 | last2 if nullable2 else last2,
+                    )
+                )
+
+            if e == UNION[0]:
+                nullable2, first2, last2 = stack.pop()
+                nullable1, first1, last1 = stack.pop()
+
+                stack.append((nullable1 or nullable2, first1 | first2, last1 | last2))
+
+            if e == KLEENEE[0]:
+                _, first1, last1 = stack.pop()
+
+                for position in last1:
+                    follow[position] |= first1
+
+                stack.append((True, first1, last1))
+
+        nullable, first, last = stack.pop() if stack else (True, set(), set())
+
+        graph = TransitionGraph()
+
+        def add_transitions(state, next_positions):
+            for position in next_positions:
+                for symbol in symbols[position]:
+                    graph.add(state, symbol, position)
+
+        add_transitions(starting_state, first)
+        for position, next_positions in follow.items():
+            add_transitions(position, next_positions)
+
+        final_states = set(last)
+        if nullable:
+            final_states.add(starting_state)
+
+        return Nfa(graph, starting_state, final_states, self.alphabet)
+
+    def create_nfa_from_regex(self, construction=THOMPSON):
+        """Creates an nfa from a regular expression.
+
+        Args:
+            construction: THOMPSON to go through an e-nfa, GLUSHKOV to build the
+                position automaton directly.
+
+        Returns:
+            The nfa of the regex.
+        """
+        return self.create_nfa_from_postfix(self.postfix(), construction)
+
+    def create_nfa_from_postfix(self, postfix_regex, construction=THOMPSON):
+        """Creates an nfa from a postfix regex.
+
+        Args:
+            postfix_regex: the regular expression in postfix notation
+            construction: THOMPSON to go through an e-nfa, GLUSHKOV to build the
+                position automaton directly.
+
+        Returns:
+            The nfa of the postfix regex.
+        """
+        if construction == GLUSHKOV:
+            return self.glushkov_construction(postfix_regex)
+        elif construction == THOMPSON:
+            return self.thomsons_construction(postfix_regex).convert_to_nfa()
+        else:
+            raise ValueError(f"Unknown construction: {construction}")
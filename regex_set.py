@@ -0,0 +1,92 @@
+from alphabet import CharSet
+from expression import UNION, to_postfix
+from lazy_dfa import LazyDfa, DEFAULT_MAX_STATES
+from regex import Regex
+
+""" Matching a set of regexes in one pass.
+
+The regexes are joined by a union into one position automaton (see
+Regex.glushkov_construction). Every position belongs to exactly one of the
+regexes, so the states of the dfa of the union, the sets of positions, also
+tell which regexes match: the ones with a final position in the set. The dfa is
+the product of the dfas of the regexes, it is built lazily, only for the states
+the inputs reach, see lazy_dfa.py.
+"""
+
+
+class _RegexSetDfa(LazyDfa):
+    def __init__(self, nfa, pattern_ids, nullable_ids, max_states):
+        # position - 1 -> index of its regex
+        self.pattern_ids = pattern_ids
+        # Indexes of the regexes that match the empty string
+        self.nullable_ids = nullable_ids
+
+        super().__init__(nfa, max_states)
+
+    def _accepts(self, states):
+        # The indexes of the regexes that accept in the set of positions
+        matches = {
+            self.pattern_ids[state - 1]
+            for state in states & self.nfa.final_states
+            if state != self.nfa.starting_state
+        }
+        if self.nfa.starting_state in states:
+            matches.update(self.nullable_ids)
+
+        return frozenset(matches)
+
+    def matches(self, input_string):
+        state = self._run(input_string)
+
+        return frozenset() if state is None else self._accepting[state]
+
+
+class RegexSet:
+    def __init__(self, regexes, max_states=DEFAULT_MAX_STATES):
+        self.regexes = list(regexes)
+
+        postfix_regex = []
+        pattern_ids = []
+        nullable_ids = set()
+
+        # The postfix regexes joined by unions, that are not simplified, so the
+        # positions of every regex stay separate.
+        for index, regex in enumerate(self.regexes):
+            expression = Regex(regex).create_expression_from_regex()
+
+            pattern_postfix = to_postfix(expression)
+            postfix_regex += pattern_postfix
+            if index > 0:
+                postfix_regex.append(UNION)
+
+            # Every char set is a position
+            pattern_ids += [index] * sum(
+                isinstance(e, CharSet) for e in pattern_postfix
+            )
+            if expression.nullable:
+                nullable_ids.add(index)
+
+        nfa = Regex("").glushkov_construction(postfix_regex)
+        self._dfa = _RegexSetDfa(nfa, pattern_ids, nullable_ids, max_states)
+
+    def __len__(self):
+        return len(self.regexes)
+
+    @property
+    def cache_flushes(self):
+        return self._dfa.cache_flushes
+
+    def matches(self, input_string):
+        """Matches every regex of the set against the input in one pass.
+
+        Args:
+            input_string: the input to check.
+
+        Returns:
+            The frozenset of the indexes of the regexes that accept the input.
+        """
+        return self._dfa.matches(input_string)
+
+    def is_match(self, input_string):
+        """True if any regex of the set accepts the input."""
+        return bool(self.matches(input_string))
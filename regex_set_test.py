@@ -0,0 +1,49 @@
+import itertools
+import unittest
+
+from regex import Regex
+from regex_set import RegexSet
+
+
+class RegexSetTest(unittest.TestCase):
+    def test_regex_set_matches(self):
+        regex_set = RegexSet(["0(0+1)*1", "(01)*", "0*", "[0-9][0-9]*"])
+
+        self.assertEqual(len(regex_set), 4)
+        self.assertEqual(regex_set.matches("0101"), {0, 1, 3})
+        self.assertEqual(regex_set.matches("000"), {2, 3})
+        self.assertEqual(regex_set.matches(""), {1, 2})
+        self.assertEqual(regex_set.matches("91"), {3})
+        self.assertEqual(regex_set.matches("x"), set())
+
+        self.assertTrue(regex_set.is_match("1"))
+        self.assertFalse(regex_set.is_match("a"))
+
+    def test_regex_set_empty(self):
+        regex_set = RegexSet([])
+
+        self.assertEqual(regex_set.matches(""), set())
+        self.assertEqual(regex_set.matches("0"), set())
+
+    def test_regex_set_same_as_every_regex(self):
+        regexes = ["0(0+1)*1", "(0*1)*(1+0)*", "0*1*0", "(01+1)*0", "", "1(0+1)(0+1)"]
+        regex_set = RegexSet(regexes, max_states=4)
+        dfas = [
+            Regex(regex).create_nfa_from_regex().convert_to_dfa() for regex in regexes
+        ]
+
+        for length in range(7):
+            for symbols in itertools.product("01", repeat=length):
+                input_string = "".join(symbols)
+
+                self.assertEqual(
+                    regex_set.matches(input_string),
+                    {
+                        i
+                        for i, dfa in enumerate(dfas)
+                        if dfa.is_string_accepted(input_string)
+                    },
+                    input_string,
+                )
+
+        self.assertGreater(regex_set.cache_flushes, 0)
@@ -1,110 +1,208 @@
 import unittest
 
+from alphabet import CharSet
 from enfa import EPS
 from regex import Regex
 
 
+def shunting_yard(regex):
+    return " ".join(str(e) for e in Regex(regex).shunting_yard())
+
+
 class RegexTest(unittest.TestCase):
     def test_shunting_yard(self):
-        self.assertEqual(Regex("0").shunting_yard(), "0")
-        self.assertEqual(Regex("01").shunting_yard(), "01.")
-        self.assertEqual(Regex("0+1").shunting_yard(), "01+")
-        self.assertEqual(Regex("(0+1)*0+11").shunting_yard(), "01+*0.11.+")
-        self.assertEqual(Regex("0(0+1)*1").shunting_yard(), "001+*.1.")
-        self.assertEqual(Regex("(0)(1)").shunting_yard(), "01.")
+        self.assertEqual(shunting_yard("0"), "0")
+        self.assertEqual(shunting_yard("01"), "0 1 .")
+        self.assertEqual(shunting_yard("0+1"), "0 1 +")
+        self.assertEqual(shunting_yard("(0+1)*0+11"), "0 1 + * 0 . 1 1 . +")
+        self.assertEqual(shunting_yard("0(0+1)*1"), "0 0 1 + * . 1 .")
+        self.assertEqual(shunting_yard("(0)(1)"), "0 1 .")
+        self.assertEqual(shunting_yard("(01+1)*0"), "0 1 . 1 + * 0 .")
+
+    def test_shunting_yard_char_sets(self):
+        self.assertEqual(shunting_yard("ab"), "a b .")
+        self.assertEqual(shunting_yard("a.*"), "a . * .")
+        self.assertEqual(shunting_yard("[a-z0]x"), "[0a-z] x .")
+        self.assertEqual(shunting_yard("[^a]"), "[\x00-`b-\U0010ffff]")
+        self.assertEqual(shunting_yard("[\\]\\-]"), "[\\-\\]]")
+        # An escaped backslash before a '-' starts a range
+        self.assertEqual(shunting_yard("[\\\\-a]"), "[\\\\-a]")
+        self.assertEqual(shunting_yard("[a\\\\\\-]"), "[\\-\\\\a]")
+
+    def test_shunting_yard_escaped_operators(self):
+        self.assertEqual(
+            Regex("\\*\\+\\.").shunting_yard(),
+            [CharSet.single("*"), CharSet.single("+"), ".", CharSet.single("."), "."],
+        )
+
+    def test_shunting_yard_invalid_char_class(self):
+        with self.assertRaises(ValueError):
+            Regex("[ab").shunting_yard()
+
+        with self.assertRaises(ValueError):
+            Regex("[b-a]").shunting_yard()
 
     def test_thomsons_construction_empty_regex(self):
         enfa = Regex("").thomsons_construction("")
 
-        self.assertEqual(enfa.starting_state, "aa")
-        self.assertEqual(enfa.final_states, {"ab"})
+        self.assertEqual(enfa.starting_state, 0)
+        self.assertEqual(enfa.final_states, {1})
 
-        expected_transition_function = {("aa", EPS): {"ab"}}
+        expected_transition_function = {(0, EPS): {1}}
 
         self.assertEqual(enfa.transition_function, expected_transition_function)
 
     def test_thomsons_construction_single_symbol_regex(self):
         enfa = Regex("").thomsons_construction("0")
 
-        self.assertEqual(enfa.starting_state, "aa")
-        self.assertEqual(enfa.final_states, {"ab"})
+        self.assertEqual(enfa.starting_state, 0)
+        self.assertEqual(enfa.final_states, {1})
 
-        expected_transition_function = {("aa", "0"): {"ab"}}
+        expected_transition_function = {(0, "0"): {1}}
 
         self.assertEqual(enfa.transition_function, expected_transition_function)
 
     def test_thomsons_construction_single_union_regex(self):
         enfa = Regex("").thomsons_construction("01+")
 
-        self.assertEqual(enfa.starting_state, "ae")
-        self.assertEqual(enfa.final_states, {"af"})
+        self.assertEqual(enfa.starting_state, 4)
+        self.assertEqual(enfa.final_states, {5})
 
         self.assertEqual(len(enfa.transition_function), 5)
-        self.assertEqual(enfa.transition_function[("aa", "0")], {"ab"})
-        self.assertEqual(enfa.transition_function[("ac", "1")], {"ad"})
-        self.assertEqual(enfa.transition_function[("ae", EPS)], {"aa", "ac"})
-        self.assertEqual(enfa.transition_function[("ab", EPS)], {"af"})
-        self.assertEqual(enfa.transition_function[("ad", EPS)], {"af"})
+        self.assertEqual(enfa.transition_function[(0, "0")], {1})
+        self.assertEqual(enfa.transition_function[(2, "1")], {3})
+        self.assertEqual(enfa.transition_function[(4, EPS)], {0, 2})
+        self.assertEqual(enfa.transition_function[(1, EPS)], {5})
+        self.assertEqual(enfa.transition_function[(3, EPS)], {5})
 
     def test_thomsons_construction_single_concatenation_regex(self):
         enfa = Regex("").thomsons_construction("01.")
 
-        self.assertEqual(enfa.starting_state, "aa")
-        self.assertEqual(enfa.final_states, {"ad"})
+        self.assertEqual(enfa.starting_state, 0)
+        self.assertEqual(enfa.final_states, {3})
 
         self.assertEqual(len(enfa.transition_function), 2)
-        self.assertEqual(enfa.transition_function[("aa", "0")], {"ae"})
-        self.assertEqual(enfa.transition_function[("ae", "1")], {"ad"})
+        self.assertEqual(enfa.transition_function[(0, "0")], {4})
+        self.assertEqual(enfa.transition_function[(4, "1")], {3})
 
     def test_thomsons_construction_single_kleene_star_regex(self):
         enfa = Regex("").thomsons_construction("0*")
 
-        self.assertEqual(enfa.starting_state, "ac")
-        self.assertEqual(enfa.final_states, {"ad"})
+        self.assertEqual(enfa.starting_state, 2)
+        self.assertEqual(enfa.final_states, {3})
 
         self.assertEqual(len(enfa.transition_function), 3)
-        self.assertEqual(enfa.transition_function[("ac", EPS)], {"aa", "ad"})
-        self.assertEqual(enfa.transition_function[("aa", "0")], {"ab"})
-        self.assertEqual(enfa.transition_function[("ab", EPS)], {"aa", "ad"})
+        self.assertEqual(enfa.transition_function[(2, EPS)], {0, 3})
+        self.assertEqual(enfa.transition_function[(0, "0")], {1})
+        self.assertEqual(enfa.transition_function[(1, EPS)], {0, 3})
 
     def test_thomsons_construction_double_concatenation_regex(self):
         enfa = Regex("").thomsons_construction("01.0.")
 
-        self.assertEqual(enfa.starting_state, "aa")
-        self.assertEqual(enfa.final_states, {"ag"})
+        self.assertEqual(enfa.starting_state, 0)
+        self.assertEqual(enfa.final_states, {6})
 
         self.assertEqual(len(enfa.transition_function), 3)
-        self.assertEqual(enfa.transition_function[("aa", "0")], {"ae"})
-        self.assertEqual(enfa.transition_function[("ae", "1")], {"ah"})
-        self.assertEqual(enfa.transition_function[("ah", "0")], {"ag"})
+        self.assertEqual(enfa.transition_function[(0, "0")], {4})
+        self.assertEqual(enfa.transition_function[(4, "1")], {7})
+        self.assertEqual(enfa.transition_function[(7, "0")], {6})
 
     def test_thomsons_construction_union_and_concatenation_regex(self):
         enfa = Regex("").thomsons_construction("01+0.")
 
-        self.assertEqual(enfa.starting_state, "ae")
-        self.assertEqual(enfa.final_states, {"ah"})
+        self.assertEqual(enfa.starting_state, 4)
+        self.assertEqual(enfa.final_states, {7})
 
         self.assertEqual(len(enfa.transition_function), 6)
-        self.assertEqual(enfa.transition_function[("aa", "0")], {"ab"})
-        self.assertEqual(enfa.transition_function[("ac", "1")], {"ad"})
-        self.assertEqual(enfa.transition_function[("ae", EPS)], {"aa", "ac"})
-        self.assertEqual(enfa.transition_function[("ab", EPS)], {"ai"})
-        self.assertEqual(enfa.transition_function[("ad", EPS)], {"ai"})
-        self.assertEqual(enfa.transition_function[("ai", "0")], {"ah"})
+        self.assertEqual(enfa.transition_function[(0, "0")], {1})
+        self.assertEqual(enfa.transition_function[(2, "1")], {3})
+        self.assertEqual(enfa.transition_function[(4, EPS)], {0, 2})
+        self.assertEqual(enfa.transition_function[(1, EPS)], {8})
+        self.assertEqual(enfa.transition_function[(3, EPS)], {8})
+        self.assertEqual(enfa.transition_function[(8, "0")], {7})
 
     def test_thomsons_construction_1(self):
         enfa = Regex("").thomsons_construction("001+*.1.")
 
-        self.assertEqual(enfa.starting_state, "aa")
-        self.assertEqual(enfa.final_states, {"am"})
+        self.assertEqual(enfa.starting_state, 0)
+        self.assertEqual(enfa.final_states, {12})
 
         self.assertEqual(len(enfa.transition_function), 9)
-        self.assertEqual(enfa.transition_function[("aa", "0")], {"ak"})
-        self.assertEqual(enfa.transition_function[("ah", "ε")], {"ag", "an"})
-        self.assertEqual(enfa.transition_function[("ag", "ε")], {"ae", "ac"})
-        self.assertEqual(enfa.transition_function[("ad", "ε")], {"ah"})
-        self.assertEqual(enfa.transition_function[("af", "ε")], {"ah"})
-        self.assertEqual(enfa.transition_function[("ac", "0")], {"ad"})
-        self.assertEqual(enfa.transition_function[("ae", "1")], {"af"})
-        self.assertEqual(enfa.transition_function[("ak", "ε")], {"ag", "an"})
-        self.assertEqual(enfa.transition_function[("an", "1")], {"am"})
+        self.assertEqual(enfa.transition_function[(0, "0")], {10})
+        self.assertEqual(enfa.transition_function[(7, EPS)], {6, 13})
+        self.assertEqual(enfa.transition_function[(6, EPS)], {4, 2})
+        self.assertEqual(enfa.transition_function[(3, EPS)], {7})
+        self.assertEqual(enfa.transition_function[(5, EPS)], {7})
+        self.assertEqual(enfa.transition_function[(2, "0")], {3})
+        self.assertEqual(enfa.transition_function[(4, "1")], {5})
+        self.assertEqual(enfa.transition_function[(10, EPS)], {6, 13})
+        self.assertEqual(enfa.transition_function[(13, "1")], {12})
+
+    def test_thomsons_construction_has_no_state_limit(self):
+        enfa = Regex("").thomsons_construction("0" + "0." * 1000)
+
+        self.assertEqual(enfa.starting_state, 0)
+        self.assertEqual(len(enfa.transition_function), 1001)
+        self.assertTrue(all(isinstance(s, int) for s, _ in enfa.transition_function))
+
+    def test_glushkov_construction_empty_regex(self):
+        nfa = Regex("").glushkov_construction("")
+
+        self.assertEqual(nfa.starting_state, 0)
+        self.assertEqual(nfa.final_states, {0})
+        self.assertEqual(nfa.transition_function, {})
+
+    def test_glushkov_construction_1(self):
+        nfa = Regex("").glushkov_construction("001+*.1.")
+
+        self.assertEqual(nfa.starting_state, 0)
+        self.assertEqual(nfa.final_states, {4})
+
+        expected_transition_function = {
+            (0, "0"): {1},
+            (1, "0"): {2},
+            (1, "1"): {3, 4},
+            (2, "0"): {2},
+            (2, "1"): {3, 4},
+            (3, "0"): {2},
+            (3, "1"): {3, 4},
+        }
+
+        self.assertEqual(nfa.transition_function, expected_transition_function)
+
+    def test_glushkov_construction_nullable_regex(self):
+        nfa = Regex("").glushkov_construction("0*1*.")
+
+        self.assertEqual(nfa.final_states, {0, 1, 2})
+
+    def test_create_nfa_from_regex_unknown_construction(self):
+        with self.assertRaises(ValueError):
+            Regex("0").create_nfa_from_regex("unknown")
+
+    def test_thomsons_construction_char_class_regex(self):
+        regex = Regex("[a-z]x")
+        enfa = regex.create_enfa_from_regex()
+
+        self.assertEqual(sorted(regex.alphabet.symbols), ["[a-wy-z]", "x"])
+        self.assertEqual(len(enfa.transition_function), 3)
+
+    def test_postfix_is_simplified(self):
+        self.assertEqual(" ".join(map(str, Regex("(0+0)(1*)*").postfix())), "0 1 * .")
+        self.assertEqual(" ".join(map(str, Regex("01+02").postfix())), "0 1 2 + .")
+        self.assertEqual(Regex("").postfix(), [EPS])
+
+        self.assertEqual(
+            " ".join(map(str, Regex("(0+0)", simplify=False).postfix())), "0 0 +"
+        )
+
+    def test_node_counts(self):
+        self.assertEqual(Regex("(0+0)(1*)*").node_counts(), (7, 4))
+        self.assertEqual(Regex("0*0*0*").node_counts(), (8, 2))
+
+    def test_simplification_makes_smaller_enfas(self):
+        simplified = Regex("((0+0)+(0+0))*1*1*").create_enfa_from_regex()
+        raw = Regex("((0+0)+(0+0))*1*1*", simplify=False).create_enfa_from_regex()
+
+        self.assertLess(
+            len(simplified.transition_function), len(raw.transition_function)
+        )
@@ -0,0 +1,94 @@
+import random
+
+""" Uniform sampling of the strings accepted by a dfa.
+
+The number of accepted strings of every length up to n is counted from every
+state backwards, a state has as many accepted suffixes of length k as the sum of
+the accepted suffixes of length k - 1 of its next states, times the number of
+characters going to them. A string is drawn character by character from the
+starting state, every transition is chosen with the probability of the share of
+the accepted suffixes behind it, so every accepted string of length n is drawn
+with the same probability.
+"""
+
+
+class Sampler:
+    def __init__(self, dfa, length):
+        if length < 0:
+            raise ValueError(f"The length can not be negative: {length}")
+
+        self.dfa = dfa
+        self.length = length
+
+        sizes = dfa.symbol_sizes()
+        # The dead states do not have accepted suffixes of any length
+        dead_states = dfa.dead_states()
+
+        # state -> (input symbol, number of characters, next state)
+        self._transitions = {}
+        for (state, symbol), next_state in dfa.graph.items():
+            if next_state not in dead_states:
+                self._transitions.setdefault(state, []).append(
+                    (symbol, sizes[symbol], next_state)
+                )
+
+        # suffix length -> state -> number of accepted suffixes of the length
+        self._suffix_counts = [dict.fromkeys(dfa.final_states, 1)]
+        for _ in range(length):
+            counts = self._suffix_counts[-1]
+            self._suffix_counts.append(
+                {
+                    state: sum(
+                        size * counts.get(next_state, 0)
+                        for _, size, next_state in transitions
+                    )
+                    for state, transitions in self._transitions.items()
+                }
+            )
+
+    @property
+    def count(self):
+        """The number of accepted strings of the length of the sampler."""
+        return self._suffix_counts[self.length].get(self.dfa.starting_state, 0)
+
+    def sample(self, rng=random):
+        """Draws an accepted string of the length uniformly at random.
+
+        Args:
+            rng: the random number generator, a random.Random.
+
+        Returns:
+            The string, None if no string of the length is accepted.
+        """
+        if not self.count:
+            return None
+
+        chars = []
+        state = self.dfa.starting_state
+        for remaining in range(self.length, 0, -1):
+            counts = self._suffix_counts[remaining - 1]
+
+            # The index of the drawn string among the accepted suffixes
+            index = rng.randrange(self._suffix_counts[remaining][state])
+            for symbol, size, next_state in self._transitions[state]:
+                suffix_count = size * counts.get(next_state, 0)
+                if index < suffix_count:
+                    chars.append(self._char(symbol, index // counts[next_state]))
+                    state = next_state
+                    break
+
+                index -= suffix_count
+
+        return "".join(chars)
+
+    def _char(self, symbol, index):
+        # The index-th character of the symbol
+        if self.dfa.alphabet is None:
+            return symbol
+
+        for start, end in self.dfa.alphabet.classes[symbol].ranges:
+            if index <= end - start:
+                return chr(start + index)
+            index -= end - start + 1
+
+        raise IndexError(f"The symbol {symbol!r} has no character {index}")
@@ -0,0 +1,74 @@
+import collections
+import itertools
+import random
+import unittest
+
+import main
+from regex import Regex
+from sampling import Sampler
+
+
+def create_dfa(regex):
+    return Regex(regex).create_nfa_from_regex().convert_to_dfa()
+
+
+class SamplerTest(unittest.TestCase):
+    def test_count(self):
+        dfa = create_dfa("(0+1)*1(0+1)(0+1)")
+
+        for length in range(8):
+            accepted = [
+                "".join(chars)
+                for chars in itertools.product("01", repeat=length)
+                if dfa.is_string_accepted("".join(chars))
+            ]
+            self.assertEqual(Sampler(dfa, length).count, len(accepted))
+            self.assertEqual(dfa.count_accepted(length), len(accepted))
+
+    def test_count_char_classes(self):
+        dfa = create_dfa("[a-c]*(b+[^a])c.")
+
+        # One of [^a], a c and any character
+        self.assertEqual(dfa.count_accepted(3), (0x110000 - 1) * 0x110000)
+        self.assertEqual(Sampler(dfa, 5).count, dfa.count_accepted(5))
+
+    def test_sample_is_uniform(self):
+        dfa = create_dfa("(0+1)*1(0+1)")
+        sampler = Sampler(dfa, 4)
+        rng = random.Random(0)
+
+        counts = collections.Counter(sampler.sample(rng) for _ in range(8000))
+
+        # Every accepted string, about equally often
+        self.assertEqual(len(counts), 8)
+        self.assertTrue(all(dfa.is_string_accepted(s) for s in counts))
+        self.assertTrue(all(800 < count < 1200 for count in counts.values()))
+
+    def test_sample_char_classes(self):
+        dfa = create_dfa("[a-c]*(b+[^a])c.")
+        sampler = Sampler(dfa, 10)
+        rng = random.Random(0)
+
+        for _ in range(100):
+            sample = sampler.sample(rng)
+            self.assertEqual(len(sample), 10)
+            self.assertTrue(dfa.is_string_accepted(sample))
+
+    def test_sample_no_accepted_string(self):
+        self.assertIsNone(Sampler(create_dfa("000"), 2).sample())
+        self.assertEqual(Sampler(create_dfa("0*"), 0).sample(), "")
+
+    def test_negative_length(self):
+        dfa = create_dfa("0*")
+
+        with self.assertRaises(ValueError):
+            dfa.count_accepted(-1)
+        with self.assertRaises(ValueError):
+            Sampler(dfa, -1)
+
+    def test_main_count_and_sample(self):
+        self.assertEqual(main.count_accepted("0(0+1)*1", 10), 256)
+
+        sample = main.sample("0(0+1)*1", 10, random.Random(0))
+        self.assertEqual(len(sample), 10)
+        self.assertTrue(main.match("0(0+1)*1", sample))
@@ -0,0 +1,217 @@
+import math
+import mmap
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from dense_dfa import BLOCK_SIZE, DenseDfa, UNKNOWN_SYMBOL
+from dfa import Dfa
+
+""" Matching of files.
+
+The file is memory mapped and the dfa runs over its bytes a chunk at a time, so
+files of any size are matched in constant memory. Every byte is the character
+of the same code point (latin-1), like the bytes patterns of the re module.
+
+A byte -> column translation table is precomputed from the alphabet of the dfa.
+The bytes only use some of the symbols of the dfa, so the table of the scanner
+only has a column for those, and the translated chunk still fits into bytes.
+
+A file can also be matched by a pool of processes. Every process maps every
+state to the state the dfa is in after a chunk of the file, and the maps of the
+chunks are composed in order. Most of the states end up in the same state after
+a few bytes, from then on they are only run once.
+
+The dead and the universal states are not run on the rest of the input, from a
+universal state only the unknown bytes have to be found, see DenseDfa.stop.
+"""
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Number of chunks per process, so a slow chunk does not hold up the others
+CHUNKS_PER_PROCESS = 4
+
+# The states are run this many bytes before the equal ones are merged
+MERGE_INTERVAL = 1024
+
+
+class FileScanner:
+    def __init__(self, dfa, chunk_size=DEFAULT_CHUNK_SIZE):
+        # A Dfa is converted to a dense table, see dense_dfa.py
+        self.dfa = DenseDfa(dfa) if isinstance(dfa, Dfa) else dfa
+        self.chunk_size = chunk_size
+
+        # Symbol index of every byte in the dense dfa
+        byte_symbols = list(self.dfa.encode(bytes(range(256)).decode("latin-1")))
+
+        # symbol index -> column of the scanner table, the unknown symbol is 0
+        columns = {UNKNOWN_SYMBOL: 0}
+        for symbol_index in byte_symbols:
+            columns.setdefault(symbol_index, len(columns))
+
+        # bytes.translate table of byte -> column
+        self.translation = bytes(columns[symbol_index] for symbol_index in byte_symbols)
+        self.width = len(columns)
+
+        # The offsets of the rows of the next states, like in DenseDfa
+        self.row_table = array("l", [0]) * (self.dfa.state_count * self.width)
+        for state in range(self.dfa.state_count):
+            for symbol_index, column in columns.items():
+                next_state = self.dfa.next_state(state, symbol_index)
+                self.row_table[state * self.width + column] = next_state * self.width
+
+        # False if every byte is in a symbol, then nothing is rejected after a
+        # universal state
+        self.has_unknown_bytes = UNKNOWN_SYMBOL in self.translation
+
+        self.dead_row = self.dfa.dead_state * self.width
+        # The rows of the dead and the universal states, see DenseDfa.stop
+        self.stopping_rows = frozenset(
+            [self.dead_row]
+            + [state * self.width for state in self.dfa.universal_states]
+        )
+
+    def run(self, row, data):
+        """Steps through the table on the bytes.
+
+        Args:
+            row: the offset of the row of the current state, state * width.
+            data: the input bytes.
+
+        Returns:
+            The offset of the row of the state after the input.
+        """
+        return self._run_columns(row, data.translate(self.translation))
+
+    def _run_columns(self, row, columns):
+        row_table = self.row_table
+        stopping_rows = self.stopping_rows
+
+        for start in range(0, len(columns), BLOCK_SIZE):
+            if row in stopping_rows:
+                # Only an unknown byte can change a universal state, to dead
+                if (
+                    row != self.dead_row
+                    and self.has_unknown_bytes
+                    and UNKNOWN_SYMBOL in columns[start:]
+                ):
+                    return self.dead_row
+                return row
+
+            for column in columns[start : start + BLOCK_SIZE]:
+                row = row_table[row + column]
+
+        return row
+
+    def map_states(self, data, states=None):
+        """Runs the dfa on the bytes from several states.
+
+        Args:
+            data: the input bytes.
+            states: the states to start from, every state if None.
+
+        Returns:
+            The list of the states after the input, one for every start state.
+        """
+        if states is None:
+            states = range(self.dfa.state_count)
+
+        # The distinct current rows, and the index of the current row of every
+        # start state in them
+        rows, current = _merge([state * self.width for state in states])
+
+        for start in range(0, len(data), MERGE_INTERVAL):
+            columns = data[start : start + MERGE_INTERVAL].translate(self.translation)
+
+            # Merge the rows that are in the same state now
+            rows, indices = _merge([self._run_columns(row, columns) for row in rows])
+            current = [indices[i] for i in current]
+
+        return [rows[i] // self.width for i in current]
+
+    def match_file(self, path, processes=1):
+        """Check if the whole content of the file is accepted by the dfa.
+
+        Args:
+            path: the path of the file.
+            processes: the number of processes matching the chunks of the file
+                in parallel, 1 to match it in this process.
+
+        Returns:
+            True if the automaton accepts the content, False otherwise.
+        """
+        if processes > 1:
+            return self._match_file_in_parallel(path, processes)
+
+        row = self.dfa.starting_state * self.width
+
+        with open(path, "rb") as file, map_file(file) as data:
+            for start in range(0, len(data), self.chunk_size):
+                row = self.run(row, data[start : start + self.chunk_size])
+
+                if row == self.dead_row:
+                    # No continuation can be accepted
+                    break
+
+        return self.dfa.accepting[row // self.width]
+
+    def _match_file_in_parallel(self, path, processes):
+        with open(path, "rb") as file:
+            size = file.seek(0, 2)
+
+        chunk_size = max(
+            self.chunk_size, math.ceil(size / (processes * CHUNKS_PER_PROCESS))
+        )
+        starts = range(0, size, chunk_size)
+
+        # Only the starting state matters at the start of the file
+        states = [None] * len(starts)
+        if states:
+            states[0] = [self.dfa.starting_state]
+
+        with ProcessPoolExecutor(
+            processes, initializer=_set_worker_scanner, initargs=(self,)
+        ) as executor:
+            state_maps = executor.map(
+                _map_chunk_states,
+                [path] * len(starts),
+                starts,
+                [chunk_size] * len(starts),
+                states,
+            )
+
+            state = self.dfa.starting_state
+            for index, state_map in enumerate(state_maps):
+                state = state_map[0 if index == 0 else state]
+
+        return self.dfa.accepting[state]
+
+
+def _merge(rows):
+    # Returns the distinct rows, and the index of every row in them
+    indices = {}
+    for row in rows:
+        indices.setdefault(row, len(indices))
+
+    return list(indices), [indices[row] for row in rows]
+
+
+# The scanner of a worker process of the pool
+_worker_scanner = None
+
+
+def _set_worker_scanner(scanner):
+    global _worker_scanner
+    _worker_scanner = scanner
+
+
+def _map_chunk_states(path, start, chunk_size, states):
+    with open(path, "rb") as file, map_file(file) as data:
+        return _worker_scanner.map_states(data[start : start + chunk_size], states)
+
+
+def map_file(file):
+    # Empty files can not be memory mapped
+    if not file.seek(0, 2):
+        return memoryview(b"")
+
+    return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
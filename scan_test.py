@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+
+import main
+from regex import Regex
+from scan import FileScanner
+
+
+class FileScannerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_file(self, data):
+        path = os.path.join(self.directory.name, "input")
+        with open(path, "wb") as file:
+            file.write(data)
+
+        return path
+
+    def create_scanner(self, regex, chunk_size=4):
+        dfa = Regex(regex).create_nfa_from_regex().convert_to_dfa().minimize()
+
+        return FileScanner(dfa, chunk_size)
+
+    def test_scanner_match_file(self):
+        scanner = self.create_scanner("0(0+1)*1")
+
+        self.assertTrue(scanner.match_file(self.write_file(b"0110010101")))
+        self.assertFalse(scanner.match_file(self.write_file(b"0110010100")))
+        self.assertFalse(scanner.match_file(self.write_file(b"1110010101")))
+        self.assertFalse(scanner.match_file(self.write_file(b"01100\n0101")))
+
+    def test_scanner_empty_file(self):
+        path = self.write_file(b"")
+
+        self.assertTrue(self.create_scanner("0*").match_file(path))
+        self.assertFalse(self.create_scanner("0").match_file(path))
+
+    def test_scanner_translation(self):
+        scanner = self.create_scanner("[a-z]*[^a-z]")
+
+        # Unknown, [a-z] and [^a-z] columns
+        self.assertEqual(scanner.width, 3)
+        self.assertEqual(scanner.translation[ord("a")], scanner.translation[ord("z")])
+        self.assertNotEqual(scanner.translation[ord("a")], scanner.translation[0xFF])
+
+        self.assertTrue(scanner.match_file(self.write_file(b"abcdefghij\xff")))
+        self.assertFalse(scanner.match_file(self.write_file(b"abcdefghij\xffa")))
+
+    def test_scanner_map_states(self):
+        scanner = self.create_scanner("(00)*1")
+        dfa = scanner.dfa
+
+        def state_after(data):
+            return dfa.run(dfa.starting_state * dfa.width, data) // dfa.width
+
+        even, odd, accepting = (state_after(data) for data in ("", "0", "1"))
+
+        self.assertEqual(scanner.map_states(b"000", [even, odd]), [odd, even])
+        self.assertEqual(scanner.map_states(b"", [odd]), [odd])
+
+        state_map = scanner.map_states(b"001")
+        self.assertEqual(len(state_map), len(dfa))
+        self.assertEqual(state_map[even], accepting)
+        self.assertEqual(state_map[odd], dfa.dead_state)
+        self.assertEqual(state_map[accepting], dfa.dead_state)
+
+    def test_scanner_universal_state(self):
+        scanner = self.create_scanner("0(0+1)*")
+        data = b"0" + b"01" * 1000
+
+        self.assertTrue(scanner.match_file(self.write_file(data)))
+        self.assertFalse(scanner.match_file(self.write_file(data + b"\n01")))
+        self.assertEqual(scanner.map_states(data + b"x"), [scanner.dfa.dead_state] * 3)
+
+    def test_scanner_match_file_in_parallel(self):
+        scanner = self.create_scanner("(0+1)*1(0+1)(0+1)")
+
+        for data in [b"0" * 37 + b"100", b"0" * 37 + b"000", b"1", b""]:
+            path = self.write_file(data)
+
+            self.assertEqual(
+                scanner.match_file(path, processes=2), scanner.match_file(path), data
+            )
+
+    def test_main_match_file(self):
+        path = self.write_file(b"ab" * 100)
+
+        self.assertTrue(main.match_file("(ab)*", path))
+        self.assertFalse(main.match_file("(ab)*a", path))
@@ -0,0 +1,403 @@
+import sys
+from collections import namedtuple
+
+from alphabet import CharSet
+from dense_dfa import DenseDfa
+from expression import concatenation, reverse, star, symbol, to_postfix
+from regex import Regex, THOMPSON
+from scan import DEFAULT_CHUNK_SIZE, FileScanner, map_file
+
+""" Searching for the matches of a regex inside of a string.
+
+The matches are leftmost-longest (POSIX): the match that starts first, and of
+the matches starting there the longest one. Three dfas find them in linear
+time, instead of running the matcher from every offset:
+
+ * the forward dfa of .*r finds the end of the earliest ending match, so a
+   search without a match stops after a single pass,
+ * the reverse dfa of .*reverse(r) runs from the end of the string to the
+   start, and is accepting exactly at the offsets where a match starts,
+ * the dfa of r runs from such a start until it dies, the last accepting
+   offset is the end of the longest match. A run stops early where it joins
+   an earlier run, so finding all the matches stays linear.
+
+Files are searched without reading them into strings. The three dfas step
+through the byte tables of FileScanners (see scan.py) over the memory mapped
+file a chunk at a time, and only a bitmap of the starts of the matches is kept.
+The runs remember at most MAX_FILE_VISITS of the visited (offset, state) pairs,
+so the memory does not grow with the file.
+"""
+
+Match = namedtuple("Match", ["start", "end"])
+
+# The (offset, state) pairs the runs of a file search remember, before they
+# start over
+MAX_FILE_VISITS = 1 << 16
+
+# The translated chunks of the file that the runs of a file search keep
+_KEPT_CHUNKS = 2
+
+
+def _create_dense_dfa(regex, expression, construction, minimize):
+    dfa = regex.create_nfa_from_postfix(to_postfix(expression), construction)
+    dfa = dfa.convert_to_dfa()
+
+    return DenseDfa(dfa.minimize() if minimize else dfa)
+
+
+class Searcher:
+    def __init__(
+        self, regex, construction=THOMPSON, minimize=True, chunk_size=DEFAULT_CHUNK_SIZE
+    ):
+        self.regex = regex
+
+        # The bytes of files are searched in chunks of this size
+        self.chunk_size = chunk_size
+
+        regex = Regex(regex)
+        expression = regex.create_expression_from_regex()
+        any_prefix = star(symbol(CharSet.any()))
+
+        # r, .*r and .*reverse(r)
+        self.anchored = _create_dense_dfa(regex, expression, construction, minimize)
+        self.forward = _create_dense_dfa(
+            regex, concatenation(any_prefix, expression), construction, minimize
+        )
+        self.backward = _create_dense_dfa(
+            regex,
+            concatenation(any_prefix, reverse(expression)),
+            construction,
+            minimize,
+        )
+
+        # The FileScanners of the forward, the backward and the anchored dfas,
+        # created on the first file search
+        self._scanners = None
+
+    def _bounds(self, input_string, pos, endpos):
+        if endpos is None or endpos > len(input_string):
+            endpos = len(input_string)
+
+        return min(max(pos, 0), endpos), endpos
+
+    def fullmatch(self, input_string, pos=0, endpos=None):
+        """Matches the regex against the whole input between pos and endpos.
+
+        Returns:
+            The Match of the whole input, None if it does not match.
+        """
+        pos, endpos = self._bounds(input_string, pos, endpos)
+
+        if self.anchored.is_string_accepted(input_string[pos:endpos]):
+            return Match(pos, endpos)
+
+        return None
+
+    def search(self, input_string, pos=0, endpos=None):
+        """Finds the leftmost-longest match between pos and endpos.
+
+        Returns:
+            The first Match, None if the regex does not match anywhere.
+        """
+        pos, endpos = self._bounds(input_string, pos, endpos)
+
+        if self._earliest_end(input_string, pos, endpos) is None:
+            return None
+
+        return next(self._matches(input_string, pos, endpos), None)
+
+    def finditer(self, input_string, pos=0, endpos=None):
+        """Finds all the non overlapping leftmost-longest matches.
+
+        An empty match is found right after a non empty one, like in the re
+        module, the search continues after an empty match at the next offset.
+
+        Returns:
+            An iterator of the Matches, in the order of their starts.
+        """
+        pos, endpos = self._bounds(input_string, pos, endpos)
+
+        return self._matches(input_string, pos, endpos)
+
+    def search_file(self, path):
+        """Finds the leftmost-longest match in the content of a file.
+
+        The bytes of the file are read as latin-1 characters, so the offsets
+        of the matches are byte offsets. The file is memory mapped and run a
+        chunk at a time, only a bitmap of the starts of the matches is kept in
+        memory.
+
+        Returns:
+            The first Match, None if the regex does not match anywhere.
+        """
+        with open(path, "rb") as file, map_file(file) as data:
+            if self._earliest_file_end(data) is None:
+                return None
+
+            return next(self._file_matches(data), None)
+
+    def finditer_file(self, path):
+        """Finds all the non overlapping leftmost-longest matches in the
+        content of a file, see search_file.
+
+        Returns:
+            An iterator of the Matches, in the order of their starts.
+        """
+        with open(path, "rb") as file, map_file(file) as data:
+            yield from self._file_matches(data)
+
+    def _earliest_end(self, input_string, pos, endpos):
+        dfa = self.forward
+        row_table = dfa.row_table
+        accepting = dfa.accepting
+        width = dfa.width
+
+        row = dfa.starting_state * width
+        if accepting[dfa.starting_state]:
+            return pos
+
+        for offset, symbol_index in enumerate(dfa.encode(input_string[pos:endpos])):
+            row = row_table[row + symbol_index]
+
+            if accepting[row // width]:
+                return pos + offset + 1
+
+        return None
+
+    def _starts(self, input_string, pos, endpos):
+        # starts[i] is 1 if a match starts at pos + i
+        dfa = self.backward
+        row_table = dfa.row_table
+        accepting = dfa.accepting
+        width = dfa.width
+
+        length = endpos - pos
+        starts = bytearray(length + 1)
+
+        row = dfa.starting_state * width
+        starts[length] = accepting[dfa.starting_state]
+
+        symbol_indices = dfa.encode(input_string[pos:endpos])[::-1]
+        for offset, symbol_index in enumerate(symbol_indices, 1):
+            row = row_table[row + symbol_index]
+            starts[length - offset] = accepting[row // width]
+
+        return starts
+
+    def _longest_end(
+        self, row_table, width, symbol_indices, start, visits, ends, max_visits
+    ):
+        # The end of the longest match starting at the start. The row table
+        # of the anchored dfa is stepped on the symbol indices of the input
+        # from the start on, the table and the indices are either the ones of
+        # the dense dfa or of its FileScanner.
+        #
+        # Two runs of the dfa that are in the same state at the same offset
+        # continue the same way, so a run stops at the first (offset, state)
+        # an earlier run already visited, and uses the end of that run. Every
+        # (offset, state) is only stepped from once, so finding all matches
+        # stays linear in the length of the input. At most max_visits pairs
+        # are remembered.
+        #
+        # visits: offset * table size + row -> index of the run that visited it
+        # ends: run index -> end of the longest match of the run
+        dfa = self.anchored
+        accepting = dfa.accepting
+        dead_row = dfa.dead_state * width
+        table_size = dfa.state_count * width
+
+        run = len(ends)
+        row = dfa.starting_state * width
+        # A match starts here, so if the empty string does not match, a longer
+        # match is found.
+        end = start
+
+        for offset, symbol_index in enumerate(symbol_indices, start + 1):
+            row = row_table[row + symbol_index]
+
+            if row == dead_row:
+                break
+
+            key = offset * table_size + row
+            previous_run = visits.get(key)
+            if previous_run is not None:
+                # The earlier run accepted here or later iff its end is here or
+                # later
+                if ends[previous_run] >= offset:
+                    end = ends[previous_run]
+                break
+            if len(visits) < max_visits:
+                visits[key] = run
+
+            if accepting[row // width]:
+                end = offset
+
+        ends.append(end)
+
+        return end
+
+    def _matches(self, input_string, pos, endpos):
+        starts = self._starts(input_string, pos, endpos)
+        dfa = self.anchored
+        symbol_indices = memoryview(dfa.encode(input_string[pos:endpos]))
+
+        # Shared by the runs of _longest_end
+        visits = {}
+        ends = []
+
+        offset = 0
+        while offset <= endpos - pos:
+            start = starts.find(1, offset)
+            if start == -1:
+                return
+
+            end = self._longest_end(
+                dfa.row_table,
+                dfa.width,
+                symbol_indices[start:],
+                start,
+                visits,
+                ends,
+                sys.maxsize,
+            )
+            yield Match(pos + start, pos + end)
+
+            offset = end if end > start else end + 1
+
+    def _file_scanners(self):
+        if self._scanners is None:
+            self._scanners = tuple(
+                FileScanner(dfa, self.chunk_size)
+                for dfa in (self.forward, self.backward, self.anchored)
+            )
+
+        return self._scanners
+
+    def _earliest_file_end(self, data):
+        scanner, _, _ = self._file_scanners()
+        row_table = scanner.row_table
+        accepting = scanner.dfa.accepting
+        width = scanner.width
+
+        row = scanner.dfa.starting_state * width
+        if accepting[scanner.dfa.starting_state]:
+            return 0
+
+        for start in range(0, len(data), self.chunk_size):
+            columns = bytes(data[start : start + self.chunk_size])
+            for offset, column in enumerate(
+                columns.translate(scanner.translation), start + 1
+            ):
+                row = row_table[row + column]
+
+                if accepting[row // width]:
+                    return offset
+
+        return None
+
+    def _file_starts(self, data):
+        # Bit i of the bitmap is set if a match starts at the offset i. The
+        # chunks are run backwards from the end of the file.
+        _, scanner, _ = self._file_scanners()
+        row_table = scanner.row_table
+        accepting = scanner.dfa.accepting
+        width = scanner.width
+
+        length = len(data)
+        starts = bytearray(length // 8 + 1)
+
+        row = scanner.dfa.starting_state * width
+        if accepting[scanner.dfa.starting_state]:
+            starts[length >> 3] |= 1 << (length & 7)
+
+        for end in range(length, 0, -self.chunk_size):
+            start = max(end - self.chunk_size, 0)
+            columns = bytes(data[start:end])[::-1].translate(scanner.translation)
+
+            for offset, column in zip(range(end - 1, start - 1, -1), columns):
+                row = row_table[row + column]
+
+                if accepting[row // width]:
+                    starts[offset >> 3] |= 1 << (offset & 7)
+
+        return starts
+
+    def _file_columns(self, data, offset, chunks):
+        # The columns of the anchored scanner from the offset on, translated a
+        # chunk at a time. The last translated chunks are kept in chunks, the
+        # runs start close to each other.
+        _, _, scanner = self._file_scanners()
+
+        while offset < len(data):
+            chunk_start = offset - offset % self.chunk_size
+
+            columns = chunks.get(chunk_start)
+            if columns is None:
+                if len(chunks) == _KEPT_CHUNKS:
+                    del chunks[min(chunks)]
+
+                columns = bytes(
+                    data[chunk_start : chunk_start + self.chunk_size]
+                ).translate(scanner.translation)
+                chunks[chunk_start] = columns
+
+            yield from memoryview(columns)[offset - chunk_start :]
+            offset = chunk_start + self.chunk_size
+
+    def _file_matches(self, data):
+        _, _, scanner = self._file_scanners()
+        starts = self._file_starts(data)
+
+        # Shared by the runs of _longest_end, and started over when full
+        visits = {}
+        ends = []
+        # chunk start -> translated columns
+        chunks = {}
+
+        offset = 0
+        while offset <= len(data):
+            start = _next_start(starts, offset)
+            if start is None:
+                return
+
+            if len(visits) + len(ends) >= MAX_FILE_VISITS:
+                visits.clear()
+                ends.clear()
+
+            end = self._longest_end(
+                scanner.row_table,
+                scanner.width,
+                self._file_columns(data, start, chunks),
+                start,
+                visits,
+                ends,
+                MAX_FILE_VISITS,
+            )
+            yield Match(start, end)
+
+            offset = end if end > start else end + 1
+
+
+def _next_start(starts, offset):
+    # The first offset from the offset on whose bit is set in the bitmap of
+    # the starts, None if there is none
+    index = offset >> 3
+    if index >= len(starts):
+        return None
+
+    # The bits of the offsets before the offset are cleared
+    bits = starts[index] >> (offset & 7) << (offset & 7)
+    while not bits:
+        index += 1
+        if index == len(starts):
+            return None
+        bits = starts[index]
+
+    return index * 8 + (bits & -bits).bit_length() - 1
+
+
+def _read_file(path):
+    # The bytes of the file as latin-1 characters, without reading them into
+    # an intermediate bytes object
+    with open(path, "rb") as file, map_file(file) as data:
+        return str(data, "latin-1")
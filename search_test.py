@@ -0,0 +1,149 @@
+import itertools
+import os
+import tempfile
+import unittest
+
+import main
+from regex import Regex
+from search import Match, Searcher
+
+
+def leftmost_longest_matches(regex, input_string):
+    # Checks every substring, only for testing
+    dfa = Regex(regex).create_nfa_from_regex().convert_to_dfa()
+
+    matches = []
+    offset = 0
+    while offset <= len(input_string):
+        for start in range(offset, len(input_string) + 1):
+            ends = [
+                end
+                for end in range(start, len(input_string) + 1)
+                if dfa.is_string_accepted(input_string[start:end])
+            ]
+            if ends:
+                matches.append(Match(start, ends[-1]))
+                offset = ends[-1] if ends[-1] > start else ends[-1] + 1
+                break
+        else:
+            break
+
+    return matches
+
+
+class SearcherTest(unittest.TestCase):
+    def test_search(self):
+        searcher = Searcher("0(0+1)*1")
+
+        self.assertEqual(searcher.search("110100"), Match(2, 4))
+        self.assertEqual(searcher.search("1101001", pos=3), Match(4, 7))
+        self.assertEqual(searcher.search("1101001", endpos=6), Match(2, 4))
+        self.assertIsNone(searcher.search("1110000"))
+        self.assertIsNone(searcher.search(""))
+
+    def test_search_leftmost_longest(self):
+        searcher = Searcher("ab+bcde+abc")
+
+        self.assertEqual(searcher.search("xabcde"), Match(1, 4))
+
+    def test_fullmatch(self):
+        searcher = Searcher("0(0+1)*1")
+
+        self.assertEqual(searcher.fullmatch("0101"), Match(0, 4))
+        self.assertEqual(searcher.fullmatch("10101", pos=1), Match(1, 5))
+        self.assertIsNone(searcher.fullmatch("01010"))
+
+    def test_finditer_empty_matches(self):
+        searcher = Searcher("a*")
+
+        self.assertEqual(
+            list(searcher.finditer("baab")),
+            [Match(0, 0), Match(1, 3), Match(3, 3), Match(4, 4)],
+        )
+
+    def test_finditer_char_classes(self):
+        searcher = Searcher("[0-9][0-9]*")
+
+        self.assertEqual(
+            list(searcher.finditer("a1 b22 c333")),
+            [Match(1, 2), Match(4, 6), Match(8, 11)],
+        )
+
+    def test_finditer_same_as_checking_every_substring(self):
+        for regex in ["0(0+1)*1", "(01+1)*0", "0*", "11+0", "(0*1)*", ""]:
+            searcher = Searcher(regex)
+
+            for length in range(7):
+                for symbols in itertools.product("01", repeat=length):
+                    input_string = "".join(symbols)
+
+                    self.assertEqual(
+                        list(searcher.finditer(input_string)),
+                        leftmost_longest_matches(regex, input_string),
+                        (regex, input_string),
+                    )
+
+    def test_search_file(self):
+        searcher = Searcher("[0-9][0-9]*")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "input")
+            with open(path, "wb") as file:
+                file.write(b"a1 b22 \xff333")
+
+            self.assertEqual(searcher.search_file(path), Match(1, 2))
+            self.assertEqual(
+                list(searcher.finditer_file(path)),
+                [Match(1, 2), Match(4, 6), Match(8, 11)],
+            )
+            self.assertEqual(list(main.finditer_file("22", path)), [Match(4, 6)])
+
+            with open(path, "wb"):
+                pass
+            self.assertIsNone(main.search_file("1", path))
+
+    def test_finditer_file_same_as_finditer(self):
+        content = "0110100111a1001b" * 5
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "input")
+            with open(path, "w", encoding="latin-1") as file:
+                file.write(content)
+
+            for regex in ["0(0+1)*1", "(01+1)*0", "0*", "1+a.*b", ""]:
+                # Matches across the chunks of the file
+                searcher = Searcher(regex, chunk_size=7)
+
+                self.assertEqual(
+                    list(searcher.finditer_file(path)),
+                    list(searcher.finditer(content)),
+                    regex,
+                )
+                self.assertEqual(
+                    searcher.search_file(path), searcher.search(content), regex
+                )
+
+    def test_main_search(self):
+        self.assertEqual(main.search("1(0+1)", "0011"), Match(2, 4))
+        self.assertEqual(list(main.finditer("1", "0101")), [Match(1, 2), Match(3, 4)])
+        self.assertEqual(main.fullmatch("(01)*", "0101"), Match(0, 4))
+
+    def test_finditer_is_linear(self):
+        class CountingTable(list):
+            # Counts the steps of the dfa
+            steps = 0
+
+            def __getitem__(self, index):
+                CountingTable.steps += 1
+                return super().__getitem__(index)
+
+        searcher = Searcher("a+a.*b")
+        searcher.anchored.row_table = CountingTable(searcher.anchored.row_table)
+
+        for length in (1000, 2000):
+            CountingTable.steps = 0
+            matches = list(searcher.finditer("a" * length))
+
+            self.assertEqual(matches, [Match(i, i + 1) for i in range(length)])
+            # Without joining the earlier runs, every match runs to the end
+            self.assertLess(CountingTable.steps, 4 * length)
@@ -0,0 +1,196 @@
+import mmap
+import struct
+import sys
+from array import array
+
+import numpy as np
+
+from alphabet import Alphabet, CharSet, MAX_CODE_POINT
+from dense_dfa import DenseDfa
+from dfa import Dfa
+
+""" Binary format of compiled dfas.
+
+A dense dfa (see dense_dfa.py) is written as, all little endian:
+
+ * header: magic b"VREX", format version, number of states, number of
+   symbols, starting state,
+ * alphabet: for every symbol except the unknown symbol 0, the number of
+   code point ranges of its class followed by the (start, end) ranges,
+   padded to 4 bytes,
+ * the (states, symbols) table of the offsets of the rows of the next states
+   as int32,
+ * the accepting states as a bitmap, bit i of byte i // 8 for state i.
+
+The table is stored in the layout the matcher uses, so a memory mapped file is
+matched without reading or copying the table.
+"""
+
+MAGIC = b"VREX"
+VERSION = 1
+
+# magic, version, reserved, number of states, number of symbols, starting state
+_HEADER = struct.Struct("<4sHHIII")
+_UINT32 = struct.Struct("<I")
+_RANGE = struct.Struct("<II")
+
+_INT32_MAX = 2**31 - 1
+
+
+def dumps(dfa):
+    """Serializes the dfa.
+
+    Args:
+        dfa: a Dfa or DenseDfa.
+
+    Returns:
+        The bytes of the dfa in the binary format.
+    """
+    dense_dfa = DenseDfa(dfa) if isinstance(dfa, Dfa) else dfa
+
+    if dense_dfa.state_count * dense_dfa.width > _INT32_MAX:
+        raise ValueError("The table of the dfa does not fit into int32")
+
+    data = bytearray(
+        _HEADER.pack(
+            MAGIC,
+            VERSION,
+            0,
+            dense_dfa.state_count,
+            dense_dfa.width,
+            dense_dfa.starting_state,
+        )
+    )
+
+    for char_set in dense_dfa.char_sets():
+        data += _UINT32.pack(len(char_set.ranges))
+        for start, end in char_set.ranges:
+            data += _RANGE.pack(start, end)
+
+    data += bytes(-len(data) % 4)
+
+    row_table = array("i", dense_dfa.row_table)
+    if sys.byteorder != "little":
+        row_table.byteswap()
+    data += row_table.tobytes()
+
+    accepting = bytearray((dense_dfa.state_count + 7) // 8)
+    for state, is_accepting in enumerate(dense_dfa.accepting):
+        if is_accepting:
+            accepting[state // 8] |= 1 << (state % 8)
+    data += accepting
+
+    return bytes(data)
+
+
+def dump(dfa, path):
+    """Writes the dfa to a file in the binary format, see dumps."""
+    with open(path, "wb") as file:
+        file.write(dumps(dfa))
+
+
+def loads(data):
+    """Creates a dense dfa of its binary format.
+
+    Args:
+        data: the bytes of the dfa, any object supporting the buffer protocol.
+            On little endian machines the table of the dfa is a view of it.
+
+    Returns:
+        The DenseDfa.
+    """
+    data = memoryview(data)
+
+    if len(data) < _HEADER.size:
+        raise ValueError("Not a serialized dfa, the header is missing")
+
+    magic, version, _, state_count, width, starting_state = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a serialized dfa, the magic bytes are wrong")
+    if version != VERSION:
+        raise ValueError(f"Unsupported version {version}, expected {VERSION}")
+    if width < 1:
+        raise ValueError("The serialized dfa has no unknown symbol")
+
+    offset = _HEADER.size
+
+    char_sets = []
+    for _ in range(width - 1):
+        if offset + _UINT32.size > len(data):
+            raise ValueError("The alphabet of the serialized dfa is truncated")
+        (range_count,) = _UINT32.unpack_from(data, offset)
+        offset += _UINT32.size
+
+        if not range_count:
+            raise ValueError("The serialized dfa has a symbol without characters")
+        if offset + range_count * _RANGE.size > len(data):
+            raise ValueError("The alphabet of the serialized dfa is truncated")
+
+        ranges = [
+            _RANGE.unpack_from(data, offset + i * _RANGE.size)
+            for i in range(range_count)
+        ]
+        for start, end in ranges:
+            if start > end or end > MAX_CODE_POINT:
+                raise ValueError(
+                    f"The serialized dfa has an invalid range {start}-{end}"
+                )
+
+        char_sets.append(CharSet(ranges))
+        offset += range_count * _RANGE.size
+
+    offset += -offset % 4
+
+    if starting_state >= state_count:
+        raise ValueError(
+            f"The starting state {starting_state} is out of the {state_count} states"
+        )
+
+    table_size = state_count * width * 4
+    if len(data) != offset + table_size + (state_count + 7) // 8:
+        raise ValueError("The size of the serialized dfa is wrong")
+
+    row_table = data[offset : offset + table_size].cast("i")
+    if sys.byteorder != "little":
+        row_table = array("i", row_table)
+        row_table.byteswap()
+    offset += table_size
+
+    # Every entry has to be the offset of a row, checked at once with numpy
+    rows = np.asarray(row_table)
+    if rows.size and (
+        rows.min() < 0 or rows.max() >= state_count * width or (rows % width).any()
+    ):
+        raise ValueError("The table of the serialized dfa has an invalid row offset")
+
+    accepting = [
+        bool(data[offset + state // 8] & (1 << (state % 8)))
+        for state in range(state_count)
+    ]
+
+    # Every char set is a class of the alphabet, the symbols are created from
+    # them the same way as when the dfa was compiled.
+    alphabet = Alphabet(char_sets)
+    symbols = [None] + [
+        alphabet.classify(chr(char_set.ranges[0][0])) for char_set in char_sets
+    ]
+
+    return DenseDfa.from_tables(alphabet, symbols, starting_state, row_table, accepting)
+
+
+def load(path):
+    """Loads a dfa from a file in the binary format, without copying its table.
+
+    The file is memory mapped, the table is read from it while matching. It is
+    only scanned once by loads, to check its row offsets with numpy.
+
+    Args:
+        path: the path of the file.
+
+    Returns:
+        The DenseDfa.
+    """
+    with open(path, "rb") as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    return loads(data)
@@ -0,0 +1,101 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+import serialize
+from alphabet import MAX_CODE_POINT
+from dense_dfa import DenseDfa
+from dfa import Dfa
+
+
+class SerializeTest(unittest.TestCase):
+    def assertSameLanguage(self, dense_dfa, loaded_dfa, inputs):
+        for input_string in inputs:
+            self.assertEqual(
+                loaded_dfa.is_string_accepted(input_string),
+                dense_dfa.is_string_accepted(input_string),
+                input_string,
+            )
+
+    def test_dumps_and_loads(self):
+        dense_dfa = DenseDfa.from_regex("[a-c]*(b+[^a])c.")
+        loaded_dfa = serialize.loads(serialize.dumps(dense_dfa))
+
+        self.assertEqual(loaded_dfa.symbols, dense_dfa.symbols)
+        self.assertEqual(list(loaded_dfa.table), list(dense_dfa.table))
+        self.assertEqual(loaded_dfa.accepting, dense_dfa.accepting)
+        self.assertSameLanguage(
+            dense_dfa, loaded_dfa, ["abcd", "bcx", "aacεc", "", "ddcd", "bbc"]
+        )
+
+    def test_dumps_dfa_without_alphabet(self):
+        dfa = Dfa({("A", "0"): "B", ("B", "1"): "A"}, "A", {"A"})
+        loaded_dfa = serialize.loads(serialize.dumps(dfa))
+
+        self.assertSameLanguage(DenseDfa(dfa), loaded_dfa, ["", "01", "0101", "0", "1"])
+
+        with self.assertRaises(ValueError):
+            serialize.dumps(Dfa({("A", "ab"): "A"}, "A", {"A"}))
+
+    def test_dump_and_load_file(self):
+        dense_dfa = DenseDfa.from_regex("0(0+1)*1")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "dfa")
+            serialize.dump(dense_dfa, path)
+            loaded_dfa = serialize.load(path)
+
+            self.assertSameLanguage(dense_dfa, loaded_dfa, ["011", "01", "10", ""])
+            self.assertEqual(
+                loaded_dfa.match_many(["011", "10"]).tolist(), [True, False]
+            )
+
+            # The table of the memory mapped file is copied when pickled
+            unpickled_dfa = pickle.loads(pickle.dumps(loaded_dfa))
+            self.assertTrue(unpickled_dfa.is_string_accepted("0101"))
+
+    def test_loads_invalid_data(self):
+        data = serialize.dumps(DenseDfa.from_regex("01"))
+
+        for invalid_data in [b"", b"XXXX" + data[4:], data[:-1], data + b"\0"]:
+            with self.assertRaises(ValueError):
+                serialize.loads(invalid_data)
+
+        version = (serialize.VERSION + 1).to_bytes(2, "little")
+        with self.assertRaises(ValueError):
+            serialize.loads(data[:4] + version + data[6:])
+
+    def test_loads_invalid_table(self):
+        dense_dfa = DenseDfa.from_regex("01")
+        data = serialize.dumps(dense_dfa)
+
+        # The row table starts after the bitmap of the accepting states and
+        # the table itself, from the end
+        table_offset = (
+            len(data) - (len(dense_dfa) + 7) // 8 - len(dense_dfa.row_table) * 4
+        )
+
+        for row in [1, dense_dfa.width * len(dense_dfa), -dense_dfa.width]:
+            entry = row.to_bytes(4, "little", signed=True)
+            invalid_data = data[:table_offset] + entry + data[table_offset + 4 :]
+            with self.assertRaises(ValueError):
+                serialize.loads(invalid_data)
+
+        # The starting state is the last field of the header
+        starting_state = len(dense_dfa).to_bytes(4, "little")
+        with self.assertRaises(ValueError):
+            serialize.loads(data[:16] + starting_state + data[20:])
+
+    def test_loads_invalid_alphabet(self):
+        data = serialize.dumps(DenseDfa.from_regex("[a-z]0"))
+
+        for size in range(len(data)):
+            with self.assertRaises(ValueError):
+                serialize.loads(data[:size])
+
+        # The first range follows the header and its range count
+        for start, end in [(2, 1), (0, MAX_CODE_POINT + 1)]:
+            invalid_range = start.to_bytes(4, "little") + end.to_bytes(4, "little")
+            with self.assertRaises(ValueError):
+                serialize.loads(data[:24] + invalid_range + data[32:])
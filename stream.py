@@ -0,0 +1,88 @@
+import codecs
+
+from dense_dfa import DenseDfa
+from dfa import Dfa
+
+""" Incremental matching of streamed input.
+
+A StreamMatcher keeps the current state of a dfa between the chunks of the
+input, so data coming from sockets, pipes or generators can be matched without
+keeping all of it in memory. Chunks of bytes are decoded incrementally, a
+character split between two chunks is completed by the next chunk, close
+checks that the input does not end inside of a character.
+"""
+
+DEFAULT_CHUNK_SIZE = 65536
+
+
+class StreamMatcher:
+    def __init__(self, dfa, encoding="utf-8"):
+        # A Dfa is converted to a dense table, see dense_dfa.py
+        self.dfa = DenseDfa(dfa) if isinstance(dfa, Dfa) else dfa
+        self.encoding = encoding
+
+        self.reset()
+
+    def reset(self):
+        """Goes back to the starting state, forgetting the input fed so far."""
+        self._row = self.dfa.starting_state * self.dfa.width
+        self._decoder = codecs.getincrementaldecoder(self.encoding)()
+
+    @property
+    def state(self):
+        return self._row // self.dfa.width
+
+    def feed(self, chunk):
+        """Advances the matcher on the next chunk of the input.
+
+        Args:
+            chunk: the next part of the input, a str or bytes in the encoding
+                of the matcher.
+        """
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            chunk = self._decoder.decode(chunk)
+
+        self._row = self.dfa.run(self._row, chunk)
+
+    def close(self):
+        """Ends the input, the decoder of the bytes is flushed.
+
+        Raises UnicodeDecodeError if the bytes end in the middle of a
+        character.
+        """
+        self._row = self.dfa.run(self._row, self._decoder.decode(b"", final=True))
+
+    def is_accepting(self):
+        """True if the input fed so far is accepted, not while it ends in the
+        middle of a character."""
+        pending, _ = self._decoder.getstate()
+
+        return not pending and self.dfa.accepting[self.state]
+
+    def is_dead(self):
+        """True if no continuation of the input fed so far can be accepted."""
+        return self.state == self.dfa.dead_state
+
+    async def feed_reader(self, reader, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Feeds the matcher from an asyncio.StreamReader until the end of the
+        stream.
+
+        The reading stops early when the matcher is dead, the rest of the
+        stream is not consumed.
+
+        Args:
+            reader: the asyncio.StreamReader to read the input from.
+            chunk_size: the maximum number of bytes to read at once.
+
+        Returns:
+            True if the input read is accepted, False otherwise.
+        """
+        while not self.is_dead():
+            chunk = await reader.read(chunk_size)
+            if not chunk:
+                self.close()
+                break
+
+            self.feed(chunk)
+
+        return self.is_accepting()
@@ -0,0 +1,101 @@
+import asyncio
+import unittest
+
+from pattern import DENSE_DFA, DFA, LAZY_DFA, Pattern
+from regex import Regex
+from stream import StreamMatcher
+
+
+def create_stream_matcher(regex, encoding="utf-8"):
+    dfa = Regex(regex).create_nfa_from_regex().convert_to_dfa()
+
+    return StreamMatcher(dfa, encoding)
+
+
+class StreamMatcherTest(unittest.TestCase):
+    def test_stream_matcher(self):
+        matcher = create_stream_matcher("0(0+1)*1")
+
+        self.assertFalse(matcher.is_accepting())
+
+        for chunk, accepting in [
+            ("0", False),
+            ("110", False),
+            ("", False),
+            ("01", True),
+        ]:
+            matcher.feed(chunk)
+            self.assertEqual(matcher.is_accepting(), accepting)
+            self.assertFalse(matcher.is_dead())
+
+    def test_stream_matcher_dead(self):
+        matcher = create_stream_matcher("0(0+1)*1")
+
+        matcher.feed("1")
+        self.assertTrue(matcher.is_dead())
+
+        matcher.feed("01")
+        self.assertTrue(matcher.is_dead())
+        self.assertFalse(matcher.is_accepting())
+
+        matcher.reset()
+        self.assertFalse(matcher.is_dead())
+        matcher.feed("01")
+        self.assertTrue(matcher.is_accepting())
+
+    def test_stream_matcher_bytes_split_between_chunks(self):
+        matcher = create_stream_matcher("[á-é]*x")
+        data = "áéx".encode("utf-8")
+
+        for i in range(len(data)):
+            matcher.feed(data[i : i + 1])
+            self.assertFalse(matcher.is_dead())
+
+        self.assertTrue(matcher.is_accepting())
+
+    def test_stream_matcher_truncated_character(self):
+        matcher = create_stream_matcher("a")
+
+        matcher.feed(b"a\xc3")
+        self.assertFalse(matcher.is_accepting())
+        with self.assertRaises(UnicodeDecodeError):
+            matcher.close()
+
+        matcher.reset()
+        matcher.feed(b"a")
+        matcher.close()
+        self.assertTrue(matcher.is_accepting())
+
+    def test_stream_matcher_encoding(self):
+        matcher = create_stream_matcher("ab", encoding="utf-16-le")
+
+        matcher.feed("ab".encode("utf-16-le"))
+        self.assertTrue(matcher.is_accepting())
+
+    def test_stream_matcher_reader(self):
+        async def match(data):
+            reader = asyncio.StreamReader()
+            reader.feed_data(data)
+            reader.feed_eof()
+
+            return await create_stream_matcher("(01)*").feed_reader(reader, 3)
+
+        self.assertTrue(asyncio.run(match(b"0101010101")))
+        self.assertFalse(asyncio.run(match(b"010110101")))
+        self.assertTrue(asyncio.run(match(b"")))
+
+        with self.assertRaises(UnicodeDecodeError):
+            asyncio.run(match(b"01\xc3"))
+
+    def test_pattern_stream(self):
+        for engine in (DFA, DENSE_DFA):
+            pattern = Pattern("0(0+1)*1", engine=engine)
+            matcher = pattern.stream()
+            matcher.feed("01")
+            self.assertTrue(matcher.is_accepting())
+
+            # The dense dfa is only built once
+            self.assertIs(pattern.stream().dfa, matcher.dfa)
+
+        with self.assertRaises(ValueError):
+            Pattern("0", engine=LAZY_DFA).stream()
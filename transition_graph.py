@@ -0,0 +1,146 @@
+"""Transition graph of an automaton.
+
+The transitions are indexed by state, then by input symbol, so the transitions
+of a state can be found without scanning all of them. The reverse edges are only
+built when they are first needed, and are kept up to date after that.
+"""
+
+
+class TransitionGraph:
+    def __init__(self, transition_function=None, deterministic=False):
+        # A deterministic graph has a single next state for every transition,
+        # otherwise a set of next states.
+        self.deterministic = deterministic
+
+        # state -> input symbol -> next state(s)
+        self.edges = {}
+
+        # Reverse edges, None until first used.
+        # state -> input symbol -> previous states
+        self._reverse = None
+
+        # Incremented on every change, so the tables built from the graph can
+        # tell when they are out of date.
+        self.version = 0
+
+        if transition_function:
+            for (state, input_symbol), next_states in transition_function.items():
+                if deterministic:
+                    self.add(state, input_symbol, next_states)
+                else:
+                    self.add_all(state, input_symbol, next_states)
+
+    @classmethod
+    def from_graph(cls, transition_function, deterministic=False):
+        """Returns the graph itself, or a new graph of a (state, symbol) dict."""
+        if isinstance(transition_function, TransitionGraph):
+            return transition_function
+
+        return cls(transition_function, deterministic)
+
+    def __len__(self):
+        return sum(len(transitions) for transitions in self.edges.values())
+
+    def __contains__(self, key):
+        state, input_symbol = key
+        return input_symbol in self.edges.get(state, {})
+
+    def __eq__(self, other):
+        if isinstance(other, TransitionGraph):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    def get(self, state, input_symbol, default=None):
+        return self.edges.get(state, {}).get(input_symbol, default)
+
+    def transitions(self, state):
+        """Returns the input symbol -> next state(s) dict of the state."""
+        return self.edges.get(state, {})
+
+    def states(self):
+        """Returns every state that has a transition from or to it."""
+        states = set(self.edges)
+        for transitions in self.edges.values():
+            for next_states in transitions.values():
+                states.update(self._as_set(next_states))
+
+        return states
+
+    def items(self):
+        for state, transitions in self.edges.items():
+            for input_symbol, next_states in transitions.items():
+                yield (state, input_symbol), next_states
+
+    def to_dict(self):
+        """Returns the transitions as a (state, input symbol) -> next state(s) dict."""
+        return {
+            key: next_states if self.deterministic else set(next_states)
+            for key, next_states in self.items()
+        }
+
+    def _as_set(self, next_states):
+        return (next_states,) if self.deterministic else next_states
+
+    def add(self, state, input_symbol, next_state):
+        self.version += 1
+        transitions = self.edges.setdefault(state, {})
+
+        if self.deterministic:
+            if self._reverse is not None and input_symbol in transitions:
+                self._remove_reverse(state, input_symbol, transitions[input_symbol])
+            transitions[input_symbol] = next_state
+        else:
+            transitions.setdefault(input_symbol, set()).add(next_state)
+
+        if self._reverse is not None:
+            self._add_reverse(state, input_symbol, next_state)
+
+    def add_all(self, state, input_symbol, next_states):
+        for next_state in next_states:
+            self.add(state, input_symbol, next_state)
+
+    def remove(self, state, input_symbol, next_state):
+        self.version += 1
+        transitions = self.edges[state]
+
+        if self.deterministic:
+            next_state = transitions.pop(input_symbol)
+        else:
+            transitions[input_symbol].discard(next_state)
+            if not transitions[input_symbol]:
+                del transitions[input_symbol]
+
+        if not transitions:
+            del self.edges[state]
+
+        if self._reverse is not None:
+            self._remove_reverse(state, input_symbol, next_state)
+
+    def move(self, state, new_state):
+        """Moves every transition going from the state to go from the new state."""
+        for input_symbol, next_states in list(self.transitions(state).items()):
+            for next_state in list(self._as_set(next_states)):
+                self.remove(state, input_symbol, next_state)
+                self.add(new_state, input_symbol, next_state)
+
+    def predecessors(self, state):
+        """Returns the input symbol -> previous states dict of the state."""
+        if self._reverse is None:
+            self._reverse = {}
+            for (previous_state, input_symbol), next_states in self.items():
+                for next_state in self._as_set(next_states):
+                    self._add_reverse(previous_state, input_symbol, next_state)
+
+        return self._reverse.get(state, {})
+
+    def _add_reverse(self, state, input_symbol, next_state):
+        self._reverse.setdefault(next_state, {}).setdefault(input_symbol, set()).add(
+            state
+        )
+
+    def _remove_reverse(self, state, input_symbol, next_state):
+        previous_states = self._reverse[next_state][input_symbol]
+        previous_states.discard(state)
+
+        if not previous_states:
+            del self._reverse[next_state][input_symbol]
@@ -0,0 +1,79 @@
+import unittest
+
+from transition_graph import TransitionGraph
+
+
+class TransitionGraphTest(unittest.TestCase):
+    def test_from_dict(self):
+        transition_function = {
+            ("A", "0"): {"A", "B"},
+            ("A", "1"): {"A"},
+            ("B", "1"): {"C"},
+        }
+
+        graph = TransitionGraph(transition_function)
+
+        self.assertEqual(len(graph), 3)
+        self.assertIn(("A", "0"), graph)
+        self.assertNotIn(("C", "0"), graph)
+        self.assertEqual(graph.get("A", "0"), {"A", "B"})
+        self.assertEqual(graph.transitions("B"), {"1": {"C"}})
+        self.assertEqual(graph.transitions("C"), {})
+        self.assertEqual(graph.states(), {"A", "B", "C"})
+        self.assertDictEqual(graph.to_dict(), transition_function)
+
+    def test_deterministic(self):
+        graph = TransitionGraph({("A", "0"): "B", ("B", "0"): "A"}, deterministic=True)
+
+        graph.add("A", "0", "A")
+
+        self.assertEqual(graph.get("A", "0"), "A")
+        self.assertEqual(graph.predecessors("A"), {"0": {"A", "B"}})
+        self.assertEqual(graph.predecessors("B"), {})
+
+    def test_predecessors(self):
+        graph = TransitionGraph({("A", "0"): {"A", "B"}, ("B", "1"): {"B"}})
+
+        self.assertEqual(graph.predecessors("B"), {"0": {"A"}, "1": {"B"}})
+        self.assertEqual(graph.predecessors("C"), {})
+
+        # The reverse edges are kept up to date after they are built
+        graph.add("C", "1", "B")
+        graph.remove("A", "0", "B")
+
+        self.assertEqual(graph.predecessors("B"), {"1": {"B", "C"}})
+        self.assertEqual(graph.get("A", "0"), {"A"})
+
+    def test_remove_last_transition(self):
+        graph = TransitionGraph({("A", "0"): {"B"}})
+
+        graph.remove("A", "0", "B")
+
+        self.assertEqual(len(graph), 0)
+        self.assertEqual(graph.states(), set())
+
+    def test_move(self):
+        graph = TransitionGraph(
+            {("A", "0"): {"B"}, ("B", "0"): {"C"}, ("B", "1"): {"B"}}
+        )
+
+        graph.move("B", "D")
+
+        self.assertDictEqual(
+            graph.to_dict(),
+            {("A", "0"): {"B"}, ("D", "0"): {"C"}, ("D", "1"): {"B"}},
+        )
+
+    def test_version(self):
+        graph = TransitionGraph({("A", "0"): {"B"}})
+        version = graph.version
+
+        graph.get("A", "0")
+        self.assertEqual(graph.version, version)
+
+        graph.add("B", "0", "A")
+        self.assertGreater(graph.version, version)
+
+        version = graph.version
+        graph.remove("B", "0", "A")
+        self.assertGreater(graph.version, version)